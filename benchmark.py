@@ -0,0 +1,276 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import threading
+import time
+from core.engine import CSEE, AESCTRStream
+from core.watchdog import EntropyWatchdog
+from core.device import ImageFile
+from core.pio import PositionalIO
+from logger import MemoryLogger
+from ui import QuietUI
+
+SEED = b"QUANTUM_ROOT_BENCH_000000000000001"
+SUITES = ("keystream", "pass2", "watchdog", "overhead", "hash", "wipe", "simulated")
+
+
+def _rate(total_bytes, elapsed):
+    return (total_bytes / (1024 * 1024)) / elapsed if elapsed > 0 else 0.0
+
+
+# --- Simulated device -----------------------------------------------------------------
+
+class ThrottledIO(PositionalIO):
+    """
+    PositionalIO that behaves like a device with fixed bandwidth and per-command latency.
+    Transfers share one bandwidth timeline (they serialize); latency overlaps across the
+    queue, so queue depth pays off exactly as it would on real hardware.
+    """
+    def __init__(self, path, bandwidth, latency, **kwargs):
+        super().__init__(path, **kwargs)
+        self.bandwidth = bandwidth  # bytes/s
+        self.latency = latency      # seconds per command
+        self._busy_until = 0.0
+        self._clock = threading.Lock()
+
+    def _service(self, nbytes):
+        with self._clock:
+            start = max(time.perf_counter(), self._busy_until)
+            self._busy_until = start + nbytes / self.bandwidth
+            done = self._busy_until + self.latency
+        delay = done - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+
+    def pwrite(self, offset, data):
+        written = super().pwrite(offset, data)
+        self._service(written)
+        return written
+
+    def pread(self, offset, size):
+        data = super().pread(offset, size)
+        self._service(len(data))
+        return data
+
+
+class SimulatedDevice(ImageFile):
+    """Image-file backend whose I/O runs through ThrottledIO (e.g. 200 MB/s, 0.1 ms)."""
+    def __init__(self, path, bandwidth_mb=200, latency_ms=0.1):
+        super().__init__(path)
+        self.bandwidth = bandwidth_mb * 1024 * 1024
+        self.latency = latency_ms / 1000
+
+    def open(self, writable=False, queue_depth=8, direct=False, access="sequential", bad_blocks=None):
+        return ThrottledIO(self.path, self.bandwidth, self.latency,
+                           writable=writable, queue_depth=queue_depth, direct=direct, bad_blocks=bad_blocks)
+
+
+# --- Stage benchmarks (each returns {name: MB/s}) ----------------------------------
+
+def bench_legacy_pass2(chunks, chunk_size):
+    """The original Pass-2 path: SHAKE chunk -> fresh key/nonce/Cipher -> update()+finalize()."""
+    engine = CSEE(SEED)
+    stream = engine.get_stream(chunk_size)
+    start = time.perf_counter()
+    for _ in range(chunks):
+        engine.encrypt_chunk(next(stream))
+    return _rate(chunks * chunk_size, time.perf_counter() - start)
+
+
+def bench_ctr_stream(chunks, chunk_size, nonce_mode):
+    """AESCTRStream writing into one reused buffer."""
+    engine = AESCTRStream(SEED, chunk_size, nonce_mode=nonce_mode)
+    buf = bytearray(chunk_size)
+    start = time.perf_counter()
+    for _ in range(chunks):
+        engine.fill_next(buf)
+    return _rate(chunks * chunk_size, time.perf_counter() - start)
+
+
+def bench_keystream(chunks, chunk_size, workers):
+    """Pass-1 SHAKE-256 keystream: single stream vs. the parallel producer pool."""
+    results = {}
+    for label, n in (("serial", 1), (f"{workers}_workers", workers)):
+        stream = CSEE(SEED).get_stream(chunk_size, workers=n)
+        start = time.perf_counter()
+        for _ in range(chunks):
+            next(stream)
+        results[f"csee.get_stream.{label}"] = _rate(chunks * chunk_size, time.perf_counter() - start)
+        stream.close()
+    return results
+
+
+def bench_pass2(chunks, chunk_size):
+    return {
+        "csee.encrypt_chunk": bench_legacy_pass2(chunks, chunk_size),
+        "aesctr.per_chunk": bench_ctr_stream(chunks, chunk_size, "per_chunk"),
+        "aesctr.stream": bench_ctr_stream(chunks, chunk_size, "stream"),
+    }
+
+
+def bench_watchdog(chunks, chunk_size):
+    watchdog = EntropyWatchdog()
+    data = bytes(AESCTRStream(SEED, chunk_size).read_at(0, chunk_size))
+    start = time.perf_counter()
+    for _ in range(chunks):
+        watchdog.analyze(data)
+    return {"watchdog.analyze": _rate(chunks * chunk_size, time.perf_counter() - start)}
+
+
+class _NullWatchdog(EntropyWatchdog):
+    """Watchdog that accepts every chunk without looking at it (overhead reference)."""
+    def analyze(self, data, threshold=7.9):
+        return {"entropy": 8.0, "chi2": 255.0, "monobit_p": 1.0, "ok": True}
+
+
+def bench_watchdog_overhead(workdir, total_bytes, chunk_size, repeat=3):
+    """
+    Pass-2 write phase with the live entropy watchdog vs. one that checks nothing (best
+    of `repeat` runs each). The two rates should match: checks that can't keep up fall
+    back to sampling instead of throttling the writer.
+    """
+    path = _sparse_image(workdir, total_bytes)
+    results = {}
+    for _ in range(repeat):
+        for name, watchdog in (("overhead.pass2.unchecked", _NullWatchdog()), ("overhead.pass2.watchdog", None)):
+            s = _sanitizer(path, workdir, chunk_size)
+            if watchdog is not None:
+                s.watchdog = watchdog
+            if not s.execute_wipe(SEED, stage=2):
+                raise RuntimeError(f"execute_wipe failed: {s.logger.events[-1:]}")
+            tel = s.telemetry["PASS 2: AES-CTR WIPE"]
+            rate = _rate(tel.counters.get("bytes_written", 0), tel.elapsed)
+            results[name] = max(results.get(name, 0.0), rate)
+    return results
+
+
+def _sanitizer(path, workdir, chunk_size, device=None):
+    from core.sanitizer import QSSPSanitizer
+    s = QSSPSanitizer(path, QuietUI(), MemoryLogger(workdir, "BENCH"))
+    s.chunk_size = chunk_size
+    if device is not None:
+        s.device = device
+    return s
+
+
+def _sparse_image(workdir, total_bytes):
+    path = os.path.join(workdir, "bench.img")
+    with open(path, "wb") as f:
+        f.truncate(total_bytes)
+    return path
+
+
+def bench_hash(workdir, total_bytes, chunk_size):
+    """Full-surface hashing of a sparse image: linear SHA-256 vs. parallel Merkle BLAKE2b."""
+    path = _sparse_image(workdir, total_bytes)
+    results = {}
+    for name, mode, algorithm in (("hash.linear.sha256", "linear", "sha256"),
+                                  ("hash.merkle.blake2b", "merkle", "blake2b")):
+        s = _sanitizer(path, workdir, chunk_size)
+        s.hash_mode, s.hash_algorithm = mode, algorithm
+        s.merkle_region = 4 * chunk_size
+        start = time.perf_counter()
+        s.calculate_physical_hash(name)
+        results[name] = _rate(total_bytes, time.perf_counter() - start)
+    return results
+
+
+def bench_wipe(workdir, total_bytes, chunk_size, device=None, prefix="wipe"):
+    """End-to-end execute_wipe (write + hash verify) for both passes."""
+    path = _sparse_image(workdir, total_bytes)
+    results = {}
+    for stage in (1, 2):
+        s = _sanitizer(path, workdir, chunk_size, device(path) if device else None)
+        start = time.perf_counter()
+        if not s.execute_wipe(SEED, stage=stage):
+            raise RuntimeError(f"execute_wipe stage {stage} failed: {s.logger.events[-1:]}")
+        results[f"{prefix}.pass{stage}"] = _rate(total_bytes, time.perf_counter() - start)
+    return results
+
+
+# --- Baseline tracking ----------------------------------------------------------------
+
+def compare(results, baseline, tolerance):
+    """Names whose throughput fell more than `tolerance` below the stored baseline."""
+    regressions = {}
+    for name, rate in results.items():
+        reference = baseline.get("results", {}).get(name)
+        if reference and rate < reference * (1 - tolerance):
+            regressions[name] = {"baseline": reference, "current": rate,
+                                 "change": rate / reference - 1}
+    return regressions
+
+
+def run(suites, total_mb=256, chunk_mb=1, workers=None, bandwidth_mb=200, latency_ms=0.1):
+    chunk_size = chunk_mb * 1024 * 1024
+    chunks = max(1, total_mb // chunk_mb)
+    total_bytes = chunks * chunk_size
+    workers = workers or os.cpu_count() or 1
+    results = {}
+
+    with tempfile.TemporaryDirectory(prefix="qssp_bench_") as workdir:
+        for suite in suites:
+            print(f"[*] {suite.upper()} ({chunks} x {chunk_mb} MB)")
+            if suite == "keystream":
+                stage = bench_keystream(chunks, chunk_size, workers)
+            elif suite == "pass2":
+                stage = bench_pass2(chunks, chunk_size)
+            elif suite == "watchdog":
+                stage = bench_watchdog(chunks, chunk_size)
+            elif suite == "overhead":
+                stage = bench_watchdog_overhead(workdir, total_bytes, chunk_size)
+            elif suite == "hash":
+                stage = bench_hash(workdir, total_bytes, chunk_size)
+            elif suite == "wipe":
+                stage = bench_wipe(workdir, total_bytes, chunk_size)
+            else:
+                stage = bench_wipe(workdir, total_bytes, chunk_size, prefix="simulated",
+                                   device=lambda p: SimulatedDevice(p, bandwidth_mb, latency_ms))
+            for name, rate in stage.items():
+                print(f"    {name:<32} | {rate:>9.1f} MB/s")
+            results.update(stage)
+
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "platform": platform.platform(),
+            "python": platform.python_version(),
+            "cpu_count": os.cpu_count(),
+            "total_mb": total_mb, "chunk_mb": chunk_mb, "workers": workers,
+            "simulated": {"bandwidth_mb": bandwidth_mb, "latency_ms": latency_ms},
+        },
+        "results": results,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Q-SSP throughput benchmarks")
+    parser.add_argument("--mb", type=int, default=256, help="Total data per measurement (MB)")
+    parser.add_argument("--chunk-mb", type=int, default=1, help="Chunk size (MB)")
+    parser.add_argument("--suite", action="append", choices=SUITES,
+                        help="Run only these suites (repeatable; default: all)")
+    parser.add_argument("--workers", type=int, help="Keystream producer workers (default: CPU count)")
+    parser.add_argument("--sim-bandwidth", type=float, default=200, help="Simulated device bandwidth (MB/s)")
+    parser.add_argument("--sim-latency", type=float, default=0.1, help="Simulated per-command latency (ms)")
+    parser.add_argument("--json", help="Write results to this JSON file")
+    parser.add_argument("--baseline", help="Compare against this JSON file; exit 1 on regression")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="Allowed slowdown vs. baseline (fraction)")
+    args = parser.parse_args()
+
+    report = run(args.suite or SUITES, args.mb, args.chunk_mb, args.workers, args.sim_bandwidth, args.sim_latency)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"[+] Results written to {args.json}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            regressions = compare(report["results"], json.load(f), args.tolerance)
+        for name, r in regressions.items():
+            print(f"[!] REGRESSION {name}: {r['current']:.1f} MB/s vs {r['baseline']:.1f} MB/s ({r['change'] * 100:+.1f}%)")
+        if regressions:
+            sys.exit(1)
+        print(f"[+] No regressions beyond {args.tolerance * 100:.0f}% of {args.baseline}")
@@ -0,0 +1,143 @@
+import errno
+import threading
+import time
+
+# Errors that point at the medium itself; anything else (EBADF, ENOSPC, a vanished device) still aborts
+MEDIA_ERRNOS = {getattr(errno, name) for name in ("EIO", "EILSEQ", "ENODATA", "EBADMSG") if hasattr(errno, name)}
+MEDIA_WINERRORS = {23, 27, 483, 1117}  # CRC, SECTOR_NOT_FOUND, DEVICE_HARDWARE_ERROR, IO_DEVICE
+
+
+class BadBlockBudgetExceeded(OSError):
+    """
+    The drive is failing: too many bad sectors to map out. Never a media error itself,
+    so bisection and raise_errors=False reads let it through and the pass aborts.
+    """
+
+
+def is_media_error(error):
+    return error.errno in MEDIA_ERRNOS or getattr(error, "winerror", None) in MEDIA_WINERRORS
+
+
+class BadBlockMap:
+    """
+    Compact map of sectors the drive refused: merged (first LBA, count) runs per kind
+    ("unwritable" / "unreadable"). Shared by every I/O thread of a session; once more
+    than `max_sectors` are recorded the drive is treated as failing and the pass aborts.
+    """
+    KINDS = ("unwritable", "unreadable")
+
+    def __init__(self, sector_size=512, max_sectors=8192):
+        self.sector_size = sector_size
+        self.max_sectors = max_sectors
+        self._runs = {kind: [] for kind in self.KINDS}
+        self._lock = threading.Lock()
+
+    def add(self, kind, offset, length):
+        first = offset // self.sector_size
+        last = -(-(offset + length) // self.sector_size)
+        with self._lock:
+            runs = self._runs[kind]
+            runs.append([first, last - first])
+            runs.sort()
+            merged = [runs[0]]
+            for start, count in runs[1:]:
+                if start <= merged[-1][0] + merged[-1][1]:
+                    merged[-1][1] = max(merged[-1][1], start + count - merged[-1][0])
+                else:
+                    merged.append([start, count])
+            self._runs[kind] = merged
+            total = self._sectors()
+        if total > self.max_sectors:
+            raise BadBlockBudgetExceeded(errno.ECANCELED, f"{total} bad sectors (limit {self.max_sectors}): drive is failing")
+
+    def _sectors(self):
+        """Distinct sectors: one that can be neither written nor read counts once."""
+        total = end = 0
+        for start, count in sorted(run for runs in self._runs.values() for run in runs):
+            total += max(0, start + count - max(start, end))
+            end = max(end, start + count)
+        return total
+
+    @property
+    def sectors(self):
+        with self._lock:
+            return self._sectors()
+
+    def __bool__(self):
+        return self.sectors > 0
+
+    def extents(self):
+        """Every recorded run as device byte extents (offset, length), both kinds."""
+        with self._lock:
+            runs = sorted(run for kind_runs in self._runs.values() for run in kind_runs)
+        return [(start * self.sector_size, count * self.sector_size) for start, count in runs]
+
+    def overlapping(self, offset, length, extents=None):
+        """Recorded bytes inside [offset, offset + length), as (start, end) relative to offset."""
+        found = []
+        for start, size in (self.extents() if extents is None else extents):
+            lo, hi = max(start, offset), min(start + size, offset + length)
+            if lo < hi:
+                found.append((lo - offset, hi - offset))
+        return found
+
+    def to_dict(self):
+        with self._lock:
+            return {"sector_size": self.sector_size,
+                    **{kind: [list(run) for run in runs] for kind, runs in self._runs.items()}}
+
+    def merge(self, state):
+        """Folds in a to_dict() snapshot (journal on resume, verify workers)."""
+        if not state:
+            return
+        scale = state.get("sector_size", self.sector_size)
+        for kind in self.KINDS:
+            for first, count in state.get(kind, []):
+                self.add(kind, first * scale, count * scale)
+
+    def __str__(self):
+        with self._lock:
+            if not self._sectors():
+                return "NONE"
+            parts = []
+            for kind, runs in self._runs.items():
+                if runs:
+                    shown = ", ".join(f"{s}" if n == 1 else f"{s}-{s + n - 1}" for s, n in runs[:8])
+                    more = f" (+{len(runs) - 8} more)" if len(runs) > 8 else ""
+                    parts.append(f"{kind.upper()} LBA {shown}{more}")
+            return f"{self._sectors()} SECTORS | " + " | ".join(parts)
+
+
+def bisect_io(op, offset, length, sector_size, retries=3):
+    """
+    Retries a failed I/O on [offset, offset + length) by halving it until the pieces
+    succeed or are down to single sectors; a sector gets `retries` attempts with
+    exponential back-off. A 1 MB chunk with one bad sector costs ~22 small I/Os.
+    Returns the (offset, length) pieces that still failed.
+    """
+    failed = []
+    stack = [(offset, length)]
+    while stack:
+        start, size = stack.pop()
+        if size <= sector_size:
+            for attempt in range(retries):
+                try:
+                    op(start, size)
+                    break
+                except OSError as e:
+                    if not is_media_error(e):
+                        raise
+                    time.sleep(0.01 * 2 ** attempt)
+            else:
+                failed.append((start, size))
+            continue
+        try:
+            op(start, size)
+            continue
+        except OSError as e:
+            if not is_media_error(e):
+                raise
+        half = max(sector_size, size // 2 // sector_size * sector_size)
+        stack.append((start + half, size - half))
+        stack.append((start, half))  # Low half first: keeps the retries in LBA order
+    return failed
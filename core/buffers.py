@@ -0,0 +1,57 @@
+import mmap
+import queue
+import sys
+
+
+class BufferRing:
+    """
+    Fixed pool of preallocated, page-aligned chunk buffers for the wipe pipeline.
+    Buffers circulate producer -> writer -> producer and are filled in place, so a
+    pass allocates nothing per chunk and RSS per drive is at most count * size.
+    Every buffer is zeroed on release: keystream never lingers in a free slot.
+    On Linux a released slot is dropped with MADV_DONTNEED instead (the kernel hands
+    back zero pages on next touch), so only the slots in flight stay resident and a
+    rack-wide memory budget bounds real memory, not just the slots handed out.
+    """
+    def __init__(self, count, size):
+        self.count = count
+        self.size = size
+        # Anonymous mmap is page-aligned; with size a multiple of PAGESIZE every slot is too
+        # Private anonymous pages read back as zeros after MADV_DONTNEED (shared ones keep their contents)
+        self._drop = (sys.platform.startswith("linux") and hasattr(mmap, "MADV_DONTNEED")
+                      and size % mmap.PAGESIZE == 0)
+        if self._drop:
+            self._arena = mmap.mmap(-1, count * size, flags=mmap.MAP_PRIVATE | mmap.MAP_ANONYMOUS)
+        else:
+            self._arena = mmap.mmap(-1, count * size)
+        self._arena_view = memoryview(self._arena)
+        self._views = [self._arena_view[i * size:(i + 1) * size] for i in range(count)]
+        self._offsets = {id(view): i * size for i, view in enumerate(self._views)}
+        self._zeros = bytes(size)
+        self._free = queue.Queue()
+        for view in self._views:
+            self._free.put(view)
+
+    def acquire(self, timeout=None):
+        """Next free buffer (writable memoryview); raises queue.Empty on timeout."""
+        return self._free.get(timeout=timeout)
+
+    def release(self, buf):
+        if self._drop:
+            self._arena.madvise(mmap.MADV_DONTNEED, self._offsets[id(buf)], self.size)
+        else:
+            buf[:] = self._zeros
+        self._free.put(buf)
+
+    @property
+    def available(self):
+        return self._free.qsize()
+
+    def close(self):
+        for view in self._views:
+            view.release()
+        self._arena_view.release()
+        try:
+            self._arena.close()
+        except BufferError:
+            pass  # A stray slice is still alive; the arena goes with the GC instead
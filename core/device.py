@@ -0,0 +1,321 @@
+import errno
+import os
+import re
+import stat
+import subprocess
+import sys
+import time
+from core.pio import MappedIO, PositionalIO
+
+# Linux <linux/fs.h> ioctls
+BLKSSZGET = 0x1268        # Logical sector size (int)
+BLKGETSIZE64 = 0x80081272  # Device size in bytes (u64)
+BLKDISCARD = 0x1277       # Unmap range: uint64[2] {start, length}
+BLKZEROOUT = 0x127F       # Device-side zeroing of a range, same argument
+
+# fallocate(2) modes for image files
+FALLOC_FL_KEEP_SIZE = 0x01
+FALLOC_FL_PUNCH_HOLE = 0x02
+
+# Windows DeviceIoControl codes
+IOCTL_DISK_GET_DRIVE_GEOMETRY = 0x00070000
+IOCTL_DISK_GET_LENGTH_INFO = 0x0007405C
+
+
+class BlockDevice:
+    """
+    Backend-neutral view of a wipe target: capacity, logical sector size, media type,
+    seizure and positional I/O. Everything above this layer (passes, hashing, audits)
+    only sees byte offsets, so the same pipeline runs on Windows disks, Linux block
+    devices and plain image files.
+    """
+    def __init__(self, path, name):
+        self.path = path
+        self.name = name  # Filesystem-safe tag for journals and sidecars
+
+    def size(self):
+        raise NotImplementedError
+
+    def sector_size(self):
+        return 512
+
+    def rotational(self):
+        """True for spinning media, False for flash, None when the backend can't tell."""
+        return None
+
+    def seize(self, logger, scope=None):
+        """
+        Takes the target away from the OS before the first write; True on success.
+        `scope` (core.scope.WipeScope) narrows what must be released; None = whole device.
+        """
+        return True
+
+    def advise(self, fd, access):
+        """Page-cache hint for a whole-target sweep ("sequential", "random" or "dontneed")."""
+        if not hasattr(os, "posix_fadvise"):
+            return
+        advice = {"sequential": os.POSIX_FADV_SEQUENTIAL,
+                  "random": os.POSIX_FADV_RANDOM,
+                  "dontneed": os.POSIX_FADV_DONTNEED}[access]
+        try:
+            os.posix_fadvise(fd, 0, 0, advice)
+        except OSError:
+            pass  # Purely advisory
+
+    def discard(self, fd, offset, length):
+        """
+        Device-level release of [offset, offset + length) without pushing data through the host.
+        Returns the mechanism used, or None if this backend has none.
+        """
+        return None
+
+    def allocate(self, fd, offset, length):
+        """
+        Backs [offset, offset + length) with real storage without writing it (sparse files).
+        Returns the mechanism used, or None if this backend has nothing to allocate.
+        """
+        return None
+
+    def open(self, writable=False, queue_depth=8, direct=False, access="sequential", bad_blocks=None):
+        """PositionalIO on this target with the page-cache hint already applied."""
+        drive = PositionalIO(self.path, writable=writable, queue_depth=queue_depth, direct=direct,
+                             bad_blocks=bad_blocks)
+        if not drive.direct:
+            self.advise(drive.fd, access)
+        return drive
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.path!r})"
+
+
+class WindowsDisk(BlockDevice):
+    """\\\\.\\PhysicalDriveN, sized via DeviceIoControl and seized with diskpart."""
+    def __init__(self, index):
+        super().__init__(f"\\\\.\\PhysicalDrive{index}", str(index))
+        self.index = index
+
+    def _ioctl(self, code, out):
+        import ctypes
+        kernel32 = ctypes.windll.kernel32
+        # OPEN_EXISTING = 3, FILE_SHARE_READ = 1, FILE_SHARE_WRITE = 2
+        handle = kernel32.CreateFileW(self.path, 0x80000000 | 0x40000000, 0x1 | 0x2, None, 3, 0, None)
+        if handle == -1:
+            # If standard handle fails, the drive is locked.
+            return False
+        returned = ctypes.c_ulong()
+        try:
+            return bool(kernel32.DeviceIoControl(handle, code, None, 0, ctypes.byref(out), ctypes.sizeof(out),
+                                                 ctypes.byref(returned), None))
+        finally:
+            kernel32.CloseHandle(handle)
+
+    def size(self):
+        import ctypes
+        output = ctypes.c_longlong()
+        return output.value if self._ioctl(IOCTL_DISK_GET_LENGTH_INFO, output) else 0
+
+    def sector_size(self):
+        import ctypes
+
+        class DISK_GEOMETRY(ctypes.Structure):
+            _fields_ = [("Cylinders", ctypes.c_longlong), ("MediaType", ctypes.c_int),
+                        ("TracksPerCylinder", ctypes.c_ulong), ("SectorsPerTrack", ctypes.c_ulong),
+                        ("BytesPerSector", ctypes.c_ulong)]
+        geometry = DISK_GEOMETRY()
+        if self._ioctl(IOCTL_DISK_GET_DRIVE_GEOMETRY, geometry) and geometry.BytesPerSector:
+            return geometry.BytesPerSector
+        return 512
+
+    def seize(self, logger, scope=None):
+        """
+        ALIGNMENT: 'Low-Level Hardware Seizure' [Whitepaper Section 4.1]
+        Uses Diskpart to offline the volume and strip the MBR/GPT.
+        Scoped wipes keep the partition table: the disk is only taken offline.
+        """
+        if scope is None or scope.whole_device:
+            commands = f"select disk {self.index}\nclean\nrescan"
+        else:
+            commands = f"select disk {self.index}\noffline disk"
+        script_file = "seize.txt"
+        with open(script_file, "w") as f: f.write(commands)
+
+        try:
+            # We assume the UI or Main has already elevated privileges
+            subprocess.run(["diskpart", "/s", script_file], capture_output=True, check=True)
+            time.sleep(2) # Let Windows catch up
+            os.remove(script_file)
+            return True
+        except Exception as e:
+            logger.log_event("ERROR", "SEIZE", f"Diskpart failed: {e}")
+            if os.path.exists(script_file): os.remove(script_file)
+            return False
+
+
+class LinuxBlockDevice(BlockDevice):
+    """
+    /dev/sdX, /dev/nvmeXnY, /dev/loopN ... sized with BLKGETSIZE64/BLKSSZGET.
+    Seizure refuses targets that are (or have partitions) still mounted.
+    """
+    def __init__(self, path):
+        super().__init__(path, os.path.basename(path))
+        self.sysfs = f"/sys/class/block/{os.path.basename(os.path.realpath(path))}"
+        self._unsupported = set()  # Discard ioctls this device has already refused
+
+    def _ioctl(self, code, fmt):
+        import fcntl
+        import struct
+        fd = os.open(self.path, os.O_RDONLY)
+        try:
+            buf = fcntl.ioctl(fd, code, bytes(struct.calcsize(fmt)))
+            return struct.unpack(fmt, buf)[0]
+        finally:
+            os.close(fd)
+
+    def size(self):
+        try:
+            return self._ioctl(BLKGETSIZE64, "Q")
+        except OSError:
+            return 0
+
+    def sector_size(self):
+        try:
+            return self._ioctl(BLKSSZGET, "i") or 512
+        except OSError:
+            return 512
+
+    def rotational(self):
+        try:
+            with open(os.path.join(self.sysfs, "queue", "rotational")) as f:
+                return f.read().strip() == "1"
+        except OSError:
+            return None
+
+    def _holders(self, scope=None):
+        """
+        Every kernel name that lives on this disk: the disk itself plus its partitions
+        (only those overlapping `scope`, when one is given).
+        """
+        names = {os.path.basename(self.sysfs)}
+        try:
+            for entry in os.listdir(self.sysfs):
+                if not os.path.exists(os.path.join(self.sysfs, entry, "partition")):
+                    continue
+                if scope is None or self._overlaps(entry, scope):
+                    names.add(entry)
+        except OSError:
+            pass
+        return names
+
+    def _overlaps(self, partition, scope):
+        try:
+            # sysfs start/size are always in 512-byte units, whatever the logical sector size
+            with open(os.path.join(self.sysfs, partition, "start")) as f:
+                start = int(f.read()) * 512
+            with open(os.path.join(self.sysfs, partition, "size")) as f:
+                end = start + int(f.read()) * 512
+        except (OSError, ValueError):
+            return True  # Can't tell: treat it as in the way
+        return any(offset < end and start < offset + length for offset, length in scope.extents)
+
+    def discard(self, fd, offset, length):
+        import fcntl
+        import struct
+        span = struct.pack("QQ", offset, length)
+        # Unmap first (instant on flash); fall back to WRITE ZEROES if the device can't discard
+        rejected = None
+        for name, code in (("BLKDISCARD", BLKDISCARD), ("BLKZEROOUT", BLKZEROOUT)):
+            if name in self._unsupported:
+                continue
+            try:
+                fcntl.ioctl(fd, code, span)
+                return name
+            except OSError as e:
+                if e.errno == errno.EINVAL:
+                    # This range was refused (alignment, granularity), not the ioctl: keep it for the next one
+                    rejected = e
+                    continue
+                if e.errno not in (errno.EOPNOTSUPP, errno.ENOTTY):
+                    raise
+                self._unsupported.add(name)
+        if rejected is not None:
+            raise rejected
+        return None
+
+    def seize(self, logger, scope=None):
+        names = self._holders(scope)
+        try:
+            with open("/proc/mounts") as f:
+                mounted = [line.split()[0] for line in f
+                           if os.path.basename(os.path.realpath(line.split()[0])) in names]
+        except OSError:
+            mounted = []
+        if mounted:
+            logger.log_event("ERROR", "SEIZE", f"{self.path} is in use", detail=f"Mounted: {', '.join(mounted)}")
+            return False
+        os.sync()  # Nothing of ours may still be queued behind the wipe
+        return True
+
+
+class ImageFile(BlockDevice):
+    """
+    Regular file holding a disk image (VM disks, forensic copies, database files, test targets).
+    Buffered access goes through MappedIO: reads are views of an mmap of the file.
+    """
+    def __init__(self, path):
+        super().__init__(path, re.sub(r"[^A-Za-z0-9_.-]+", "_", os.path.basename(path)))
+
+    def size(self):
+        try:
+            return os.path.getsize(self.path)
+        except OSError:
+            return 0
+
+    def rotational(self):
+        return False
+
+    def open(self, writable=False, queue_depth=8, direct=False, access="sequential", bad_blocks=None):
+        if direct or self.size() == 0:
+            return super().open(writable=writable, queue_depth=queue_depth, direct=direct, access=access,
+                                bad_blocks=bad_blocks)
+        drive = MappedIO(self.path, writable=writable, queue_depth=queue_depth, bad_blocks=bad_blocks)
+        self.advise(drive.fd, access)
+        drive.madvise(access)
+        return drive
+
+    def allocate(self, fd, offset, length):
+        """Reserves blocks for a hole, so the passes overwrite real storage and can't hit ENOSPC midway."""
+        if not hasattr(os, "posix_fallocate"):
+            return None
+        os.posix_fallocate(fd, offset, length)
+        return "FALLOCATE"
+
+    def discard(self, fd, offset, length):
+        """Punches a hole: the filesystem frees the extents (and TRIMs them if it can)."""
+        if not sys.platform.startswith("linux"):
+            return None
+        import ctypes
+        import ctypes.util
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        libc.fallocate.argtypes = [ctypes.c_int, ctypes.c_int, ctypes.c_int64, ctypes.c_int64]
+        if libc.fallocate(fd, FALLOC_FL_PUNCH_HOLE | FALLOC_FL_KEEP_SIZE, offset, length) != 0:
+            err = ctypes.get_errno()
+            if err == errno.EOPNOTSUPP:  # Filesystem has no hole punching
+                return None
+            raise OSError(err, os.strerror(err))
+        return "PUNCH_HOLE"
+
+
+def open_device(target):
+    """
+    Picks the backend for `target`: a bare disk index on Windows, otherwise a path to
+    a block device (including loop devices) or an image file.
+    """
+    target = str(target)
+    if sys.platform == "win32" and target.isdigit():
+        return WindowsDisk(target)
+    mode = os.stat(target).st_mode
+    if stat.S_ISBLK(mode):
+        return LinuxBlockDevice(target)
+    if stat.S_ISREG(mode):
+        return ImageFile(target)
+    raise ValueError(f"Unsupported wipe target: {target}")
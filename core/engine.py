@@ -1,30 +1,104 @@
 import hashlib
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from typing import Generator
 from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
 from cryptography.hazmat.backends import default_backend
 
+
+def _squeeze(seed: bytes, counter: int, chunk_size: int) -> bytes:
+    """
+    One SHAKE-256 block for a given counter.
+    Kept at module level so it can be pickled into worker processes.
+    """
+    # ALIGNMENT: 'Block Mixing and Salting' [Whitepaper Section 5.2]
+    salt = counter.to_bytes(8, 'big')
+    return hashlib.shake_256(seed + salt).digest(chunk_size)
+
+
 class CSEE:
     """
     Cryptographically Secure Expansion Engine (CSEE).
     ALIGNMENT: 'Cryptographically Secure Expansion Engine' [Whitepaper Section 4.2]
     """
-    def __init__(self, seed: bytes):
+    def __init__(self, seed: bytes, chunk_size: int = 1024 * 1024):
         if not isinstance(seed, bytes):
             raise TypeError("Quantum seed must be bytes")
         self.seed = seed
+        self.chunk_size = chunk_size  # Layout used by the random-access API
         self.counter = 0
 
-    def get_stream(self, chunk_size: int = 1024 * 1024) -> Generator[bytes, None, None]:
+    def get_stream(self, chunk_size: int = 1024 * 1024, workers: int = 1,
+                   executor: str = "process", stride: int = 1, pool=None) -> Generator[bytes, None, None]:
         """
         Squeezes SHAKE-256 to generate infinite entropy.
+
+        With workers > 1 the counter space is fanned out over a process (or thread)
+        pool. Chunks are still yielded in counter order and are byte-identical to
+        the single-threaded stream. `stride` is only a prefetch hint: pass 2 calls
+        encrypt_chunk between yields, which bumps the counter by one extra step.
+        An existing executor can be passed as `pool` (shared between several drives);
+        `workers` then only sets how far ahead this stream prefetches.
         """
+        if workers > 1 or pool is not None:
+            yield from self._parallel_stream(chunk_size, workers, executor, stride, pool)
+            return
+
         while True:
-            # ALIGNMENT: 'Block Mixing and Salting' [Whitepaper Section 5.2]
-            salt = self.counter.to_bytes(8, 'big')
-            hasher = hashlib.shake_256(self.seed + salt)
-            yield hasher.digest(chunk_size)
+            yield _squeeze(self.seed, self.counter, chunk_size)
             self.counter += 1
 
+    def _parallel_stream(self, chunk_size: int, workers: int, executor: str,
+                         stride: int, pool=None) -> Generator[bytes, None, None]:
+        owns_pool = pool is None
+        if owns_pool:
+            pool_cls = ProcessPoolExecutor if executor == "process" else ThreadPoolExecutor
+            pool = pool_cls(max_workers=workers)
+        depth = max(1, workers) * 2  # Keep every worker busy while the consumer drains
+        pending = deque()
+        next_counter = self.counter
+
+        try:
+            while True:
+                # Someone moved the counter in a way we didn't predict -> re-plan
+                if pending and pending[0][0] != self.counter:
+                    for _, future in pending: future.cancel()
+                    pending.clear()
+                    next_counter = self.counter
+
+                while len(pending) < depth:
+                    pending.append((next_counter, pool.submit(_squeeze, self.seed, next_counter, chunk_size)))
+                    next_counter += stride
+
+                _, future = pending.popleft()
+                yield future.result()
+                self.counter += 1
+        finally:
+            for _, future in pending: future.cancel()
+            if owns_pool:
+                pool.shutdown(wait=False)
+
+    def fill_at(self, offset: int, buf) -> int:
+        """
+        Random access into the Pass-1 stream: writes the exact bytes the wipe laid
+        down at device `offset` into `buf`. Pure function of (seed, chunk_size, offset),
+        so it never touches self.counter.
+        """
+        view = memoryview(buf)
+        done = 0
+        while done < len(view):
+            index, within = divmod(offset + done, self.chunk_size)
+            take = min(self.chunk_size - within, len(view) - done)
+            # SHAKE output is prefix-stable, so only squeeze as far as we need
+            view[done:done + take] = memoryview(_squeeze(self.seed, index, within + take))[within:]
+            done += take
+        return done
+
+    def read_at(self, offset: int, length: int) -> bytes:
+        buf = bytearray(length)
+        self.fill_at(offset, buf)
+        return bytes(buf)
+
     def encrypt_chunk(self, chunk: bytes) -> bytes:
         """
         ALIGNMENT: 'Encrypted Overwrite' [Whitepaper Section 4.3]
@@ -40,4 +114,115 @@ class CSEE:
         encryptor = cipher.encryptor()
         
         self.counter += 1
-        return encryptor.update(chunk) + encryptor.finalize()
\ No newline at end of file
+        return encryptor.update(chunk) + encryptor.finalize()
+
+class AESCTRStream:
+    """
+    Dedicated Pass-2 keystream engine.
+    ALIGNMENT: 'Encrypted Overwrite' [Whitepaper Section 4.3]
+
+    Holds a single transient key for the whole pass and writes straight into
+    caller-supplied buffers via update_into().
+      - 'stream' mode: one encryptor, the CTR counter runs across the whole device.
+        The keystream is AES(zero blocks), so no SHAKE layer and no per-chunk setup.
+      - 'per_chunk' mode: reproduces CSEE.encrypt_chunk output byte-for-byte
+        (SHAKE chunk XOR AES-CTR under a nonce derived per chunk).
+    Both layouts are seekable: fill_at()/read_at() return the bytes at any device offset.
+    """
+    MODES = ("stream", "per_chunk")
+
+    def __init__(self, seed: bytes, chunk_size: int = 1024 * 1024, nonce_mode: str = "stream"):
+        if not isinstance(seed, bytes):
+            raise TypeError("Quantum seed must be bytes")
+        if nonce_mode not in self.MODES:
+            raise ValueError(f"Unknown nonce mode: {nonce_mode}")
+        self.seed = seed
+        self.chunk_size = chunk_size
+        self.nonce_mode = nonce_mode
+        self.position = 0
+
+        # Derive the transient key once (never stored beyond this object)
+        self._key = hashlib.sha256(seed + b"TRANSIENT_KEY_GEN").digest()
+        self._nonce = hashlib.sha256(seed + b"PASS2_STREAM_NONCE").digest()[:16]
+        self._zeros = memoryview(bytes(chunk_size))
+        self._encryptor = None
+        self.seek(0)
+
+    def _ctr_at(self, nonce: bytes, offset: int):
+        """Encryptor positioned `offset` bytes into the CTR stream that starts at `nonce`."""
+        block = (int.from_bytes(nonce, 'big') + offset // 16) % (1 << 128)
+        encryptor = Cipher(algorithms.AES(self._key), modes.CTR(block.to_bytes(16, 'big')),
+                           backend=default_backend()).encryptor()
+        if offset % 16:
+            encryptor.update(bytes(offset % 16))
+        return encryptor
+
+    def _keystream_into(self, encryptor, view) -> int:
+        done = 0
+        while done < len(view):
+            take = min(len(self._zeros), len(view) - done)
+            done += encryptor.update_into(self._zeros[:take], view[done:done + take])
+        return done
+
+    def seek(self, offset: int):
+        """Repositions the sequential fill_next() cursor."""
+        self.position = offset
+        if self.nonce_mode == "stream":
+            self._encryptor = self._ctr_at(self._nonce, offset)
+
+    def fill_next(self, buf) -> int:
+        """
+        Fills `buf` (bytearray / writable memoryview) with the next run of keystream.
+        Returns the number of bytes written.
+        """
+        if self.nonce_mode == "stream":
+            written = self._keystream_into(self._encryptor, memoryview(buf))
+        else:
+            written = self.fill_at(self.position, buf)
+        self.position += written
+        return written
+
+    def fill_at(self, offset: int, buf) -> int:
+        """
+        Random access: writes the Pass-2 bytes at device `offset` into `buf`.
+        Does not move the fill_next() cursor.
+        """
+        view = memoryview(buf)
+        if self.nonce_mode == "stream":
+            return self._keystream_into(self._ctr_at(self._nonce, offset), view)
+
+        done = 0
+        while done < len(view):
+            index, within = divmod(offset + done, self.chunk_size)
+            take = min(self.chunk_size - within, len(view) - done)
+            # Legacy layout: encrypt_chunk bumped the shared counter, so chunk i sits on 2*i
+            counter = index * 2
+            nonce = hashlib.sha256(self.seed + counter.to_bytes(8, 'big')).digest()[:16]
+            shake = memoryview(_squeeze(self.seed, counter, within + take))[within:]
+            done += self._ctr_at(nonce, within).update_into(shake, view[done:done + take])
+        return done
+
+    def read_at(self, offset: int, length: int) -> bytes:
+        buf = bytearray(length)
+        self.fill_at(offset, buf)
+        return bytes(buf)
+
+    def get_stream(self) -> Generator[bytes, None, None]:
+        """
+        Convenience generator mirroring CSEE.get_stream (allocates one object per chunk).
+        """
+        while True:
+            buf = bytearray(self.chunk_size)
+            self.fill_next(buf)
+            yield bytes(buf)
+
+
+def open_pass_stream(seed: bytes, stage: int, chunk_size: int = 1024 * 1024,
+                     nonce_mode: str = "stream"):
+    """
+    Seekable view of exactly what pass `stage` writes to the device.
+    Both engines expose fill_at(offset, buf) / read_at(offset, length).
+    """
+    if stage == 1:
+        return CSEE(seed, chunk_size)
+    return AESCTRStream(seed, chunk_size, nonce_mode=nonce_mode)
\ No newline at end of file
@@ -1,52 +1,155 @@
 import requests # type: ignore
+import os
 import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
 from ui import Q_UI
 import urllib3 # type: ignore
 
 
+class QuantumLinkError(ConnectionError):
+    pass
+
+
 class QuantumIngestor:
-    # Use the specific API endpoint for bytes
+    # Use the specific API endpoint for bytes (ANU jsonI format; QSSP_QRNG_URL points elsewhere, e.g. a stand-in)
     urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
-    API_URL = "https://qrng.anu.edu.au/API/jsonI.php?length=32&type=uint8"
+    ANU_URL = "https://qrng.anu.edu.au/API/jsonI.php"
+    API_URL = os.environ.get("QSSP_QRNG_URL", ANU_URL)
+    SEED_BYTES = 32
+    MAX_BATCH = 1024  # ANU caps `length` per request
+    VERIFY_TLS = False
+    max_retries = 3
+    timeout = 25
 
-    @staticmethod
-    def get_quantum_seed():
-        ui = Q_UI() # Initialize once
-        max_retries = 3
-        
-        # Create a session to handle connection pooling
-        session = requests.Session()
-        session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'application/json'
-        })
-
-        for i in range(max_retries):
-            # Cleanly draw the attempt without messy overlaps
-            sys.stdout.write(f"\r{ui.dim}[*] Q-SSP: Quantum Handshake (ANU Lab) | Attempt {i+1}...{ui.reset}")
-            sys.stdout.flush()
-            
-            try:
-                # Use the session with a slightly shorter timeout for faster retries
-                r = session.get(QuantumIngestor.API_URL, timeout=25, verify=False)
-                
-                if r.status_code == 200:
-                    data = r.json()
-                    if data.get('success'):
-                        q_bytes = bytes(data['data'])
-                        # Print success on a new line to keep the progress bar clean
-                        print(f"\n{ui.cyan}[+] QUANTUM ROOT ESTABLISHED: {q_bytes.hex()[:32]}...{ui.reset}")
-                        return q_bytes
-                
-                # If status code isn't 200, wait and try again
-                time.sleep(2)
-                
-            except Exception as e:
-                # Log specific error for debugging if needed, then sleep
+    _session = None
+    _session_lock = threading.Lock()
+
+    @classmethod
+    def configure(cls, url=None, verify_tls=None):
+        if url:
+            cls.API_URL = url
+        if verify_tls is not None:
+            cls.VERIFY_TLS = verify_tls
+
+    @classmethod
+    def verified(cls):
+        """Only the ANU endpoint itself may be certified as a quantum source."""
+        return cls.API_URL == cls.ANU_URL
+
+    @classmethod
+    def source(cls):
+        """Provenance of the seeds, as the audit log and the certificate state it."""
+        if cls.verified():
+            return "VERIFIED (ANU VACUUM SOURCE)"
+        return f"UNVERIFIED ({cls.API_URL}) - NOT A CERTIFIED QUANTUM SOURCE"
+
+    @classmethod
+    def lab(cls):
+        return "ANU Lab" if cls.verified() else urlparse(cls.API_URL).netloc or cls.API_URL
+
+    @classmethod
+    def session(cls):
+        """One pooled session for the whole process (keep-alive across handshakes)."""
+        with cls._session_lock:
+            if cls._session is None:
+                cls._session = requests.Session()
+                cls._session.headers.update({
+                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+                    'Accept': 'application/json'
+                })
+            return cls._session
+
+    @classmethod
+    def fetch_bytes(cls, length, quiet=False):
+        """
+        `length` quantum bytes in as few requests as the API allows.
+        Raises QuantumLinkError once every retry of a batch has failed.
+        """
+        ui = None if quiet else Q_UI()  # Background fetches stay off the terminal entirely
+        out = bytearray()
+        while len(out) < length:
+            batch = min(cls.MAX_BATCH, length - len(out))
+            for i in range(cls.max_retries):
+                if not quiet:
+                    # Cleanly draw the attempt without messy overlaps
+                    sys.stdout.write(f"\r{ui.dim}[*] Q-SSP: Quantum Handshake ({cls.lab()}) | Attempt {i+1}...{ui.reset}")
+                    sys.stdout.flush()
+                try:
+                    r = cls.session().get(cls.API_URL, params={"length": batch, "type": "uint8"},
+                                          timeout=cls.timeout, verify=cls.VERIFY_TLS)
+                    if r.status_code == 200:
+                        data = r.json()
+                        if data.get('success') and len(data['data']) == batch:
+                            out += bytes(data['data'])
+                            break
+                except Exception:
+                    pass
+                # Failed attempt: wait and try again
                 time.sleep(2)
-        
+            else:
+                raise QuantumLinkError(f"Quantum Link Failure after {cls.max_retries} attempts ({cls.API_URL})")
+        return bytes(out)
+
+    @classmethod
+    def fetch_seeds(cls, count, quiet=False):
+        """
+        Seed reservoir: `count` distinct root seeds carved out of batched requests
+        (32 seeds per ANU call instead of one handshake per drive). A source that keeps
+        repeating itself is broken, not unlucky: QuantumLinkError after max_retries refills.
+        """
+        seeds = []
+        for _ in range(1 + cls.max_retries):
+            pool = cls.fetch_bytes((count - len(seeds)) * cls.SEED_BYTES, quiet=quiet)
+            for start in range(0, len(pool), cls.SEED_BYTES):
+                seed = pool[start:start + cls.SEED_BYTES]
+                if seed not in seeds:  # Every drive must get its own keystream
+                    seeds.append(seed)
+            if len(seeds) >= count:
+                return seeds[:count]
+        raise QuantumLinkError(f"QRNG kept returning duplicate seeds ({len(seeds)} of {count} distinct, {cls.API_URL})")
+
+    @classmethod
+    def reserve(cls, count=1):
+        """
+        Starts fetching `count` seeds in the background and returns the future, so the
+        handshake overlaps with the pre-wipe hash instead of following it.
+        """
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="qrng")
+        future = executor.submit(cls.fetch_seeds, count, True)
+        executor.shutdown(wait=False)
+        return future
+
+    @classmethod
+    def claim(cls, future):
+        """Waits for a reserve() future; same UI and hard-exit policy as get_quantum_seed."""
+        ui = Q_UI()
+        if not future.done():
+            print(f"\n{ui.dim}[*] Q-SSP: Waiting for Quantum Handshake ({cls.lab()})...{ui.reset}")
+        try:
+            seeds = future.result()
+        except QuantumLinkError:
+            cls._link_failure(ui)
+        for seed in seeds:
+            print(f"{ui.cyan}[+] QUANTUM ROOT ESTABLISHED: {seed.hex()[:32]}...{ui.reset}")
+        return seeds
+
+    @staticmethod
+    def _link_failure(ui):
         # FINAL FAILURE - Hard exit as requested (Only Quantum or Nothing)
         print(f"\n{ui.red}[!] CRITICAL: Quantum Link Failure. Lab unresponsive.{ui.reset}")
         print(f"{ui.dim}>>> Check internet connection or ANU Lab status at qrng.anu.edu.au{ui.reset}")
-        sys.exit(1)
\ No newline at end of file
+        sys.exit(1)
+
+    @staticmethod
+    def get_quantum_seed():
+        ui = Q_UI() # Initialize once
+        try:
+            q_bytes = QuantumIngestor.fetch_bytes(QuantumIngestor.SEED_BYTES)
+        except QuantumLinkError:
+            QuantumIngestor._link_failure(ui)
+        # Print success on a new line to keep the progress bar clean
+        print(f"\n{ui.cyan}[+] QUANTUM ROOT ESTABLISHED: {q_bytes.hex()[:32]}...{ui.reset}")
+        return q_bytes
@@ -0,0 +1,104 @@
+import hashlib
+import json
+import os
+
+# Digest constructors selectable for surface hashing (both 32-byte digests)
+HASH_ALGORITHMS = {
+    "sha256": hashlib.sha256,
+    "blake2b": lambda: hashlib.blake2b(digest_size=32),
+}
+
+LEAF_PREFIX = b"\x00"  # Domain separation: a leaf can never be replayed as an inner node
+NODE_PREFIX = b"\x01"
+
+
+def new_hasher(algorithm):
+    try:
+        return HASH_ALGORITHMS[algorithm]()
+    except KeyError:
+        raise ValueError(f"Unsupported hash algorithm: {algorithm}") from None
+
+
+class MerkleTree:
+    """
+    Merkle tree over fixed-size surface regions.
+    Leaves are H(0x00 || region bytes), inner nodes H(0x01 || left || right); an odd node
+    at the end of a level is promoted unchanged (no duplication, so no second-preimage
+    games with repeated leaves). The root stands in for a whole-disk hash, while any single
+    region can later be re-read and proven against it with log2(n) sibling digests.
+    """
+    def __init__(self, leaves, algorithm="sha256", region_size=None, total_bytes=None):
+        self.algorithm = algorithm
+        self.region_size = region_size
+        self.total_bytes = total_bytes
+        self.fields = {}  # Extra sidecar fields (target, label, chunk layout ...)
+        self.levels = [list(leaves)]
+        while len(self.levels[-1]) > 1:
+            level = self.levels[-1]
+            parents = [self._node(level[i], level[i + 1]) for i in range(0, len(level) - 1, 2)]
+            if len(level) % 2:
+                parents.append(level[-1])
+            self.levels.append(parents)
+
+    def _node(self, left, right):
+        h = new_hasher(self.algorithm)
+        h.update(NODE_PREFIX + left + right)
+        return h.digest()
+
+    @property
+    def leaves(self):
+        return self.levels[0]
+
+    @property
+    def root(self):
+        return self.levels[-1][0] if self.leaves else b""
+
+    def root_hex(self):
+        return self.root.hex()
+
+    def proof(self, index):
+        """Audit path for leaf `index`: [(sibling_hex, "L"|"R"), ...] from the leaf upwards."""
+        path = []
+        for level in self.levels[:-1]:
+            sibling = index ^ 1
+            if sibling < len(level):
+                path.append((level[sibling].hex(), "L" if sibling < index else "R"))
+            index //= 2
+        return path
+
+    @staticmethod
+    def verify_proof(leaf, proof, root, algorithm="sha256"):
+        """True if `leaf` (digest bytes) hashes up to `root` (bytes) along `proof`."""
+        node = leaf
+        for sibling_hex, side in proof:
+            sibling = bytes.fromhex(sibling_hex)
+            h = new_hasher(algorithm)
+            h.update(NODE_PREFIX + (sibling + node if side == "L" else node + sibling))
+            node = h.digest()
+        return node == root
+
+    # --- Sidecar persistence --------------------------------------------------------
+
+    def save(self, path, **fields):
+        """Writes the leaves (enough to rebuild every proof) next to the audit log, atomically."""
+        state = dict(fields, algorithm=self.algorithm, region_size=self.region_size,
+                     total_bytes=self.total_bytes, root=self.root_hex(),
+                     leaves=[leaf.hex() for leaf in self.leaves])
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+        tree = cls([bytes.fromhex(leaf) for leaf in state["leaves"]], state["algorithm"],
+                   state["region_size"], state["total_bytes"])
+        if tree.root_hex() != state["root"]:
+            raise ValueError(f"Merkle sidecar {path} is inconsistent with its recorded root")
+        tree.fields = {key: value for key, value in state.items()
+                       if key not in ("algorithm", "region_size", "total_bytes", "root", "leaves")}
+        return tree
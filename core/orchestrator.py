@@ -0,0 +1,155 @@
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+
+class _DriveUI:
+    """
+    Per-drive view of the shared UI: status lines and live bars get a drive tag, so every
+    drive keeps its own bar (with rate and ETA) under the orchestrator's aggregate bar.
+    """
+    def __init__(self, ui, tag):
+        self._ui = ui
+        self._tag = tag
+
+    def __getattr__(self, name):
+        return getattr(self._ui, name)
+
+    def draw_progress_bar(self, percentage, prefix=""):
+        pass  # Legacy single-line bars would fight the live block
+
+    def progress(self, label, total, unit="bytes"):
+        return self._ui.progress(f"[{self._tag}] {label.strip()}", total, unit)
+
+    def update_status(self, message, centered=False):
+        self._ui.update_status(f"[{self._tag}] {message.replace('[*]', '').strip()}", centered=centered)
+
+
+class WipeOrchestrator:
+    """
+    Runs several QSSPSanitizer instances at once.
+
+    - One bounded keystream-producer pool shared by every drive
+    - One writer thread per device (each sanitizer keeps its own producer/writer pair)
+    - A global memory budget: every chunk in flight holds a token from one shared semaphore,
+      and idle ring slots are handed back to the kernel, so the budget bounds resident memory
+    Total rack time is then set by the slowest drive, not the sum of all drives.
+    """
+    def __init__(self, sanitizers, ui, logger, producer_workers=None, memory_budget=1024 * 1024 * 1024,
+                 executor="process"):
+        self.sanitizers = sanitizers
+        self.ui = ui
+        self.logger = logger
+        self.memory_budget = memory_budget
+        self.producer_workers = producer_workers or max(1, len(sanitizers))
+        self.executor = executor
+        self.results = {}
+        self.throughput = {}
+        self._plan()  # Fail before any drive is touched if the budget can't hold the rack
+
+    def _plan(self):
+        """
+        Splits the memory budget into keystream prefetch and chunk slots: (per-drive workers, tokens).
+        Raises ValueError if it can't give every drive its prefetch and at least one slot.
+        """
+        drives = len(self.sanitizers)
+        chunk_size = max(s.chunk_size for s in self.sanitizers)
+        slots = self.memory_budget // chunk_size
+        # Each drive also prefetches 2 chunks per share of the pool; that comes out of the budget
+        # first, so a tight budget narrows the prefetch before it starves the writers
+        per_drive_workers = max(1, self.producer_workers // drives)
+        while per_drive_workers > 1 and slots - drives * per_drive_workers * 2 < drives:
+            per_drive_workers -= 1
+        tokens = slots - drives * per_drive_workers * 2
+        if tokens < drives:
+            raise ValueError(f"Memory budget of {self.memory_budget // (1024 * 1024)} MB cannot hold {drives} drives "
+                             f"at {chunk_size // (1024 * 1024)} MB chunks (needs {3 * drives * chunk_size // (1024 * 1024)} MB)")
+        return per_drive_workers, tokens
+
+    def _configure(self, pool):
+        per_drive_workers, tokens = self._plan()  # Again: calibration may have grown the chunks
+        budget = threading.BoundedSemaphore(tokens)
+
+        for s in self.sanitizers:
+            s.keystream_pool = pool
+            s.keystream_executor = self.executor
+            s.workers = per_drive_workers
+            s.memory_budget = budget
+            s.ui = _DriveUI(self.ui, f"DISK {s.target_idx}")
+        self.logger.log_event("INFO", "ORCHESTRATOR", f"Rack session: {len(self.sanitizers)} drives",
+                              detail=f"Producer workers: {self.producer_workers} | "
+                                     f"Memory budget: {self.memory_budget // (1024 * 1024)} MB ({tokens} chunk slots)")
+
+    def run(self, job, label):
+        """
+        Runs job(sanitizer) for every drive concurrently and returns {target_idx: result}.
+        Shows one aggregate bar (drives done, rack MB/s) and records per-drive / aggregate throughput.
+        """
+        pool_cls = ProcessPoolExecutor if self.executor == "process" else ThreadPoolExecutor
+        results = {}
+        start_bytes = {s.target_idx: s.bytes_moved for s in self.sanitizers}
+        started = time.time()
+        finished = {}
+
+        with pool_cls(max_workers=self.producer_workers) as pool:
+            self._configure(pool)
+
+            def worker(s):
+                try:
+                    results[s.target_idx] = job(s)
+                except Exception as e:
+                    self.logger.log_event("CRITICAL", "ORCHESTRATOR", f"Disk {s.target_idx} failed: {e}")
+                    results[s.target_idx] = False
+                finished[s.target_idx] = time.time()
+
+            threads = [threading.Thread(target=worker, args=(s,), daemon=True) for s in self.sanitizers]
+            rack = self.ui.progress(label, len(self.sanitizers), unit="drives")
+            for t in threads: t.start()
+
+            while any(t.is_alive() for t in threads):
+                time.sleep(1.0)
+                elapsed = time.time() - started
+                moved = sum(s.bytes_moved - start_bytes[s.target_idx] for s in self.sanitizers)
+                rate = moved / (1024 * 1024) / elapsed if elapsed > 0 else 0
+                rack.update(len(finished))
+                rack.detail = f"{rate:.0f} MB/s aggregate"
+            for t in threads: t.join()
+            rack.update(len(finished))
+            rack.finish()
+
+        for s in self.sanitizers:
+            s.keystream_pool = None  # The shared pool is gone; standalone calls build their own
+
+        self._report(label, start_bytes, started, finished)
+        self.results[label] = results
+        return results
+
+    def _report(self, label, start_bytes, started, finished):
+        total_moved = 0
+        for s in self.sanitizers:
+            moved = s.bytes_moved - start_bytes[s.target_idx]
+            elapsed = finished.get(s.target_idx, time.time()) - started
+            rate = moved / (1024 * 1024) / elapsed if elapsed > 0 else 0
+            self.throughput.setdefault(label, {})[s.target_idx] = rate
+            total_moved += moved
+            self.logger.log_event("INFO", "PERF_DATA", f"{label} | Disk {s.target_idx}",
+                                  detail=f"Duration: {elapsed:.2f}s | Avg Speed: {rate:.2f} MB/s")
+
+        wall = max(finished.values(), default=time.time()) - started
+        aggregate = total_moved / (1024 * 1024) / wall if wall > 0 else 0
+        self.throughput.setdefault(label, {})["AGGREGATE"] = aggregate
+        self.logger.log_event("SUCCESS", "PERF_DATA", f"{label} | Rack aggregate",
+                              detail=f"Wall time: {wall:.2f}s | Aggregate Speed: {aggregate:.2f} MB/s")
+
+    def wipe(self, seeds, region_bytes=0):
+        """
+        Pass 1 then Pass 2 on every drive; each drive moves on to Pass 2 as soon as its own
+        Pass 1 is verified. `seeds` maps target_idx -> quantum root (one unique seed per drive).
+        With region_bytes, every drive runs both passes region by region (execute_interleaved).
+        """
+        def job(s):
+            seed = seeds[s.target_idx]
+            if region_bytes:
+                return s.execute_interleaved(seed, region_bytes=region_bytes)
+            return s.execute_wipe(seed, stage=1) and s.execute_wipe(seed, stage=2)
+        return self.run(job, "RACK WIPE")
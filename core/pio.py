@@ -0,0 +1,289 @@
+import mmap
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from core.badblocks import BadBlockBudgetExceeded, bisect_io, is_media_error
+
+
+class PositionalIO:
+    """
+    Deep-queue positional I/O engine.
+    Keeps up to `queue_depth` reads/writes in flight at explicit offsets, so SSD/NVMe
+    controllers see several outstanding commands instead of one synchronous write.
+
+    POSIX: os.pwrite/os.pread on one shared descriptor (no shared file position).
+    Windows: no pwrite in the stdlib, so each I/O thread gets its own handle and
+    seeks it privately.
+
+    direct=True opens with O_DIRECT where the platform has it (page cache bypass).
+    Callers must then use sector-aligned offsets/sizes and aligned buffers
+    (core.buffers.BufferRing slots are page-aligned).
+
+    With a core.badblocks.BadBlockMap in `bad_blocks`, media errors don't fail the I/O:
+    the range is bisected down to the sectors that still fail, those are recorded
+    (unreadable ones read back as zeros) and the rest of the queue keeps going.
+    """
+    def __init__(self, path, writable=False, queue_depth=8, direct=False, bad_blocks=None):
+        self.path = path
+        self.writable = writable
+        self.queue_depth = max(1, queue_depth)
+        self.direct = direct and hasattr(os, "O_DIRECT")
+        self._flags = (os.O_RDWR if writable else os.O_RDONLY) | getattr(os, "O_BINARY", 0)
+        if self.direct:
+            self._flags |= os.O_DIRECT
+        self.fd = os.open(path, self._flags)
+
+        self._pool = ThreadPoolExecutor(max_workers=self.queue_depth)
+        self._slots = threading.BoundedSemaphore(self.queue_depth)
+        self._inflight = set()
+        self._lock = threading.Lock()
+        self._error = None
+        self._local = threading.local()
+        self._thread_fds = []
+        self.on_latency = None  # Optional callable(seconds) per completed queued I/O (telemetry)
+        self.bad_blocks = bad_blocks
+
+    # --- Raw positional primitives -------------------------------------------------
+
+    def _handle(self):
+        if hasattr(os, "pwrite"):
+            return self.fd
+        fd = getattr(self._local, "fd", None)
+        if fd is None:
+            fd = os.open(self.path, self._flags)
+            self._local.fd = fd
+            with self._lock:
+                self._thread_fds.append(fd)
+        return fd
+
+    def pwrite(self, offset, data):
+        try:
+            return self._pwrite(offset, data)
+        except OSError as e:
+            if self.bad_blocks is None or not is_media_error(e):
+                raise
+        view = memoryview(data)
+        failed = bisect_io(lambda o, n: self._pwrite(o, view[o - offset:o - offset + n]),
+                           offset, len(view), self.bad_blocks.sector_size)
+        for start, length in failed:
+            self.bad_blocks.add("unwritable", start, length)
+        return len(view)
+
+    def pread(self, offset, size):
+        try:
+            return self._pread(offset, size)
+        except OSError as e:
+            if self.bad_blocks is None or not is_media_error(e):
+                raise
+        data = bytearray(size)
+        end = [offset]  # A short read (end of device) ends the result there
+
+        def salvage(o, n):
+            chunk = self._pread(o, n)
+            data[o - offset:o - offset + len(chunk)] = chunk
+            end[0] = max(end[0], o + len(chunk))
+        failed = bisect_io(salvage, offset, size, self.bad_blocks.sector_size)
+        for start, length in failed:
+            self.bad_blocks.add("unreadable", start, length)
+            end[0] = max(end[0], start + length)
+        return bytes(data[:end[0] - offset])
+
+    def _pwrite(self, offset, data):
+        view = memoryview(data)
+        fd = self._handle()
+        written = 0
+        while written < len(view):
+            if hasattr(os, "pwrite"):
+                n = os.pwrite(fd, view[written:], offset + written)
+            else:
+                os.lseek(fd, offset + written, os.SEEK_SET)
+                n = os.write(fd, view[written:])
+            if n <= 0:
+                raise OSError(f"Short write at offset {offset + written}")
+            written += n
+        return written
+
+    def _pread(self, offset, size):
+        fd = self._handle()
+        if self.direct:
+            # O_DIRECT needs an aligned destination; os.pread allocates an unaligned one
+            scratch = mmap.mmap(-1, size)
+            try:
+                n = os.preadv(fd, [scratch], offset)
+                return scratch[:n]
+            finally:
+                scratch.close()
+        if hasattr(os, "pread"):
+            return os.pread(fd, size, offset)
+        os.lseek(fd, offset, os.SEEK_SET)
+        return os.read(fd, size)
+
+    # --- Queued submission ----------------------------------------------------------
+
+    def _submit(self, fn, *args, on_done=None):
+        if self._error is not None:
+            raise self._error
+        self._slots.acquire()  # Blocks once `queue_depth` I/Os are outstanding
+        if self.on_latency is not None:
+            fn = self._timed(fn)
+        future = self._pool.submit(fn, *args)
+        with self._lock:
+            self._inflight.add(future)
+
+        def finished(f):
+            # Record the error before the I/O stops counting as in flight, so drain() sees it
+            if f.exception() is not None and self._error is None:
+                self._error = f.exception()
+            try:
+                if on_done:
+                    on_done(f)
+            finally:
+                self._slots.release()
+                with self._lock:
+                    self._inflight.discard(f)
+        future.add_done_callback(finished)
+        return future
+
+    def _timed(self, fn):
+        def run(*args):
+            started = time.perf_counter()
+            try:
+                return fn(*args)
+            finally:
+                self.on_latency(time.perf_counter() - started)
+        return run
+
+    def submit_write(self, offset, data, on_done=None):
+        """Queues a write; `on_done(future)` runs once the data has been handed to the device."""
+        return self._submit(self.pwrite, offset, data, on_done=on_done)
+
+    def submit_read(self, offset, size, on_done=None):
+        return self._submit(self.pread, offset, size, on_done=on_done)
+
+    def read_stream(self, ranges, raise_errors=True):
+        """
+        Read-ahead over `ranges` [(offset, size), ...]: keeps the queue full and yields
+        (offset, data) in order. With raise_errors=False a failed read yields data=None
+        (BadBlockBudgetExceeded still propagates).
+        """
+        pending = deque()
+        ranges = iter(ranges)
+        exhausted = False
+        while True:
+            while not exhausted and len(pending) < self.queue_depth:
+                try:
+                    offset, size = next(ranges)
+                except StopIteration:
+                    exhausted = True
+                    break
+                pending.append((offset, self._pool.submit(self.pread, offset, size)))
+            if not pending:
+                return
+            offset, future = pending.popleft()
+            try:
+                yield offset, future.result()
+            except BadBlockBudgetExceeded:
+                raise  # The drive is failing: that ends the read, whatever the caller tolerates
+            except OSError:
+                if raise_errors:
+                    raise
+                yield offset, None
+
+    def drain(self):
+        """Waits for every queued I/O and re-raises the first failure."""
+        while True:
+            with self._lock:
+                inflight = list(self._inflight)
+            if not inflight:
+                break
+            for f in inflight:
+                f.exception()
+        if self._error is not None:
+            raise self._error
+
+    def fsync(self):
+        self.drain()
+        os.fsync(self.fd)
+
+    def close(self):
+        try:
+            self._pool.shutdown(wait=True)
+        finally:
+            for fd in [self.fd] + self._thread_fds:
+                os.close(fd)
+            self._thread_fds = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+class MappedIO(PositionalIO):
+    """
+    PositionalIO over a regular file whose reads are served from a read-only mmap.
+    pread/read_stream hand out memoryviews of the mapping: hashing, regeneration
+    compares and audits consume the page cache in place instead of a fresh bytes
+    object per chunk. Writes stay positional (pwrite), so overwriting a page never
+    faults its old contents in first. Not combinable with O_DIRECT.
+    Mapped reads bypass bad-block bisection: a failing host disk under the image
+    surfaces as SIGBUS, not OSError (use --direct-io for images on suspect media).
+    """
+    def __init__(self, path, writable=False, queue_depth=8, bad_blocks=None):
+        super().__init__(path, writable=writable, queue_depth=queue_depth, bad_blocks=bad_blocks)
+        size = os.fstat(self.fd).st_size
+        self._map = mmap.mmap(self.fd, size, access=mmap.ACCESS_READ) if size else None
+        self._view = memoryview(self._map) if self._map is not None else memoryview(b"")
+
+    def madvise(self, access):
+        """Read-ahead hint for the mapping itself (posix_fadvise doesn't reach mmap faults)."""
+        advice = {"sequential": "MADV_SEQUENTIAL", "random": "MADV_RANDOM", "dontneed": "MADV_DONTNEED"}[access]
+        if self._map is not None and hasattr(mmap, advice):
+            self._map.madvise(getattr(mmap, advice))
+
+    def pread(self, offset, size):
+        return self._view[offset:offset + size]  # Short at EOF, like os.pread
+
+    def read_stream(self, ranges, raise_errors=True):
+        """
+        Same contract as PositionalIO.read_stream, minus the thread pool: the next
+        `queue_depth` ranges are announced with MADV_WILLNEED and the kernel reads
+        them ahead while the current view is consumed.
+        """
+        pending = deque()
+        ranges = iter(ranges)
+        exhausted = False
+        while True:
+            while not exhausted and len(pending) < self.queue_depth:
+                try:
+                    offset, size = next(ranges)
+                except StopIteration:
+                    exhausted = True
+                    break
+                self._prefetch(offset, size)
+                pending.append((offset, size))
+            if not pending:
+                return
+            offset, size = pending.popleft()
+            yield offset, self.pread(offset, size)
+
+    def _prefetch(self, offset, size):
+        if self._map is None or not hasattr(mmap, "MADV_WILLNEED"):
+            return
+        start = offset - offset % mmap.PAGESIZE
+        length = min(offset + size, len(self._map)) - start
+        if length > 0:
+            self._map.madvise(mmap.MADV_WILLNEED, start, length)
+
+    def close(self):
+        self._view.release()
+        if self._map is not None:
+            try:
+                self._map.close()
+            except BufferError:
+                pass  # A caller still holds a view; the mapping goes when that view does
+        super().close()
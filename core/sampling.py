@@ -0,0 +1,76 @@
+import math
+import random
+
+
+class SamplingPlanner:
+    """
+    Seek-ordered stratified sampling for sector verification.
+    The LBA space is cut into `sample_count` equal zones with one block drawn per zone,
+    so no region is sampled twice and none is skipped. Offsets come back sorted, so a
+    spinning disk sweeps once (elevator order) instead of full-stroking between reads.
+    """
+    def __init__(self, total_bytes, block_size=4096, sector_size=512, rng=None):
+        self.total_bytes = total_bytes
+        self.block_size = block_size
+        self.sector_size = sector_size
+        self.rng = rng or random.SystemRandom()
+
+    def plan(self, sample_count):
+        """Sorted, sector-aligned offsets; one per zone."""
+        span = self.total_bytes - self.block_size
+        if span < 0 or sample_count <= 0:
+            return []
+        positions = span // self.sector_size + 1  # Aligned start sectors where a block still fits
+        sample_count = min(sample_count, positions)
+        bounds = [i * positions // sample_count for i in range(sample_count + 1)]
+        return [self.rng.randint(bounds[i], bounds[i + 1] - 1) * self.sector_size
+                for i in range(sample_count)]
+
+    def zone_bytes(self, sample_count):
+        return self.total_bytes / max(sample_count, 1)
+
+    @staticmethod
+    def _binomial_cdf(failures, samples, p):
+        """P(X <= failures) for X ~ Binomial(samples, p)."""
+        if p <= 0:
+            return 1.0
+        if p >= 1:
+            return 1.0 if failures >= samples else 0.0
+        log_p, log_q = math.log(p), math.log1p(-p)
+        return min(1.0, sum(math.exp(math.lgamma(samples + 1) - math.lgamma(i + 1) - math.lgamma(samples - i + 1)
+                                     + i * log_p + (samples - i) * log_q) for i in range(failures + 1)))
+
+    def confidence_bound(self, samples, confidence=0.95, failures=0):
+        """
+        Upper bound on the unwritten fraction of the surface at `confidence`, given that
+        `failures` of `samples` stratified blocks came back as not overwritten (one-sided
+        Clopper-Pearson). Stratification can only beat independent sampling, so the
+        binomial bound is safe; with no failures it is 1 - (1 - confidence)^(1/n).
+        """
+        if samples <= 0 or failures >= samples:
+            return 1.0
+        if failures == 0:
+            return 1 - (1 - confidence) ** (1 / samples)
+        low, high = failures / samples, 1.0
+        for _ in range(60):
+            mid = (low + high) / 2
+            if self._binomial_cdf(failures, samples, mid) > 1 - confidence:
+                low = mid
+            else:
+                high = mid
+        return high
+
+    def coverage_report(self, samples, failures=0, confidence=0.95):
+        """Certificate-ready description of what the sample run actually proves."""
+        zone = self.zone_bytes(samples)
+        return {
+            "samples": samples,
+            "failed_blocks": failures,
+            "zone_bytes": int(zone),
+            "bytes_sampled": samples * self.block_size,
+            "confidence": confidence,
+            "max_unwritten_fraction": self.confidence_bound(samples, confidence, failures),
+            # A contiguous unwritten run covering two zones (+ one block) must contain a whole sample,
+            # which only rules such a run out while every sample came back clean
+            "guaranteed_gap_bytes": int(2 * zone) + self.block_size if failures == 0 else None,
+        }
@@ -1,13 +1,106 @@
-import hashlib
 import time
 import threading
 import queue
-import subprocess
 import os
+import re
 from core.ingestor import QuantumIngestor
-from core.engine import CSEE
-from core.watchdog import EntropyWatchdog  # ALIGNMENT: Actually use the safety layer
-import random
+from core.engine import CSEE, AESCTRStream, open_pass_stream
+from core.device import open_device
+from core.buffers import BufferRing
+from core.autotune import BlockTuner
+from core.stattests import StatBattery
+from core.sampling import SamplingPlanner
+from core.merkle import MerkleTree, LEAF_PREFIX, new_hasher
+from core.badblocks import BadBlockMap
+from core.scope import ChunkMap, WipeScope, allocated_extents, complement
+from core.telemetry import PipelineTelemetry, write_prometheus
+from core.watchdog import EntropyWatchdog, WatchdogMonitor  # ALIGNMENT: Actually use the safety layer
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, as_completed, wait
+
+SECTOR_SIZE = 512  # LBA granularity used when reporting on-disk locations
+FUSED_CHAIN_LOST = "LOST (FUSED SWEEP INTERRUPTED)"  # Journaled before a fused sweep's first write
+
+
+def _verify_range(device, seed, stage, chunk_size, nonce_mode, start_chunk, end_chunk, direct=False, extents=None,
+                  bad_blocks=None):
+    """
+    Reads chunks [start_chunk, end_chunk) of the scope's chunk table (`extents`; None = whole
+    grid) back through `device` (the sanitizer's BlockDevice backend) and compares them
+    byte-for-byte against the regenerated keystream. Module level so it can run in a worker process.
+    Sectors in the bad-block map (`bad_blocks`, a BadBlockMap.to_dict(); new read failures
+    are added and returned) are excluded from the comparison instead of failing it.
+    """
+    import numpy as np
+
+    stream = open_pass_stream(seed, stage, chunk_size, nonce_mode=nonce_mode)
+    buf = bytearray(chunk_size)
+    known = BadBlockMap((bad_blocks or {}).get("sector_size", SECTOR_SIZE), max_sectors=float("inf"))
+    known.merge(bad_blocks)
+    result = {"chunks": 0, "mismatched_chunks": 0, "mismatched_bytes": 0, "first_mismatch": None,
+              "excluded_bytes": 0}
+
+    if extents is None:
+        ranges = [(index * chunk_size, chunk_size) for index in range(start_chunk, end_chunk)]
+    else:
+        ranges = list(ChunkMap(extents, chunk_size).ranges(start_chunk, end_chunk))
+    with device.open(queue_depth=2, direct=direct, bad_blocks=known) as drive:
+        for (offset, length), (_, data) in zip(ranges, drive.read_stream(ranges, raise_errors=False)):
+            data = data or b""
+            expected = memoryview(buf)[:length]
+            stream.fill_at(offset, expected)
+            result["chunks"] += 1
+            if data == expected:
+                continue
+
+            # Locate the damage: unreadable/short reads count as fully mismatched
+            got = np.frombuffer(bytes(data).ljust(length, b"\x00"), dtype=np.uint8)
+            diff = np.flatnonzero(got != np.frombuffer(expected, dtype=np.uint8))
+            if len(data) < length:
+                diff = np.union1d(diff, np.arange(len(data), length))
+            for start, end in known.overlapping(offset, length):
+                excluded = (diff >= start) & (diff < end)
+                result["excluded_bytes"] += int(excluded.sum())
+                diff = diff[~excluded]
+            if len(diff) == 0:
+                continue
+            result["mismatched_chunks"] += 1
+            result["mismatched_bytes"] += int(len(diff))
+            if result["first_mismatch"] is None:
+                first_lba = (offset + int(diff[0])) // SECTOR_SIZE
+                last_lba = (offset + int(diff[-1])) // SECTOR_SIZE
+                result["first_mismatch"] = (first_lba, last_lba)
+    result["bad_blocks"] = known.to_dict()
+    return result
+
+
+class _SweepDigest:
+    """
+    Pre-wipe surface digest fed chunk by chunk in LBA order (fused sweep). Produces what
+    calculate_physical_hash would have: one running digest, or Merkle leaves per region.
+    """
+    def __init__(self, algorithm, bounds=None):
+        self.algorithm = algorithm
+        self.bounds = bounds  # Scope byte where each Merkle region ends; None = linear
+        self.leaves = []
+        self.offset = 0
+        self._hasher = self._new_leaf() if bounds else new_hasher(algorithm)
+
+    def _new_leaf(self):
+        hasher = new_hasher(self.algorithm)
+        hasher.update(LEAF_PREFIX)
+        return hasher
+
+    def update(self, chunk):
+        self._hasher.update(chunk)
+        self.offset += len(chunk)
+        # Regions are whole chunk-table pieces, so a chunk never straddles a leaf boundary
+        if self.bounds and self.offset >= self.bounds[len(self.leaves)]:
+            self.leaves.append(self._hasher.digest())
+            self._hasher = self._new_leaf()
+
+    def hexdigest(self):
+        return self._hasher.hexdigest()
+
 
 class QSSPSanitizer:
     def __init__(self, target_idx, ui_handler, logger):
@@ -15,140 +108,516 @@ class QSSPSanitizer:
         self.ui = ui_handler
         self.logger = logger
         self.chunk_size = 1024 * 1024  # 1MB aligned
-        self.path = f"\\\\.\\PhysicalDrive{target_idx}"
+        # Disk index on Windows, block device or image path elsewhere
+        self.device = open_device(target_idx)
+        self.path = self.device.path
         self.watchdog = EntropyWatchdog() # ALIGNMENT: Init Watchdog
         
+        # Keystream generation fan-out (SHAKE squeezing is the CPU bottleneck on NVMe)
+        self.workers = os.cpu_count() or 1
+        self.keystream_executor = "process"
+        self.pass2_nonce_mode = "stream"  # "per_chunk" reproduces the legacy encrypt_chunk output
+        
+        # Post-pass verification: "hash" = full-surface SHA-256, "regen" = byte-exact keystream compare
+        self.verify_mode = "hash"
+        self.verify_range_chunks = 64  # Work unit per verify job (64 MB at 1 MB chunks)
+        self.verify_reports = {}
+        # Surface hashing: "linear" = one running digest, "merkle" = per-region leaves hashed in parallel
+        self.hash_mode = "linear"
+        self.hash_algorithm = "sha256"     # or "blake2b"
+        self.merkle_region = 16 * 1024 * 1024
+        self.hash_workers = os.cpu_count() or 1
+        self.merkle_trees = {}             # label -> (MerkleTree, sidecar path)
+        # Fused sweep: Pass 1 reads and hashes each chunk into the pre-wipe chain just before overwriting it
+        self.fused_sweep = False
+        # core.scope.WipeScope: partition / LBA ranges / allocated extents (None = whole device, tail included)
+        self.scope = None
+        self.entropy_reports = {}  # Rolling watchdog statistics per pass
+        # Sectors the drive refused (bisected down from failed chunks); goes into the certificate
+        self.bad_blocks = BadBlockMap(self.device.sector_size())
+        
+        # Optional crash-safe progress journal (core.journal.WipeJournal)
+        self.journal = None
+        
+        # Shared resources injected by core.orchestrator.WipeOrchestrator (None = standalone)
+        self.keystream_pool = None   # Executor shared by every drive in the rack
+        self.memory_budget = None    # Semaphore: one token per chunk held in memory
+        self.bytes_written = 0       # Live counters sampled for throughput reporting
+        self.bytes_read = 0
+        
+        # Outstanding positional I/Os per device (1 = the old synchronous behaviour)
+        self.queue_depth = 8
+        # Preallocated chunk buffers circulating producer -> writer (fixed RSS per drive)
+        self.ring_buffers = 16
+        # Unbuffered, sector-aligned I/O (O_DIRECT) so bulk passes don't thrash the page cache
+        self.direct_io = False
+        # Per-phase pipeline instrumentation (JSONL in the audit dir + Prometheus textfile)
+        self.telemetry = {}
+        self.metrics_dir = None        # node_exporter textfile directory (default: audit dir)
+        self.telemetry_interval = 10.0 # Seconds between live exports during a phase
+        self._telemetry_exported = 0.0
+        # Spinning media: sample reads go one at a time in elevator order (None = unknown -> SSD)
+        self.rotational = self.device.rotational()
+        
         # Forensic State
         self.pre_wipe_hash = "NOT_STARTED"
         self.pass1_hash = "NOT_STARTED"
         self.final_hash = "NOT_STARTED"
         self.quantum_root = "NONE"
 
+    @property
+    def bytes_moved(self):
+        return self.bytes_written + self.bytes_read
+
     def get_drive_size(self):
-        import ctypes
-        kernel32 = ctypes.windll.kernel32
-        # OPEN_EXISTING = 3, FILE_SHARE_READ = 1, FILE_SHARE_WRITE = 2
-        handle = kernel32.CreateFileW(self.path, 0x80000000 | 0x40000000, 0x1 | 0x2, None, 3, 0, None)
-        
-        if handle == -1:
-            # If standard handle fails, the drive is locked.
-            return 0
-        
-        # IOCTL_DISK_GET_LENGTH_INFO = 0x0007405C
-        output = ctypes.c_longlong()
-        returned = ctypes.c_ulong()
-        res = kernel32.DeviceIoControl(handle, 0x0007405C, None, 0, ctypes.byref(output), 8, ctypes.byref(returned), None)
-        kernel32.CloseHandle(handle)
-        
-        return output.value if res else 0
+        return self.device.size()
+
+    def _chunk_map(self):
+        """Chunk table every pass, hash and verify walks (same pieces, same order)."""
+        if self.scope is not None:
+            return self.scope.chunks(self.chunk_size)
+        total_bytes = self.get_drive_size()
+        return ChunkMap([(0, total_bytes)] if total_bytes else [], self.chunk_size)
 
     def seize_and_clean(self):
         """
         ALIGNMENT: 'Low-Level Hardware Seizure' [Whitepaper Section 4.1]
-        Uses Diskpart to offline the volume and strip the MBR/GPT.
+        Backend specific: diskpart clean on Windows, mount check + sync on Linux.
+        A partial scope only claims what it overlaps (the partition table survives).
+        """
+        return self.device.seize(self.logger, scope=self.scope)
+
+    def calibrate(self):
         """
-        commands = f"select disk {self.target_idx}\nclean\nrescan"
-        script_file = "seize.txt"
-        with open(script_file, "w") as f: f.write(commands)
+        Benchmarks block sizes (64 KB - 16 MB) and queue depths against this target and
+        adopts the fastest. Destructive for the first few MB: run after seizure, before Pass 1.
+        """
+        total_bytes = self.get_drive_size()
+        if total_bytes == 0: return False
+        
+        tuner = BlockTuner(self.path, direct=self.direct_io)
+        best = tuner.calibrate(total_bytes)
+        if not best: return False
         
+        self.chunk_size, self.queue_depth = best
+        table = " | ".join(f"{b // 1024}K@QD{d}: {r:.0f} MB/s" for b, d, r in tuner.results)
+        self.logger.log_event("INFO", "AUTOTUNE", f"Selected {self.chunk_size // 1024} KB blocks @ QD{self.queue_depth}",
+                             detail=table)
+        return True
+
+    def _telemetry(self, phase):
+        tel = PipelineTelemetry(phase, self.device.name)
+        self.telemetry[phase] = tel
+        self._telemetry_exported = time.time()
+        return tel
+
+    def _export_telemetry(self, tel, final=False):
+        """
+        Appends a snapshot to the session's metrics JSONL and rewrites this drive's
+        Prometheus textfile; the final export of a phase is also summarized in the audit log.
+        """
+        if not final and time.time() - self._telemetry_exported < self.telemetry_interval:
+            return
+        self._telemetry_exported = time.time()
         try:
-            # We assume the UI or Main has already elevated privileges
-            subprocess.run(["diskpart", "/s", script_file], capture_output=True, check=True)
-            time.sleep(2) # Let Windows catch up
-            os.remove(script_file)
-            return True
-        except Exception as e:
-            self.logger.log_event("ERROR", "SEIZE", f"Diskpart failed: {e}")
-            if os.path.exists(script_file): os.remove(script_file)
-            return False
+            tel.write_jsonl(os.path.join(self.logger.log_dir, f"QSSP_METRICS_{self.logger.session_id}.jsonl"))
+            write_prometheus(os.path.join(self.metrics_dir or self.logger.log_dir, f"qssp_disk{self.device.name}.prom"),
+                             list(self.telemetry.values()))
+        except OSError as e:
+            self.logger.log_event("WARN", "TELEMETRY", f"Metrics export failed: {e}")
+        if final:
+            self.logger.log_event("INFO", "TELEMETRY", f"{tel.phase}: bottleneck {tel.bottleneck()}",
+                                 detail=tel.summary())
+
+    def discard_surface(self, range_bytes=1024 * 1024 * 1024):
+        """
+        Optional pre-pass: unmaps the whole surface at device level (BLKDISCARD, falling back
+        to BLKZEROOUT; hole punching on image files). Flash drops its stale mappings in
+        seconds, so the keystream passes write into a clean FTL. Returns a report dict,
+        or None when the backend has no discard mechanism.
+        """
+        extents = self._chunk_map().extents
+        total_bytes = sum(length for _, length in extents)
+        if total_bytes == 0: return None
+
+        started = time.time()
+        methods = set()
+        bar = self.ui.progress("DISCARD PRE-PASS", total_bytes)
+        try:
+            with self.device.open(writable=True, queue_depth=1) as drive:
+                for start, length in extents:
+                    for offset in range(start, start + length, range_bytes):
+                        span = min(range_bytes, start + length - offset)
+                        method = self.device.discard(drive.fd, offset, span)
+                        if method is None:
+                            self.logger.log_event("WARN", "DISCARD", f"{self.path}: no discard/zero-out support, skipped")
+                            return None
+                        methods.add(method)
+                        bar.advance(span)
+        except OSError as e:
+            self.logger.log_event("ERROR", "DISCARD", f"Discard pre-pass failed: {e}")
+            return None
+        finally:
+            bar.finish()
+
+        elapsed = time.time() - started
+        report = {"method": "+".join(sorted(methods)), "bytes": total_bytes, "seconds": elapsed}
+        self.logger.log_event("SUCCESS", "DISCARD", f"{report['method']}: {total_bytes / (1024 ** 3):.2f} GB released",
+                             detail=f"Duration: {elapsed:.2f}s | Ranges: {range_bytes // (1024 * 1024)} MB")
+        return report
+
+    def prepare_holes(self, mode):
+        """
+        Sparse images: settles the holes before Pass 1 instead of streaming keystream into them.
+        'punch' re-punches every hole (preallocated but never-written extents give their blocks
+        back) and leaves the passes to the data extents; 'allocate' backs the holes with real
+        blocks so the whole file gets overwritten. Returns a report dict like discard_surface().
+        """
+        size = self.get_drive_size()
+        try:
+            holes = complement(allocated_extents(self.path, size, self.device.sector_size()), size)
+        except (ValueError, OSError) as e:
+            self.logger.log_event("WARN", "HOLES", f"{self.path}: no allocation map ({e}), holes left as they are")
+            return None
+        total_bytes = sum(length for _, length in holes)
+        if total_bytes == 0: return None
+
+        started = time.time()
+        methods = set()
+        try:
+            with self.device.open(writable=True, queue_depth=1) as drive:
+                for offset, length in holes:
+                    if mode == "punch":
+                        method = self.device.discard(drive.fd, offset, length)
+                    else:
+                        method = self.device.allocate(drive.fd, offset, length)
+                    if method is None:
+                        self.logger.log_event("WARN", "HOLES", f"{self.path}: cannot {mode} holes here, left as they are")
+                        return None
+                    methods.add(method)
+                drive.fsync()
+        except OSError as e:
+            self.logger.log_event("ERROR", "HOLES", f"Hole {mode} failed: {e}")
+            return None
+
+        elapsed = time.time() - started
+        report = {"method": "+".join(sorted(methods)), "bytes": total_bytes, "holes": len(holes), "seconds": elapsed}
+        self.logger.log_event("SUCCESS", "HOLES", f"{report['method']}: {len(holes)} holes, "
+                                                  f"{total_bytes / (1024 ** 3):.2f} GB",
+                             detail=f"Duration: {elapsed:.2f}s | Mode: {mode}")
+        return report
+
+    def pass_stream(self, stage, seed=None):
+        """
+        Seekable view of the keystream pass `stage` lays down on this device:
+        pass_stream(stage).read_at(offset, length) == bytes on disk after that pass.
+        """
+        seed = seed if seed is not None else self.quantum_root
+        return open_pass_stream(seed, stage, self.chunk_size, nonce_mode=self.pass2_nonce_mode)
 
     def calculate_physical_hash(self, label):
         """
         ALIGNMENT: 'Provable Irrecoverability' [Whitepaper Section 5.1]
         Reads the entire physical surface, not just a snippet.
         """
-        hasher = hashlib.sha256()
-        total_bytes = self.get_drive_size()
-        if total_bytes == 0: return "ERROR_SIZE_0"
-        
-        total_chunks = total_bytes // self.chunk_size
+        cmap = self._chunk_map()
+        if cmap.total_bytes == 0: return "ERROR_SIZE_0"
+        if self.hash_mode == "merkle":
+            return self.calculate_merkle_root(label, cmap)
+
+        hasher = new_hasher(self.hash_algorithm)
+        tel = self._telemetry(label)
+        bar = self.ui.progress(label, cmap.total_bytes)
         
         try:
-            with open(self.path, "rb", buffering=0) as drive:
-                for i in range(1, total_chunks + 1):
-                    chunk = drive.read(self.chunk_size)
+            ranges = cmap.ranges()
+            with self.device.open(queue_depth=self.queue_depth, direct=self.direct_io, bad_blocks=self.bad_blocks) as drive:
+                # Read-ahead keeps `queue_depth` reads in flight; hashing stays in LBA order
+                waited = time.perf_counter()
+                for i, (_, chunk) in enumerate(drive.read_stream(ranges), start=1):
+                    hashing = time.perf_counter()
+                    tel.observe("read_wait_seconds", hashing - waited)
                     if not chunk: break
                     hasher.update(chunk)
+                    self.bytes_read += len(chunk)
+                    tel.add("bytes_hashed", len(chunk))
+                    bar.advance(len(chunk))
                     
-                    if i % 50 == 0 or i == total_chunks:
-                        percent = (i / total_chunks) * 100
-                        self.ui.draw_progress_bar(int(percent), f" {label}")
+                    if i % 50 == 0:
+                        self._export_telemetry(tel)
+                    waited = time.perf_counter()
+                    tel.observe("hash_update_seconds", waited - hashing)
             return hasher.hexdigest()
         except Exception as e:
             self.logger.log_event("ERROR", "HASH_FAIL", str(e))
             return "HASH_ERROR"
+        finally:
+            bar.finish()
+            self._export_telemetry(tel.finish(), final=True)
 
-    def execute_wipe(self, seed, stage=1):
-        # --- PHASE 1: PRE-WIPE AUDIT (Only needed once, handled by Main usually, but good to have safety) ---
-        if stage == 1 and self.pre_wipe_hash == "NOT_STARTED":
-            # Just in case main didn't call it, we capture it here.
-            pass 
+    def _hash_region(self, drive, pieces, algorithm):
+        hasher = new_hasher(algorithm)
+        hasher.update(LEAF_PREFIX)
+        for start, length in pieces:
+            for offset in range(start, start + length, self.chunk_size):
+                chunk = drive.pread(offset, min(self.chunk_size, start + length - offset))
+                if not chunk:
+                    raise OSError(f"Short read at LBA {offset // SECTOR_SIZE}")
+                hasher.update(chunk)  # hashlib drops the GIL on big buffers: regions hash in parallel
+        return hasher.digest()
+
+    def _merkle_regions(self, cmap):
+        """Leaf regions as chunk-table index ranges (same surface as linear mode), plus the nominal size."""
+        per_region = max(1, self.merkle_region // self.chunk_size)
+        regions = [(first, min(first + per_region, len(cmap))) for first in range(0, len(cmap), per_region)]
+        return regions, per_region * self.chunk_size
+
+    def calculate_merkle_root(self, label, cmap):
+        """
+        ALIGNMENT: 'Provable Irrecoverability' [Whitepaper Section 5.1]
+        Same full-surface read, but as independent regions hashed on `hash_workers` threads.
+        The root goes into the certificate; the leaves go to a sidecar file in the audit
+        directory so single regions can be re-proven later without rereading the drive.
+        """
+        regions, region_size = self._merkle_regions(cmap)
+        leaves = [None] * len(regions)
+        tel = self._telemetry(label)
+        bar = self.ui.progress(label, cmap.total_bytes)
+        try:
+            with self.device.open(direct=self.direct_io, bad_blocks=self.bad_blocks) as drive, \
+                 ThreadPoolExecutor(max_workers=self.hash_workers) as pool:
+                futures = {pool.submit(self._hash_region, drive, list(cmap.ranges(first, last)), self.hash_algorithm): i
+                           for i, (first, last) in enumerate(regions)}
+                for done, future in enumerate(as_completed(futures), start=1):
+                    i = futures[future]
+                    leaves[i] = future.result()
+                    size = cmap.logical(regions[i][1]) - cmap.logical(regions[i][0])
+                    self.bytes_read += size
+                    tel.add("bytes_hashed", size)
+                    bar.advance(size)
+                    if done % 8 == 0:
+                        self._export_telemetry(tel)
+        except Exception as e:
+            self.logger.log_event("ERROR", "HASH_FAIL", str(e))
+            return "HASH_ERROR"
+        finally:
+            bar.finish()
+            self._export_telemetry(tel.finish(), final=True)
+
+        return self._publish_merkle(label, leaves, region_size, cmap)
+
+    def _publish_merkle(self, label, leaves, region_size, cmap):
+        """Builds the tree, writes the leaf sidecar and returns the root for the certificate."""
+        tree = MerkleTree(leaves, self.hash_algorithm, region_size, cmap.total_bytes)
+        slug = re.sub(r"[^A-Z0-9]+", "_", label.upper()).strip("_")
+        sidecar = os.path.join(self.logger.log_dir,
+                               f"QSSP_MERKLE_{self.logger.session_id}_DISK{self.device.name}_{slug}.json")
+        try:
+            tree.save(sidecar, target=self.path, label=label, chunk_size=self.chunk_size,
+                      scope=self.scope.to_dict() if self.scope else None)
+        except OSError as e:
+            self.logger.log_event("WARN", "MERKLE", f"Sidecar not written: {e}")
+        self.merkle_trees[label] = (tree, sidecar)
+        self.logger.log_event("INFO", "MERKLE", f"{label}: {len(leaves)} regions, root {tree.root_hex()}",
+                             detail=f"Algorithm: {self.hash_algorithm} | Region: {region_size // (1024 * 1024)} MB | "
+                                    f"Sidecar: {sidecar}")
+        return tree.root_hex()
+
+    def verify_merkle_region(self, sidecar, index):
+        """
+        Re-reads one region and proves it against the root recorded in `sidecar`.
+        Returns (ok, proof) - the proof is what an auditor needs alongside the certificate.
+        """
+        tree = MerkleTree.load(sidecar)
+        chunk_size = tree.fields.get("chunk_size") or tree.region_size
+        scope = tree.fields.get("scope")
+        extents = WipeScope.from_dict(scope).extents if scope else [(0, tree.total_bytes)]
+        cmap = ChunkMap(extents, chunk_size)
+        per_region = tree.region_size // chunk_size
+        first, last = index * per_region, min((index + 1) * per_region, len(cmap))
+        if not 0 <= first < last:
+            raise IndexError(f"Region {index} is outside the hashed surface")
+        with self.device.open(direct=self.direct_io, access="random", bad_blocks=self.bad_blocks) as drive:
+            leaf = self._hash_region(drive, list(cmap.ranges(first, last)), tree.algorithm)
+        proof = tree.proof(index)
+        return MerkleTree.verify_proof(leaf, proof, tree.root, tree.algorithm), proof
+
+    def verify_by_regeneration(self, stage, label, seed=None):
+        """
+        ALIGNMENT: 'Provable Irrecoverability' [Whitepaper Section 5.1]
+        Compares every chunk on the surface against the regenerated CSEE keystream
+        for `stage`. The surface is split into contiguous ranges verified in parallel,
+        at most `workers` at a time: in a rack the pool is shared with every drive's producer.
+        Returns a report with mismatch counts and the first mismatching LBA range.
+        """
+        seed = seed if seed is not None else self.quantum_root
+        cmap = self._chunk_map()
+        total_chunks = len(cmap)
+        report = {"mode": "regen", "stage": stage, "chunks": 0, "mismatched_chunks": 0,
+                  "mismatched_bytes": 0, "first_mismatch": None, "excluded_bytes": 0}
+        if total_chunks == 0:
+            report["error"] = "ERROR_SIZE_0"
+            return report
+
+        step = self.verify_range_chunks
+        ranges = [(start, min(start + step, total_chunks)) for start in range(0, total_chunks, step)]
+        pool_cls = ProcessPoolExecutor if self.keystream_executor == "process" else ThreadPoolExecutor
+        owned_pool = pool_cls(max_workers=self.workers) if self.keystream_pool is None else None
+        pool = self.keystream_pool or owned_pool
+        tel = self._telemetry(label)
+        bar = self.ui.progress(label, cmap.total_bytes)
+
+        try:
+            pending = iter(ranges)
+            futures = {}
+            while True:
+                # Bounded window: queued verify jobs would otherwise hold the shared pool for minutes
+                for start, end in pending:
+                    futures[pool.submit(_verify_range, self.device, seed, stage, self.chunk_size, self.pass2_nonce_mode,
+                                        start, end, self.direct_io, cmap.extents, self.bad_blocks.to_dict())] = (start, end)
+                    if len(futures) >= max(1, self.workers):
+                        break
+                if not futures:
+                    break
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    start, end = futures.pop(future)
+                    self._merge_verification(report, future.result())
+                    tel.add("bytes_verified", cmap.logical(end) - cmap.logical(start))
+                    bar.advance(cmap.logical(end) - cmap.logical(start))
+                self._export_telemetry(tel)
+        except Exception as e:
+            self.logger.log_event("ERROR", "VERIFY_FAIL", str(e))
+            report["error"] = str(e)
+        finally:
+            bar.finish()
+            if owned_pool:
+                owned_pool.shutdown()
+            self._export_telemetry(tel.finish(), final=True)
+        return report
+
+    def _merge_verification(self, report, part):
+        """Folds one _verify_range result into a regeneration report (and its bad sectors into the map)."""
+        self.bad_blocks.merge(part.pop("bad_blocks", None))
+        report["excluded_bytes"] += part["excluded_bytes"]
+        report["chunks"] += part["chunks"]
+        report["mismatched_chunks"] += part["mismatched_chunks"]
+        report["mismatched_bytes"] += part["mismatched_bytes"]
+        first = part["first_mismatch"]
+        if first and (report["first_mismatch"] is None or first < report["first_mismatch"]):
+            report["first_mismatch"] = first
 
+    @staticmethod
+    def summarize_verification(report):
+        """One-line certificate entry for a regeneration report."""
+        if report.get("error"):
+            return f"REGEN_ERROR ({report['error']})"
+        if report["mismatched_chunks"] == 0:
+            excluded = report.get("excluded_bytes", 0)
+            skipped = f", {excluded} bytes in bad sectors excluded" if excluded else ""
+            return f"REGEN-MATCH ({report['chunks']}/{report['chunks']} chunks byte-exact{skipped})"
+        first, last = report["first_mismatch"]
+        return (f"REGEN-MISMATCH ({report['mismatched_chunks']} chunks / {report['mismatched_bytes']} bytes, "
+                f"first at LBA {first}-{last})")
+
+    def _sweep_digest(self, cmap):
+        """Streaming counterpart of calculate_physical_hash for `cmap` (linear or Merkle leaves)."""
+        if self.hash_mode != "merkle":
+            return _SweepDigest(self.hash_algorithm)
+        regions, _ = self._merkle_regions(cmap)
+        return _SweepDigest(self.hash_algorithm, [cmap.logical(last) for _, last in regions])
+
+    def _sweep_result(self, label, digest, cmap):
+        if digest.bounds is None:
+            return digest.hexdigest()
+        return self._publish_merkle(label, digest.leaves, self._merkle_regions(cmap)[1], cmap)
+
+    def execute_wipe(self, seed, stage=1, start_chunk=0):
         self.quantum_root = seed
-        total_bytes = self.get_drive_size()
-        total_chunks = total_bytes // self.chunk_size
-        chunk_queue = queue.Queue(maxsize=16) 
-        
-        engine = CSEE(seed)
-        
-        def producer():
-            stream = engine.get_stream(self.chunk_size)
-            for _ in range(total_chunks):
-                chunk = next(stream)
-                if stage == 2:
-                    chunk = engine.encrypt_chunk(chunk)
-                chunk_queue.put(chunk)
-            chunk_queue.put(None)
+        cmap = self._chunk_map()
+        total_chunks = len(cmap)
 
-        threading.Thread(target=producer, daemon=True).start()
+        # --- PHASE 1: PRE-WIPE AUDIT (Only needed once, handled by Main usually, but good to have safety) ---
+        digest = None
+        if stage == 1 and self.pre_wipe_hash == "NOT_STARTED":
+            if start_chunk == 0 and self.fused_sweep:
+                # ALIGNMENT: 'Provable Irrecoverability' [Whitepaper Section 5.1]
+                # Same surface, same digest as calculate_physical_hash - read in the write sweep itself
+                digest = self._sweep_digest(cmap)
+            elif start_chunk:
+                # A fused sweep was interrupted: the chunks already overwritten can't be hashed any more
+                self.pre_wipe_hash = FUSED_CHAIN_LOST
+                self.logger.log_event("WARN", "FORENSIC", "Pre-wipe chain lost: fused sweep resumed at chunk "
+                                      f"{start_chunk}, the original contents before it are already overwritten")
 
+        start_chunk = min(start_chunk, total_chunks)
         label = "PASS 1: QUANTUM FILL" if stage == 1 else "PASS 2: AES-CTR WIPE"
+        tel = self._telemetry(label)
         start_time = time.time()
         
         self.logger.log_event("INFO", "WIPE_ENGINE", f"Initiating {label}", 
-                             detail=f"Target: {self.path} | Mode: Direct-IO Stream")
+                             detail=f"Target: {self.path} | Scope: {self.scope or 'WHOLE DEVICE'} | Start chunk: {start_chunk}")
+        if self.journal:
+            # A fused sweep overwrites what it hashes: from its first write on, a crash loses the chain,
+            # so the journal says so up front and a resume (with or without --fused) never re-hashes
+            self.journal.checkpoint(stage=stage, phase="WRITE", committed_chunk=start_chunk,
+                                    chunk_size=self.chunk_size, total_chunks=total_chunks,
+                                    scope=self.scope.to_dict() if self.scope else None,
+                                    pre_wipe_hash=FUSED_CHAIN_LOST if digest else self.pre_wipe_hash,
+                                    pass1_hash=self.pass1_hash, fused_sweep=self.fused_sweep)
+        bar = self.ui.progress("PASS 1: HASH + QUANTUM FILL" if digest else label, cmap.total_bytes)
+        bar.update(cmap.logical(start_chunk))
         
         try:
-            with open(self.path, "rb+", buffering=0) as drive:
-                for i in range(1, total_chunks + 1):
-                    chunk = chunk_queue.get()
-                    if chunk is None: break
-                    
-                    # ALIGNMENT: 'Entropy Density Verification' [Whitepaper Section 4.2]
-                    # We spot-check every 100th chunk to ensure the engine isn't failing
-                    if i % 100 == 0:
-                        if not self.watchdog.validate_chunk(chunk):
-                            self.logger.log_event("WARN", "ENTROPY_DROP", f"Chunk {i} entropy low")
-
-                    drive.write(chunk)
-                    
-                    if i % 25 == 0 or i == total_chunks:
-                        percent = (i / total_chunks) * 100
-                        elapsed = time.time() - start_time
-                        avg_speed = (i * self.chunk_size) / (1024*1024) / elapsed if elapsed > 0 else 0
-                        self.ui.draw_progress_bar(int(percent), f"{label} | {avg_speed:.1f} MB/s")
+            with self.device.open(writable=True, queue_depth=self.queue_depth,
+                                  direct=self.direct_io, bad_blocks=self.bad_blocks) as drive:
+                drive.on_latency = lambda seconds: tel.observe("write_latency_seconds", seconds)
+                entropy = self._write_segments(seed, cmap, [(stage, start_chunk, total_chunks)], drive, tel, bar,
+                                               originals=digest, checkpoint=True)[stage]
+                
+                drive.fsync()  # Every queued write has landed (and surfaced any error)
+                if digest:
+                    self.pre_wipe_hash = self._sweep_result("CAPTURING PRE-WIPE STATE", digest, cmap)
+                    self.logger.log_event("INFO", "FORENSIC", f"Initial state hash (fused sweep): {self.pre_wipe_hash}")
+                if self.journal:
+                    self.journal.checkpoint(phase="VERIFY", committed_chunk=total_chunks,
+                                            pre_wipe_hash=self.pre_wipe_hash, bad_blocks=self.bad_blocks.to_dict())
+            bar.finish()
+            self._export_telemetry(tel.finish(), final=True)
 
             # --- PHASE 5: POST-WRITE VERIFICATION ---
             total_time = time.time() - start_time
+            avg_speed = (bar.done - cmap.logical(start_chunk)) / (1024*1024) / total_time if total_time > 0 else 0
+            self.entropy_reports[stage] = entropy
+            self._log_entropy(label, entropy)
             
             self.logger.log_event("SUCCESS", "PERF_DATA", f"{label} Write Phase Complete", 
                                  detail=f"Duration: {total_time:.2f}s | Avg Speed: {avg_speed:.2f} MB/s")
+            self._log_bad_blocks(label)
             self.ui.update_status(f"VERIFYING {label} PHYSICAL INTEGRITY...")
-            verify_hash = self.calculate_physical_hash(f"VERIFYING {label}")
+            verified = True
+            if self.verify_mode == "regen":
+                report = self.verify_by_regeneration(stage, f"VERIFYING {label}", seed=seed)
+                self.verify_reports[stage] = report
+                verify_hash = self.summarize_verification(report)
+                verified = report["mismatched_chunks"] == 0 and not report.get("error")
+                self.logger.log_event("SUCCESS" if verified else "CRITICAL", "VERIFY", verify_hash,
+                                     detail=str(report))
+            else:
+                verify_hash = self.calculate_physical_hash(f"VERIFYING {label}")
             if stage == 1: self.pass1_hash = verify_hash
             else: self.final_hash = verify_hash
-                
-            return True
+
+            self.logger.sync(f"{label} {'VERIFIED' if verified else 'VERIFICATION FAILED'}")
+            if self.journal and verified:
+                # Next resume starts at the following pass
+                field = "pass1_hash" if stage == 1 else "final_hash"
+                self.journal.checkpoint(**{field: verify_hash, "stage": stage + 1, "phase": "WRITE",
+                                           "committed_chunk": 0, "bad_blocks": self.bad_blocks.to_dict()})
+
+            if not verified:
+                self.ui.update_status(f"[!] VERIFICATION FAILED: {verify_hash}")
+            return verified
 
         except PermissionError:
             self.logger.log_event("ERROR", "ACCESS", "Permission denied on physical drive handle")
@@ -158,34 +627,413 @@ class QSSPSanitizer:
             self.logger.log_event("CRITICAL", "ENGINE", f"Wipe failure: {str(e)}")
             self.ui.update_status(f"[!] CRITICAL FAILURE: {e}")
             return False
+        finally:
+            if not bar.finished:
+                bar.finish()
+            if tel.finished is None:
+                self._export_telemetry(tel.finish(), final=True)
+            self.logger.sync()  # Failures above must survive a crash too
+
+    def execute_interleaved(self, seed, region_bytes=1024 * 1024 * 1024):
+        """
+        Both passes region by region: Pass 1, its read-back, Pass 2, its read-back, then on to
+        the next region. Heads (and SSD write caches) stay inside one region instead of making
+        four full-surface sweeps. Read-backs feed the pass 1 / final chains in LBA order, so
+        the certificate gets the same hashes (or regen reports) as two separate passes.
+        """
+        self.quantum_root = seed
+        cmap = self._chunk_map()
+        total_chunks = len(cmap)
+        if total_chunks == 0: return False
+        region_chunks = max(1, region_bytes // self.chunk_size)
+        segments = []
+        for first in range(0, total_chunks, region_chunks):
+            last = min(first + region_chunks, total_chunks)
+            segments += [(1, first, last), (2, first, last)]
+
+        labels = {1: "PASS 1: QUANTUM FILL", 2: "PASS 2: AES-CTR WIPE"}
+        digests = {stage: self._sweep_digest(cmap) for stage in labels}
+        reports = {stage: {"mode": "regen", "stage": stage, "chunks": 0, "mismatched_chunks": 0,
+                           "mismatched_bytes": 0, "first_mismatch": None, "excluded_bytes": 0} for stage in labels}
+        # Fused as well: the original contents go into the pre-wipe chain during the same sweep
+        originals = self._sweep_digest(cmap) if self.fused_sweep and self.pre_wipe_hash == "NOT_STARTED" else None
+
+        label = "INTERLEAVED PASS 1 + PASS 2"
+        tel = self._telemetry(label)
+        start_time = time.time()
+        self.logger.log_event("INFO", "WIPE_ENGINE", f"Initiating {label}",
+                             detail=f"Target: {self.path} | Scope: {self.scope or 'WHOLE DEVICE'} | Regions: {len(segments) // 2} x "
+                                    f"{region_chunks * self.chunk_size // (1024 * 1024)} MB | Verify: {self.verify_mode}")
+        if self.journal:
+            # Not resumable per region: a crash restarts as a plain Pass 1 from chunk 0 (and a fused
+            # run has overwritten part of what it was hashing, so the chain is journaled as lost)
+            self.journal.checkpoint(stage=1, phase="WRITE", committed_chunk=0,
+                                    chunk_size=self.chunk_size, total_chunks=total_chunks,
+                                    scope=self.scope.to_dict() if self.scope else None,
+                                    pre_wipe_hash=FUSED_CHAIN_LOST if originals else self.pre_wipe_hash,
+                                    pass1_hash=self.pass1_hash, fused_sweep=self.fused_sweep)
+        bar = self.ui.progress(label, 2 * cmap.total_bytes)
+
+        try:
+            with self.device.open(writable=True, queue_depth=self.queue_depth,
+                                  direct=self.direct_io, bad_blocks=self.bad_blocks) as drive:
+                drive.on_latency = lambda seconds: tel.observe("write_latency_seconds", seconds)
+
+                def read_back(stage, first, last):
+                    # Must finish before the next segment overwrites this region (Pass 1 -> Pass 2)
+                    if self.verify_mode == "regen":
+                        part = _verify_range(self.device, seed, stage, self.chunk_size, self.pass2_nonce_mode,
+                                             first, last, self.direct_io, cmap.extents, self.bad_blocks.to_dict())
+                        self._merge_verification(reports[stage], part)
+                        tel.add("bytes_verified", cmap.logical(last) - cmap.logical(first))
+                        return
+                    ranges = list(cmap.ranges(first, last))
+                    for (offset, length), (_, chunk) in zip(ranges, drive.read_stream(ranges)):
+                        if len(chunk) != length:
+                            raise OSError(f"Short read at LBA {offset // SECTOR_SIZE}")
+                        digests[stage].update(chunk)
+                        self.bytes_read += len(chunk)
+                        tel.add("bytes_hashed", len(chunk))
+
+                entropy = self._write_segments(seed, cmap, segments, drive, tel, bar, originals=originals,
+                                               on_segment=read_back)
+                drive.fsync()
+            bar.finish()
+            self._export_telemetry(tel.finish(), final=True)
+        except Exception as e:
+            self.logger.log_event("CRITICAL", "ENGINE", f"Wipe failure: {str(e)}")
+            self.ui.update_status(f"[!] CRITICAL FAILURE: {e}")
+            return False
+        finally:
+            if not bar.finished:
+                bar.finish()
+            if tel.finished is None:
+                self._export_telemetry(tel.finish(), final=True)
+            self.logger.sync()
+
+        total_time = time.time() - start_time
+        self.logger.log_event("SUCCESS", "PERF_DATA", f"{label} Complete",
+                             detail=f"Duration: {total_time:.2f}s | Avg Speed: "
+                                    f"{bar.done / (1024 * 1024) / total_time if total_time > 0 else 0:.2f} MB/s")
+        self._log_bad_blocks(label)
+        if originals:
+            self.pre_wipe_hash = self._sweep_result("CAPTURING PRE-WIPE STATE", originals, cmap)
+            self.logger.log_event("INFO", "FORENSIC", f"Initial state hash (fused sweep): {self.pre_wipe_hash}")
+
+        verified = True
+        for stage, stage_label in labels.items():
+            self.entropy_reports[stage] = entropy[stage]
+            self._log_entropy(stage_label, entropy[stage])
+            if self.verify_mode == "regen":
+                self.verify_reports[stage] = reports[stage]
+                chain = self.summarize_verification(reports[stage])
+                ok = reports[stage]["mismatched_chunks"] == 0
+                self.logger.log_event("SUCCESS" if ok else "CRITICAL", "VERIFY", chain, detail=str(reports[stage]))
+                verified = verified and ok
+            else:
+                chain = self._sweep_result(f"VERIFYING {stage_label}", digests[stage], cmap)
+            if stage == 1: self.pass1_hash = chain
+            else: self.final_hash = chain
+
+        self.logger.sync(f"{label} {'VERIFIED' if verified else 'VERIFICATION FAILED'}")
+        if self.journal and verified:
+            # Both passes landed: a resume only re-verifies Pass 2 and writes the certificate
+            self.journal.checkpoint(pre_wipe_hash=self.pre_wipe_hash, pass1_hash=self.pass1_hash,
+                                    final_hash=self.final_hash, stage=3, phase="WRITE", committed_chunk=0,
+                                    bad_blocks=self.bad_blocks.to_dict())
+        if not verified:
+            self.ui.update_status(f"[!] VERIFICATION FAILED: {self.pass1_hash} / {self.final_hash}")
+        return verified
+
+    def _log_bad_blocks(self, label):
+        if self.bad_blocks:
+            self.logger.log_event("WARN", "BAD_BLOCKS", f"{label}: {self.bad_blocks.sectors} sectors mapped out",
+                                 detail=str(self.bad_blocks))
+
+    def _log_entropy(self, label, entropy):
+        self.logger.log_event("WARN" if entropy["anomalies"] else "INFO", "ENTROPY_SUMMARY",
+                             f"{label}: {entropy['chunks_checked']} chunks checked in full, "
+                             f"{entropy['chunks_sampled']} sampled, {entropy['anomalies']} anomalies",
+                             detail=(f"H mean/min: {entropy['entropy_mean']:.6f}/{entropy['entropy_min']:.6f} | "
+                                     f"chi2 mean/max: {entropy['chi2_mean']:.1f}/{entropy['chi2_max']:.1f} | "
+                                     f"monobit p min: {entropy['monobit_p_min']:.2e} | "
+                                     f"sampled H min: {entropy['sampled_entropy_min']:.6f} "
+                                     f"({entropy['sampled_anomalies']} sampled anomalies)"))
+
+    def _write_segments(self, seed, cmap, segments, drive, tel, bar, originals=None, checkpoint=False, on_segment=None):
+        """
+        Producer/writer pipeline over `segments` [(stage, start_chunk, end_chunk), ...] of the
+        chunk table `cmap`, written in list order through `drive`. The producer runs ahead across segment boundaries;
+        on_segment(stage, start, end) runs on the writer once a segment's writes have landed.
+        `originals` (a _SweepDigest) gets each chunk's old contents just before it is overwritten.
+        Returns the watchdog report per stage.
+        """
+        # Enough slots to keep the queue and every outstanding write busy at once
+        ring = BufferRing(self.ring_buffers + self.queue_depth, self.chunk_size)
+        chunk_queue = queue.Queue(maxsize=ring.count)
+        stop = threading.Event()
+        
+        # ALIGNMENT: 'Entropy Density Verification' [Whitepaper Section 4.2]
+        # Every full chunk is checked, on a side thread or (checkers behind) as an inline
+        # sample; a buffer is recycled once both the device write and the watchdog are done with it.
+        def on_anomaly(index, result):
+            self.logger.log_event("WARN", "ENTROPY_DROP", f"Chunk {index} failed entropy checks",
+                                 detail=f"H={result['entropy']:.4f} chi2={result['chi2']:.1f} monobit_p={result['monobit_p']:.2e}")
+        monitors = {stage: WatchdogMonitor(self.watchdog, on_anomaly=on_anomaly).start()
+                    for stage in sorted({segment[0] for segment in segments})}
+        holds = {}
+        holds_lock = threading.Lock()
+        
+        def acquire_slot():
+            # Global memory budget (multi-disk) + a free ring buffer; give up on abort
+            while self.memory_budget is not None:
+                if stop.is_set():
+                    return None  # No token taken, so none to hand back
+                if self.memory_budget.acquire(timeout=0.5):
+                    break
+            while not stop.is_set():
+                try:
+                    return ring.acquire(timeout=0.5)
+                except queue.Empty:
+                    continue
+            if self.memory_budget is not None:
+                self.memory_budget.release()  # Only reached holding a token
+            return None
+        
+        def release_slot(buf):
+            with holds_lock:
+                holds[id(buf)] -= 1
+                if holds[id(buf)]: return
+                del holds[id(buf)]
+            try:
+                ring.release(buf)  # Zeroed before it can be handed out again
+            finally:
+                if self.memory_budget is not None:
+                    self.memory_budget.release()  # Shared by the whole rack: never leak it
+        
+        def enqueue(chunk):
+            while not stop.is_set():
+                try:
+                    chunk_queue.put(chunk, timeout=0.5)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+        
+        def producer():
+            # Both keystreams are seekable by device offset (resume, scopes, interleaved regions)
+            engine = CSEE(seed, self.chunk_size)
+            pass2 = AESCTRStream(seed, self.chunk_size, nonce_mode=self.pass2_nonce_mode)
+            stream = None
+            next_cell = None  # Grid cell the running Pass-1 stream yields next
+            # One keystream pool for the whole pass: a restart at a new extent only drops its prefetch
+            pool = self.keystream_pool
+            owned_pool = None
+            if pool is None and self.workers > 1 and any(segment[0] == 1 for segment in segments):
+                pool_cls = ProcessPoolExecutor if self.keystream_executor == "process" else ThreadPoolExecutor
+                pool = owned_pool = pool_cls(max_workers=self.workers)
+            
+            def fill(stage, offset, view):
+                if stage == 2:
+                    # Single long-lived AES key schedule, keystream written in place
+                    if pass2.position != offset:
+                        pass2.seek(offset)
+                    pass2.fill_next(view)  # update_into straight into the ring buffer
+                    return
+                nonlocal stream, next_cell
+                cell, within = divmod(offset, self.chunk_size)
+                if stream is None or cell != next_cell:
+                    # New SHAKE stream at this cell; contiguous pieces keep the running one (and its prefetch)
+                    if stream is not None: stream.close()
+                    engine.counter = cell
+                    stream = engine.get_stream(self.chunk_size, workers=self.workers,
+                                               executor=self.keystream_executor, pool=pool)
+                # hashlib has no digest-into; one copy and the SHAKE output is freed at once.
+                # Partial pieces at extent edges take their slice, so the stream moves past their cell too
+                chunk = next(stream)
+                view[:] = chunk if len(view) == self.chunk_size else memoryview(chunk)[within:within + len(view)]
+                next_cell = cell + 1
+
+            try:
+                for stage, first, last in segments:
+                    for index in range(first + 1, last + 1):
+                        offset, length = cmap[index - 1]
+                        stalled = time.perf_counter()
+                        buf = acquire_slot()
+                        if buf is None: return
+                        filling = time.perf_counter()
+                        fill(stage, offset, buf if length == self.chunk_size else memoryview(buf)[:length])
+                        checking = time.perf_counter()
+                        full = length == self.chunk_size
+                        with holds_lock:
+                            holds[id(buf)] = 2 if full else 1  # Writer (+ watchdog)
+                        if full:
+                            # Entropy statistics on a few stray sectors would only raise false alarms
+                            monitors[stage].submit(index, buf, on_done=release_slot)
+                        queued = time.perf_counter()
+                        if not enqueue(buf):
+                            release_slot(buf)
+                            return
+                        # Waiting for a free slot or a queue spot means something downstream is slower
+                        tel.observe("producer_stall_seconds", filling - stalled)
+                        tel.observe("producer_fill_seconds", checking - filling)
+                        tel.observe("watchdog_wait_seconds", queued - checking)
+                        tel.observe("producer_enqueue_seconds", time.perf_counter() - queued)
+            finally:
+                if stream is not None: stream.close()
+                if owned_pool is not None: owned_pool.shutdown(wait=False, cancel_futures=True)
+                enqueue(None)
+
+        producer_thread = threading.Thread(target=producer, daemon=True)
+        producer_thread.start()
+        
+        try:
+            # Fused sweep: read-ahead of the original contents. Chunk i is read and hashed
+            # before its write is submitted; read-ahead only ever touches chunks not yet written.
+            old = drive.read_stream(piece for stage, first, last in segments if stage == 1
+                                    for piece in cmap.ranges(first, last)) if originals else None
+            for stage, first, last in segments:
+                for i in range(first + 1, last + 1):
+                    waited = time.perf_counter()
+                    chunk = chunk_queue.get()
+                    submitted = time.perf_counter()
+                    tel.observe("writer_wait_seconds", submitted - waited)  # Writer starved by the producer
+                    if chunk is None:
+                        raise RuntimeError(f"Keystream producer stopped at chunk {i - 1}")
+                    tel.sample("queue_occupancy", chunk_queue.qsize())
+                    offset, length = cmap[i - 1]
+                    
+                    if old is not None and stage == 1:
+                        reading = time.perf_counter()
+                        _, original = next(old)
+                        if len(original) != length:
+                            raise OSError(f"Short read at LBA {offset // SECTOR_SIZE}")
+                        hashing = time.perf_counter()
+                        tel.observe("read_wait_seconds", hashing - reading)
+                        originals.update(original)
+                        self.bytes_read += len(original)
+                        tel.add("bytes_hashed", len(original))
+                        tel.observe("hash_update_seconds", time.perf_counter() - hashing)
+                        submitted = time.perf_counter()
+                    
+                    # Positional write at the chunk's own offset; the memory slot frees on completion
+                    drive.submit_write(offset, chunk if length == self.chunk_size else memoryview(chunk)[:length],
+                                       on_done=lambda f, buf=chunk: release_slot(buf))
+                    tel.observe("writer_submit_seconds", time.perf_counter() - submitted)  # Device queue full
+                    self.bytes_written += length
+                    tel.add("bytes_written", length)
+                    bar.advance(length)
+                    
+                    # ALIGNMENT: Crash-safe progress. Flush the device first, then record the chunk.
+                    if checkpoint and self.journal and self.journal.due(i):
+                        flushing = time.perf_counter()
+                        drive.fsync()
+                        self.journal.checkpoint(committed_chunk=i, bad_blocks=self.bad_blocks.to_dict())
+                        tel.observe("journal_fsync_seconds", time.perf_counter() - flushing)
+                    
+                    if i % 25 == 0:
+                        self._export_telemetry(tel)
+                
+                if on_segment:
+                    drive.drain()  # The segment is on the device before anyone reads it back
+                    on_segment(stage, first, last)
+            return {stage: monitor.close() for stage, monitor in monitors.items()}
+        finally:
+            # Hand any still-queued chunks back to the shared memory budget
+            stop.set()
+            producer_thread.join()
+            while not chunk_queue.empty():
+                buf = chunk_queue.get_nowait()
+                if buf is not None:
+                    release_slot(buf)
+            for monitor in monitors.values():
+                monitor.close()
+            try:
+                # In-flight writes still reference ring slots (and hold budget tokens): closing the
+                # ring under them fails their completions with "released memoryview"
+                drive.drain()
+            except Exception:
+                pass  # Kept by the drive; the caller's drain/fsync raises it
+            ring.close()
             
     def verify_random_sectors(self, sample_count=20):
-        total_bytes = self.get_drive_size()
-        if total_bytes == 0: return 0.0
+        cmap = self._chunk_map()
+        if cmap.total_bytes < 4096: return 0.0
         
         total_entropy = 0.0
+        measured = 0
         # ALIGNMENT: Sector size is usually 512. We must seek to a multiple of 512.
-        SECTOR_SIZE = 512 
-
-        with open(self.path, "rb", buffering=0) as drive:
-            for _ in range(sample_count):
-                # Pick a random sector index, then multiply by sector size
-                max_sectors = total_bytes // SECTOR_SIZE
-                random_sector = random.randint(0, max_sectors - 8) # -8 to ensure 4096 read fits
-                offset = random_sector * SECTOR_SIZE
+        offsets = self._place_samples(cmap, SamplingPlanner(cmap.total_bytes, 4096, self.device.sector_size())
+                                      .plan(sample_count), 4096)
+
+        with self.device.open(queue_depth=self._sample_queue_depth(), access="random",
+                              bad_blocks=self.bad_blocks) as drive:
+            for offset, data in drive.read_stream([(o, 4096) for o in offsets], raise_errors=False):
+                if data is None or self.bad_blocks.overlapping(offset, 4096):
+                    # Mapped bad sector: reported in the certificate, not averaged in as zeros
+                    print(f" {self.ui.dim}0x{offset:<12x}{self.ui.reset} | --          | {self.ui.yellow}BAD SECTOR{self.ui.reset}")
+                    continue
                 
-                try:
-                    drive.seek(offset)
-                    data = drive.read(4096)
-                    
-                    ent = self.watchdog.calculate_entropy(data)
-                    total_entropy += ent
-                    
-                    status = "VALID" if ent > 7.9 else "FAIL"
-                    color = self.ui.green if ent > 7.9 else self.ui.red
-                    # Directly printing here for the table view
-                    print(f" {self.ui.dim}0x{offset:<12x}{self.ui.reset} | {ent:.6f}    | {color}{status}{self.ui.reset}")
-                except OSError:
-                    continue # Skip if a specific sector is locked
+                ent = self.watchdog.calculate_entropy(data)
+                total_entropy += ent
+                measured += 1
+                
+                status = "VALID" if ent > 7.9 else "FAIL"
+                color = self.ui.green if ent > 7.9 else self.ui.red
+                # Directly printing here for the table view
+                print(f" {self.ui.dim}0x{offset:<12x}{self.ui.reset} | {ent:.6f}    | {color}{status}{self.ui.reset}")
                 
-        return total_entropy / sample_count
\ No newline at end of file
+        if measured < len(offsets):
+            self.logger.log_event("WARN", "ENTROPY", f"{len(offsets) - measured} of {len(offsets)} samples hit bad sectors")
+        return total_entropy / measured if measured else 0.0
+
+    @staticmethod
+    def _place_samples(cmap, logical_offsets, block_size):
+        """Planner offsets are scope bytes; map them onto the device (sorted order is preserved)."""
+        placed = (cmap.place(offset, block_size) for offset in logical_offsets)
+        return [offset for offset in placed if offset is not None]
+
+    def _sample_queue_depth(self):
+        # HDD: one head, so keep strict elevator order; SSD: fan the sorted reads out
+        return 1 if self.rotational else self.queue_depth
+
+    def audit_random_sectors(self, sample_count=512, block_size=4096, batch_size=256):
+        """
+        ALIGNMENT: 'Entropy Density Verification' [Whitepaper Section 4.2]
+        Post-wipe statistical audit: samples `sample_count` blocks through the deep-queue
+        reader and runs the NIST SP 800-22 subset over them in vectorized batches.
+        Returns the StatBattery summary (p-value statistics per test) plus the verdict.
+        """
+        import numpy as np
+
+        cmap = self._chunk_map()
+        if cmap.total_bytes < block_size: return {}
+        
+        battery = StatBattery()
+        planner = SamplingPlanner(cmap.total_bytes, block_size, self.device.sector_size())
+        offsets = self._place_samples(cmap, planner.plan(sample_count), block_size)  # Stratified zones, elevator-sorted
+        batch = np.empty((batch_size, block_size), dtype=np.uint8)
+        filled = unreadable = 0
+
+        with self.device.open(queue_depth=self._sample_queue_depth(), access="random",
+                              bad_blocks=self.bad_blocks) as drive:
+            for offset, data in drive.read_stream([(o, block_size) for o in offsets], raise_errors=False):
+                if data is None or len(data) < block_size or self.bad_blocks.overlapping(offset, block_size):
+                    unreadable += 1
+                    continue
+                batch[filled] = np.frombuffer(data, dtype=np.uint8)
+                filled += 1
+                if filled == batch_size:
+                    battery.run_batch(batch)
+                    filled = 0
+            if filled:
+                battery.run_batch(batch[:filled])
+
+        report = {"tests": battery.summary(), "block_size": block_size,
+                  "sampled": len(offsets) - unreadable, "unreadable": unreadable}
+        report["coverage"] = planner.coverage_report(report["sampled"], battery.rejected)
+        report["passed"] = bool(report["tests"]) and StatBattery.passed(report["tests"])
+        self.logger.log_event("SUCCESS" if report["passed"] else "CRITICAL", "STAT_AUDIT",
+                             f"NIST subset over {report['sampled']} x {block_size} B blocks: "
+                             f"{'PASS' if report['passed'] else 'FAIL'}", detail=str(report["tests"]))
+        return report
\ No newline at end of file
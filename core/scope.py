@@ -0,0 +1,242 @@
+import bisect
+import os
+import struct
+
+GPT_SIGNATURE = b"EFI PART"
+MBR_SIGNATURE = b"\x55\xaa"
+MBR_PROTECTIVE = 0xEE
+MBR_EXTENDED = (0x05, 0x0F, 0x85)  # Containers for logical partitions
+
+
+class ChunkMap:
+    """
+    Chunk table of a wipe scope: its extents cut along the device's chunk grid.
+    Piece i lies inside one grid cell, so every keystream layout stays a function of the
+    device offset; pieces at extent edges (and at the device tail) are partial.
+    Computed on demand, so a 2 TB target doesn't materialize millions of tuples.
+    """
+    def __init__(self, extents, chunk_size):
+        self.extents = extents
+        self.chunk_size = chunk_size
+        self._first_piece = []  # Piece index where each extent starts
+        self._first_byte = []   # Scope (logical) byte where each extent starts
+        pieces = logical = 0
+        for offset, length in extents:
+            self._first_piece.append(pieces)
+            self._first_byte.append(logical)
+            pieces += -(-(offset + length) // chunk_size) - offset // chunk_size
+            logical += length
+        self.pieces = pieces
+        self.total_bytes = logical
+
+    def __len__(self):
+        return self.pieces
+
+    def __getitem__(self, index):
+        """(device offset, length) of piece `index`."""
+        if not 0 <= index < self.pieces:
+            raise IndexError(index)
+        k = bisect.bisect_right(self._first_piece, index) - 1
+        offset, length = self.extents[k]
+        cell = offset // self.chunk_size + index - self._first_piece[k]
+        start = max(offset, cell * self.chunk_size)
+        return start, min(offset + length, (cell + 1) * self.chunk_size) - start
+
+    def ranges(self, first=0, last=None):
+        last = self.pieces if last is None else last
+        for index in range(first, last):
+            yield self[index]
+
+    def logical(self, index):
+        """Scope bytes that come before piece `index` (digest positions, Merkle boundaries)."""
+        if index >= self.pieces:
+            return self.total_bytes
+        k = bisect.bisect_right(self._first_piece, index) - 1
+        return self._first_byte[k] + self[index][0] - self.extents[k][0]
+
+    def physical(self, logical):
+        """(device offset, bytes left in that extent) for a scope byte."""
+        k = bisect.bisect_right(self._first_byte, logical) - 1
+        offset, length = self.extents[k]
+        within = logical - self._first_byte[k]
+        return offset + within, length - within
+
+    def place(self, logical, size):
+        """
+        Device offset for a `size`-byte sample at scope byte `logical`. Samples that would
+        straddle an extent edge are pulled back inside it; None if the extent is too small.
+        """
+        offset, left = self.physical(logical)
+        if left >= size:
+            return offset
+        start = offset + left - size
+        k = bisect.bisect_right(self._first_byte, logical) - 1
+        return start if start >= self.extents[k][0] else None
+
+
+class WipeScope:
+    """
+    What a session destroys: a sorted list of disjoint (offset, length) byte extents.
+    Built from the whole device, LBA ranges, a partition of the on-disk MBR/GPT, or an
+    image's allocation map; wipe, hash and verify all walk the same ChunkMap.
+    """
+    def __init__(self, extents, description, device_size):
+        self.extents = self._normalize(extents, device_size)
+        self.description = description
+        self.device_size = device_size
+        if not self.extents:
+            raise ValueError(f"Scope '{description}' selects no data")
+
+    @staticmethod
+    def _normalize(extents, device_size):
+        merged = []
+        for offset, length in sorted(extents):
+            end = min(offset + length, device_size)
+            if end <= offset:
+                continue
+            if merged and offset <= merged[-1][0] + merged[-1][1]:
+                start = merged[-1][0]
+                merged[-1] = (start, max(merged[-1][1], end - start))
+            else:
+                merged.append((offset, end - offset))
+        return merged
+
+    @property
+    def total_bytes(self):
+        return sum(length for _, length in self.extents)
+
+    @property
+    def whole_device(self):
+        return self.extents == [(0, self.device_size)]
+
+    def chunks(self, chunk_size):
+        return ChunkMap(self.extents, chunk_size)
+
+    def to_dict(self):
+        """Journal / sidecar form; from_dict() restores the exact same extents."""
+        return {"description": self.description, "device_size": self.device_size,
+                "extents": [list(extent) for extent in self.extents]}
+
+    @classmethod
+    def from_dict(cls, state):
+        return cls([tuple(extent) for extent in state["extents"]], state["description"], state["device_size"])
+
+    @classmethod
+    def whole(cls, device_size):
+        return cls([(0, device_size)], "WHOLE DEVICE", device_size)
+
+    @classmethod
+    def parse(cls, spec, device):
+        """
+        --scope syntax:
+            lba:2048-1050623,2000000+4096   inclusive LBA ranges or START+COUNT (logical sectors)
+            partition:2                     entry 2 of the target's GPT (or MBR primary table)
+            allocated                       allocated extents of an image file (SEEK_DATA/SEEK_HOLE)
+        """
+        size = device.size()
+        sector = device.sector_size()
+        kind, _, arg = spec.partition(":")
+        kind = kind.strip().lower()
+        if kind == "lba":
+            extents = []
+            for part in filter(None, (p.strip() for p in arg.split(","))):
+                if "+" in part:
+                    start, count = (int(v) for v in part.split("+", 1))
+                else:
+                    start, end = (int(v) for v in part.split("-", 1))
+                    count = end - start + 1
+                if start < 0 or count <= 0 or (start + count) * sector > size:
+                    raise ValueError(f"LBA range {part} is outside the device ({size // sector} sectors)")
+                extents.append((start * sector, count * sector))
+            return cls(extents, f"LBA {arg}", size)
+        if kind == "partition":
+            index = int(arg)
+            with device.open(access="random") as drive:
+                table = read_partition_table(drive.pread, sector)
+            if index not in table:
+                raise ValueError(f"No partition {index} on {device.path} (found: {sorted(table) or 'none'})")
+            offset, length = table[index]
+            return cls([(offset, length)], f"PARTITION {index}", size)
+        if kind == "allocated":
+            return cls(allocated_extents(device.path, size, sector), "ALLOCATED EXTENTS", size)
+        raise ValueError(f"Unknown scope '{spec}' (lba:..., partition:N or allocated)")
+
+    def __str__(self):
+        if self.whole_device:
+            return f"WHOLE DEVICE ({self.device_size} bytes)"
+        return f"{self.description} ({len(self.extents)} extents, {self.total_bytes} of {self.device_size} bytes)"
+
+
+def read_partition_table(read, sector_size=512):
+    """
+    {index: (offset, length)} from the target itself (works for image files too).
+    GPT entries keep their slot numbers; MBR gives primary slots 1-4 (logical partitions
+    inside an extended container are not listed). A protective MBR whose GPT can't be
+    read at `sector_size` raises ValueError rather than yielding the whole-disk entry.
+    """
+    mbr = read(0, 512)
+    if len(mbr) < 512 or mbr[510:512] != MBR_SIGNATURE:
+        return {}
+    slots = [mbr[446 + 16 * i:462 + 16 * i] for i in range(4)]
+    if any(slot[4] == MBR_PROTECTIVE for slot in slots):
+        # The protective entry spans the whole disk: never fall back to it as a "partition"
+        header = read(sector_size, sector_size)
+        if header[:8] != GPT_SIGNATURE:
+            raise ValueError(f"Protective MBR without a GPT header at byte {sector_size} "
+                             "(wrong logical sector size, or a damaged GPT)")
+        entries_lba, count, entry_size = struct.unpack_from("<QII", header, 72)
+        if entry_size < 128 or not 0 < count <= 1024 or entries_lba < 2:
+            raise ValueError(f"Invalid GPT header ({count} entries of {entry_size} bytes at LBA {entries_lba})")
+        raw = read(entries_lba * sector_size, count * entry_size)
+        table = {}
+        for i in range(count):
+            entry = raw[i * entry_size:(i + 1) * entry_size]
+            if len(entry) < 48 or entry[:16] == bytes(16):
+                continue
+            first, last = struct.unpack_from("<QQ", entry, 32)
+            if last >= first:
+                table[i + 1] = (first * sector_size, (last - first + 1) * sector_size)
+        return table
+    table = {}
+    for i, slot in enumerate(slots, start=1):
+        kind = slot[4]
+        start, count = struct.unpack_from("<II", slot, 8)
+        if kind and kind not in MBR_EXTENDED and kind != MBR_PROTECTIVE and count:
+            table[i] = (start * sector_size, count * sector_size)
+    return table
+
+
+def allocated_extents(path, size, sector_size=512):
+    """Data extents of a sparse image, rounded out to whole sectors."""
+    if not hasattr(os, "SEEK_DATA"):
+        raise ValueError("Allocation maps need SEEK_DATA/SEEK_HOLE (not available on this platform)")
+    extents = []
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        offset = 0
+        while offset < size:
+            try:
+                start = os.lseek(fd, offset, os.SEEK_DATA)
+            except OSError:
+                break  # ENXIO: nothing but hole up to EOF
+            end = min(os.lseek(fd, start, os.SEEK_HOLE), size)
+            start -= start % sector_size
+            end = min(size, -(-end // sector_size) * sector_size)
+            extents.append((start, end - start))
+            offset = end
+    finally:
+        os.close(fd)
+    return extents
+
+
+def complement(extents, size):
+    """The gaps between sorted, disjoint `extents` inside [0, size)."""
+    gaps = []
+    cursor = 0
+    for offset, length in extents:
+        if offset > cursor:
+            gaps.append((cursor, offset - cursor))
+        cursor = max(cursor, offset + length)
+    if cursor < size:
+        gaps.append((cursor, size - cursor))
+    return gaps
@@ -0,0 +1,194 @@
+import math
+import numpy as np
+
+ALPHA = 0.01  # NIST SP 800-22 default significance level
+REJECT_P = 1e-6  # Per-block verdict: a random block dips this low on one of the tests ~once per 200k blocks
+
+
+def igamc(a, x):
+    """
+    Regularized upper incomplete gamma Q(a, x) (the NIST 'igamc').
+    Series for x < a + 1, Lentz continued fraction otherwise.
+    """
+    if x <= 0:
+        return 1.0
+    log_prefix = a * math.log(x) - x - math.lgamma(a)
+    if x < a + 1:
+        term = total = 1.0 / a
+        n = a
+        for _ in range(1000):
+            n += 1
+            term *= x / n
+            total += term
+            if abs(term) < abs(total) * 1e-15:
+                break
+        return max(0.0, 1.0 - total * math.exp(log_prefix))
+
+    tiny = 1e-300
+    b = x + 1 - a
+    c = 1 / tiny
+    d = 1 / b
+    h = d
+    for i in range(1, 1000):
+        an = -i * (i - a)
+        b += 2
+        d = an * d + b
+        d = tiny if abs(d) < tiny else d
+        c = b + an / c
+        c = tiny if abs(c) < tiny else c
+        d = 1 / d
+        delta = d * c
+        h *= delta
+        if abs(delta - 1) < 1e-15:
+            break
+    return min(1.0, math.exp(log_prefix) * h)
+
+
+_erfc = np.frompyfunc(math.erfc, 1, 1)
+_igamc = np.frompyfunc(igamc, 2, 1)
+
+
+class StatBattery:
+    """
+    Batched NIST SP 800-22 style test subset for post-wipe sector audits.
+    Every test runs vectorized over a whole batch of sampled blocks at once
+    (rows = blocks, columns = bits), so thousands of blocks cost a few numpy passes.
+    """
+    TESTS = ("frequency", "block_frequency", "runs", "serial", "approximate_entropy")
+
+    def __init__(self, block_bits=128, serial_m=3, apen_m=2):
+        self.block_bits = block_bits
+        self.serial_m = serial_m
+        self.apen_m = apen_m
+        self.pvalues = {name: [] for name in self.TESTS}
+        self.blocks = 0
+        self.rejected = 0  # Blocks with any p-value below REJECT_P: treated as not overwritten
+        self._counts_cache = {}  # m -> (bits, counts): serial and ApEn share pattern tables
+
+    @staticmethod
+    def to_bits(blocks):
+        """(B, nbytes) uint8 -> (B, nbits) uint8 of 0/1."""
+        return np.unpackbits(blocks, axis=1)
+
+    # --- Individual tests (each returns one p-value per row) -----------------------
+
+    @staticmethod
+    def frequency(bits):
+        n = bits.shape[1]
+        s = 2 * bits.sum(axis=1, dtype=np.int64) - n
+        return _erfc(np.abs(s) / math.sqrt(2 * n)).astype(float)
+
+    def block_frequency(self, bits):
+        m = self.block_bits
+        n_blocks = bits.shape[1] // m
+        pi = bits[:, :n_blocks * m].reshape(len(bits), n_blocks, m).mean(axis=2)
+        chi2 = 4 * m * ((pi - 0.5) ** 2).sum(axis=1)
+        return _igamc(n_blocks / 2, chi2 / 2).astype(float)
+
+    @staticmethod
+    def runs(bits):
+        n = bits.shape[1]
+        pi = bits.mean(axis=1)
+        v_obs = 1 + (bits[:, 1:] != bits[:, :-1]).sum(axis=1)
+        p = _erfc(np.abs(v_obs - 2 * n * pi * (1 - pi)) /
+                  np.maximum(2 * math.sqrt(2 * n) * pi * (1 - pi), 1e-12)).astype(float)
+        # Frequency prerequisite: a badly unbalanced block fails outright
+        p[np.abs(pi - 0.5) >= 2 / math.sqrt(n)] = 0.0
+        return p
+
+    def _pattern_counts(self, bits, m):
+        """Overlapping m-bit pattern counts per row (with wrap-around), shape (B, 2**m)."""
+        if m == 0:
+            return np.full((len(bits), 1), bits.shape[1], dtype=np.int64)
+        cached = self._counts_cache.get(m)
+        if cached is not None and cached[0] is bits:
+            return cached[1]
+
+        n = bits.shape[1]
+        wrapped = np.concatenate([bits, bits[:, :m - 1]], axis=1)
+        values = np.zeros(bits.shape, dtype=np.uint16)
+        for k in range(m):
+            values = (values << 1) | wrapped[:, k:k + n]
+        # Few patterns: one compare-and-sum per pattern beats a flattened int64 bincount
+        counts = np.stack([(values == v).sum(axis=1) for v in range(1 << m)], axis=1)
+        self._counts_cache[m] = (bits, counts)
+        return counts
+
+    def serial(self, bits):
+        m = self.serial_m
+        n = bits.shape[1]
+
+        def psi2(k):
+            if k <= 0:
+                return np.zeros(len(bits))
+            counts = self._pattern_counts(bits, k)
+            return (1 << k) / n * (counts.astype(float) ** 2).sum(axis=1) - n
+
+        d1 = psi2(m) - psi2(m - 1)
+        return _igamc(2 ** (m - 2), d1 / 2).astype(float)
+
+    def approximate_entropy(self, bits):
+        m = self.apen_m
+        n = bits.shape[1]
+
+        def phi(k):
+            pi = self._pattern_counts(bits, k) / n
+            with np.errstate(divide="ignore", invalid="ignore"):
+                return np.where(pi > 0, pi * np.log(pi), 0.0).sum(axis=1)
+
+        apen = phi(m) - phi(m + 1)
+        chi2 = 2 * n * (math.log(2) - apen)
+        return _igamc(2 ** (m - 1), chi2 / 2).astype(float)
+
+    # --- Batch driver -------------------------------------------------------------
+
+    def run_batch(self, blocks):
+        """
+        Runs every test over `blocks` (list of equal-length bytes, or a (B, nbytes) uint8 array)
+        and accumulates the p-values.
+        """
+        if not isinstance(blocks, np.ndarray):
+            blocks = np.frombuffer(b"".join(blocks), dtype=np.uint8).reshape(len(blocks), -1)
+        bits = self.to_bits(blocks)
+        worst = np.ones(len(bits))
+        for name in self.TESTS:
+            p = getattr(self, name)(bits)
+            self.pvalues[name].extend(p.tolist())
+            worst = np.minimum(worst, p)
+        self.blocks += len(bits)
+        self.rejected += int((worst < REJECT_P).sum())
+        self._counts_cache.clear()
+
+    def summary(self):
+        """
+        Per test: block count, pass proportion at ALPHA, min p-value and the NIST
+        uniformity p-value of the p-value distribution (10-bin chi-square).
+        """
+        report = {}
+        for name, values in self.pvalues.items():
+            if not values:
+                continue
+            p = np.asarray(values)
+            counts, _ = np.histogram(p, bins=10, range=(0.0, 1.0))
+            expected = len(p) / 10
+            chi2 = float(((counts - expected) ** 2 / expected).sum())
+            report[name] = {
+                "blocks": len(p),
+                "pass_rate": float((p >= ALPHA).mean()),
+                "min_p": float(p.min()),
+                "uniformity_p": igamc(4.5, chi2 / 2),
+            }
+        return report
+
+    @staticmethod
+    def passed(report):
+        """
+        NIST acceptance: pass proportion within the 3-sigma band around 1 - ALPHA
+        and a p-value distribution that is not itself suspicious.
+        """
+        for stats in report.values():
+            n = stats["blocks"]
+            floor = (1 - ALPHA) - 3 * math.sqrt(ALPHA * (1 - ALPHA) / n)
+            if stats["pass_rate"] < floor or stats["uniformity_p"] < 0.0001:
+                return False
+        return True
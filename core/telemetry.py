@@ -0,0 +1,195 @@
+import bisect
+import json
+import os
+import threading
+import time
+
+# Prometheus-style upper bounds (seconds): 100 us .. 5 s
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+                   0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+_append_lock = threading.Lock()  # Rack mode: several drives share one JSONL file
+
+
+class Histogram:
+    """Fixed-bucket latency histogram (cumulative on export, like a Prometheus histogram)."""
+    def __init__(self, bounds=LATENCY_BUCKETS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # Last bucket = +Inf
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q):
+        """Upper bound of the bucket holding the q-quantile (bucket resolution)."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, n in zip(self.bounds, self.counts):
+            seen += n
+            if seen >= rank:
+                return bound
+        return self.max
+
+    def to_dict(self):
+        return {"count": self.count, "sum": self.total, "max": self.max,
+                "mean": self.total / self.count if self.count else 0.0,
+                "p50": self.quantile(0.5), "p99": self.quantile(0.99),
+                "buckets": dict(zip([str(b) for b in self.bounds] + ["+Inf"], self.counts))}
+
+
+class PipelineTelemetry:
+    """
+    Per-phase instrumentation of the wipe pipeline (one instance per pass / hash / verify).
+    Timers feed histograms, gauges are sampled (queue occupancy), counters accumulate
+    (bytes, chunks). Every call takes one short lock, so it is safe on the hot path
+    from producer, writer, watchdog and I/O completion threads alike.
+    """
+    # Where a stalled pipeline shows up: writer starved -> producer, blocked submits or
+    # read-ahead running dry -> device, hashing slower than the reads -> hasher
+    STALLS = {"producer": ("writer_wait_seconds",),
+              "watchdog": ("watchdog_wait_seconds",),
+              "device": ("writer_submit_seconds", "journal_fsync_seconds", "read_wait_seconds"),
+              "hasher": ("hash_update_seconds",)}
+
+    def __init__(self, phase, target):
+        self.phase = phase
+        self.target = target
+        self.started = time.time()
+        self.finished = None
+        self.timers = {}
+        self.gauges = {}
+        self.counters = {}
+        self._lock = threading.Lock()
+
+    def observe(self, name, seconds):
+        with self._lock:
+            timer = self.timers.get(name)
+            if timer is None:
+                timer = self.timers[name] = Histogram()
+            timer.observe(seconds)
+
+    def sample(self, name, value):
+        with self._lock:
+            g = self.gauges.get(name)
+            if g is None:
+                self.gauges[name] = {"samples": 1, "sum": value, "min": value, "max": value, "last": value}
+                return
+            g["samples"] += 1
+            g["sum"] += value
+            g["min"] = min(g["min"], value)
+            g["max"] = max(g["max"], value)
+            g["last"] = value
+
+    def add(self, name, value=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def finish(self):
+        self.finished = time.time()
+        return self
+
+    @property
+    def elapsed(self):
+        return (self.finished or time.time()) - self.started
+
+    def bottleneck(self):
+        """Stage that spent the largest share of the phase stalled, or "balanced"."""
+        with self._lock:
+            stalls = {stage: sum(self.timers[n].total for n in names if n in self.timers)
+                      for stage, names in self.STALLS.items()}
+        stage, seconds = max(stalls.items(), key=lambda kv: kv[1])
+        return stage if self.elapsed > 0 and seconds / self.elapsed > 0.05 else "balanced"
+
+    def snapshot(self):
+        elapsed = self.elapsed
+        with self._lock:
+            gauges = {name: dict(g, mean=g["sum"] / g["samples"]) for name, g in self.gauges.items()}
+            snap = {
+                "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+                "target": self.target, "phase": self.phase,
+                "elapsed": elapsed, "complete": self.finished is not None,
+                "counters": dict(self.counters),
+                "rates": {f"{name}_per_second": value / elapsed
+                          for name, value in self.counters.items() if name.startswith("bytes_") and elapsed > 0},
+                "gauges": gauges,
+                "timers": {name: h.to_dict() for name, h in self.timers.items()},
+            }
+        snap["bottleneck"] = self.bottleneck()
+        return snap
+
+    def summary(self):
+        """One audit-log line: throughput, stall shares and write latency."""
+        snap = self.snapshot()
+        parts = [f"{name.replace('_per_second', '')}: {rate / (1024 * 1024):.1f} MB/s"
+                 for name, rate in snap["rates"].items()]
+        for name, timer in snap["timers"].items():
+            if "latency" in name:
+                # Latencies overlap across the queue: a share of wall time means nothing here
+                parts.append(f"{name.replace('_seconds', '')}: mean {timer['mean'] * 1000:.2f} ms "
+                             f"(p99 <= {timer['p99'] * 1000:.2f} ms)")
+                continue
+            share = timer["sum"] / snap["elapsed"] * 100 if snap["elapsed"] else 0
+            parts.append(f"{name.replace('_seconds', '')}: {share:.0f}% of wall (p99 <= {timer['p99'] * 1000:.2f} ms)")
+        for name, gauge in snap["gauges"].items():
+            parts.append(f"{name}: mean {gauge['mean']:.1f} / max {gauge['max']:.0f}")
+        parts.append(f"bottleneck: {snap['bottleneck']}")
+        return " | ".join(parts)
+
+    # --- Exporters -----------------------------------------------------------------
+
+    def write_jsonl(self, path):
+        line = json.dumps(self.snapshot())
+        with _append_lock, open(path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+
+def _prom_labels(**labels):
+    return "{" + ",".join(f'{k}="{str(v)}"' for k, v in labels.items()) + "}"
+
+
+def write_prometheus(path, telemetries):
+    """
+    Node-exporter textfile (atomic rename, as the textfile collector requires) holding
+    every phase recorded so far for one target. Samples are grouped per metric family.
+    """
+    families = {}  # name -> (type, [sample lines])
+
+    def emit(name, kind, value, **labels):
+        families.setdefault(name, (kind, []))[1].append(f"{name}{_prom_labels(**labels)} {value}")
+
+    for t in telemetries:
+        snap = t.snapshot()
+        base = {"target": t.target, "phase": t.phase}
+        emit("qssp_phase_elapsed_seconds", "gauge", f"{snap['elapsed']:.6f}", **base)
+        for name, value in snap["counters"].items():
+            emit(f"qssp_{name}_total", "counter", value, **base)
+        for name, value in snap["rates"].items():
+            emit(f"qssp_{name}", "gauge", f"{value:.3f}", **base)
+        for name, g in snap["gauges"].items():
+            for stat in ("mean", "max", "last"):
+                emit(f"qssp_{name}", "gauge", g[stat], **base, stat=stat)
+        for name, h in snap["timers"].items():
+            samples = families.setdefault(f"qssp_{name}", ("histogram", []))[1]
+            cumulative = 0
+            for bound, n in h["buckets"].items():
+                cumulative += n
+                samples.append(f"qssp_{name}_bucket{_prom_labels(**base, le=bound)} {cumulative}")
+            samples.append(f"qssp_{name}_sum{_prom_labels(**base)} {h['sum']:.6f}")
+            samples.append(f"qssp_{name}_count{_prom_labels(**base)} {h['count']}")
+
+    lines = []
+    for name, (kind, samples) in families.items():
+        lines.append(f"# TYPE {name} {kind}")
+        lines.extend(samples)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+    os.replace(tmp_path, path)
@@ -1,14 +1,33 @@
 import math
-from collections import Counter
+import os
+import queue
+import threading
+import numpy as np
+
+# Set bits per byte value: monobit counts fall straight out of the byte histogram
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.int64)
 
 class EntropyWatchdog:
     """
     The Safety Layer of Q-SSP.
     Monitors the data stream to ensure it remains non-deterministic.
+    All statistics come from one vectorized byte histogram (np.bincount).
     """
+    CHI2_LIMIT = 377.0     # 255 d.o.f., p ~ 1e-6: a healthy stream trips this once per ~TB
+    MONOBIT_P_LIMIT = 1e-6
+
+    @staticmethod
+    def histogram(data) -> np.ndarray:
+        """Byte-value counts (0-255)."""
+        if len(data) % 2 == 0 and len(data) >= 256 * 1024:
+            # Counting byte *pairs* is ~1.5x faster than bytes; fold the 256x256 table back
+            # (below ~256 KB the 64K-bin table costs more than it saves)
+            pairs = np.bincount(np.frombuffer(data, dtype=np.uint16), minlength=65536).reshape(256, 256)
+            return pairs.sum(axis=0) + pairs.sum(axis=1)
+        return np.bincount(np.frombuffer(data, dtype=np.uint8), minlength=256)
 
     @staticmethod
-    def calculate_entropy(data: bytes) -> float:
+    def calculate_entropy(data: bytes, counts=None) -> float:
         """
         Calculates Shannon Entropy. 
         8.0 = True Random, 0.0 = All bytes are the same.
@@ -16,17 +35,41 @@ class EntropyWatchdog:
         if not data:
             return 0.0
         
-        # Count frequency of each byte (0-255)
-        counts = Counter(data)
-        entropy = 0.0
-        
-        for count in counts.values():
-            # Probability of this byte appearing
-            p = count / len(data)
-            # Shannon entropy formula: H = -sum(p * log2(p))
-            entropy -= p * math.log2(p)
-            
-        return entropy
+        counts = EntropyWatchdog.histogram(data) if counts is None else counts
+        # Shannon entropy formula: H = -sum(p * log2(p))
+        p = counts[counts > 0] / len(data)
+        return 0.0 - float((p * np.log2(p)).sum())
+
+    @staticmethod
+    def chi_square(data: bytes, counts=None) -> float:
+        """Chi-square of the byte histogram against uniform (255 degrees of freedom)."""
+        if not data:
+            return 0.0
+        counts = EntropyWatchdog.histogram(data) if counts is None else counts
+        expected = len(data) / 256
+        return float(((counts - expected) ** 2).sum() / expected)
+
+    @staticmethod
+    def monobit(data: bytes, counts=None) -> float:
+        """NIST monobit p-value: are ones and zeros balanced across the whole chunk?"""
+        if not data:
+            return 0.0
+        counts = EntropyWatchdog.histogram(data) if counts is None else counts
+        n_bits = len(data) * 8
+        ones = int((counts * _POPCOUNT).sum())
+        return math.erfc(abs(2 * ones - n_bits) / math.sqrt(2 * n_bits))
+
+    def analyze(self, data: bytes, threshold: float = 7.9) -> dict:
+        """All three statistics from a single histogram pass."""
+        counts = self.histogram(data)
+        result = {
+            "entropy": self.calculate_entropy(data, counts),
+            "chi2": self.chi_square(data, counts),
+            "monobit_p": self.monobit(data, counts),
+        }
+        result["ok"] = (result["entropy"] >= threshold and result["chi2"] <= self.CHI2_LIMIT
+                        and result["monobit_p"] >= self.MONOBIT_P_LIMIT)
+        return result
 
     def validate_chunk(self, data: bytes, threshold: float = 7.9) -> bool:
         """
@@ -39,6 +82,138 @@ class EntropyWatchdog:
             print(f"[!!!] SAFETY TRIGGER: Entropy dropped to {score:.4f}!")
             return False
 
+
+class WatchdogMonitor:
+    """
+    Side-thread watchdog for the wipe pipeline.
+    Every chunk is handed over with submit(); the check runs off the writer's path on a
+    small pool of checker threads (one per spare core) and `on_done(buf)` fires afterwards
+    so the caller can recycle the buffer. A full histogram runs at ~400-600 MB/s per core,
+    slower than the Pass-2 keystream, so when the checkers fall `backlog` chunks behind -
+    or there is no spare core at all - the chunk gets a sampled check (`sample_blocks` x
+    4 KB spread over it) inline instead of stalling the producer. Every chunk is still
+    checked, but sampled checks are tallied apart: `checked` and the entropy/chi2/monobit
+    statistics cover full chunks only (a 32 KB sample's histogram isn't comparable to a
+    full chunk's), while anomalies count from both. One in `full_every` inline checks still
+    covers the whole chunk, so the statistics never go empty on a machine without a spare core.
+    Keeps rolling statistics for the whole pass instead of one-off prints.
+    """
+    SAMPLE_BLOCK = 4096
+
+    def __init__(self, watchdog=None, on_anomaly=None, backlog=8, threshold=7.9, workers=None, sample_blocks=8,
+                 full_every=16):
+        self.watchdog = watchdog or EntropyWatchdog()
+        self.on_anomaly = on_anomaly
+        self.threshold = threshold
+        self.sample_blocks = sample_blocks
+        self.full_every = full_every
+        self._inline = 0
+        self._queue = queue.Queue(maxsize=backlog)
+        self._threads = [threading.Thread(target=self._run, daemon=True)
+                         for _ in range(min(4, (os.cpu_count() or 1) - 1) if workers is None else workers)]
+        self._lock = threading.Lock()
+        self.checked = 0    # Full-chunk checks
+        self.sampled = 0    # Sampled checks, kept out of the statistics below
+        self.anomalies = 0  # Either kind
+        self.sampled_anomalies = 0
+        self.first_anomaly = None
+        self._entropy_sum = 0.0
+        self._entropy_min = 8.0
+        self._chi2_sum = 0.0
+        self._chi2_max = 0.0
+        self._monobit_min = 1.0
+        self._sampled_entropy_min = 8.0
+
+    def start(self):
+        for thread in self._threads:
+            thread.start()
+        return self
+
+    def submit(self, index, data, on_done=None):
+        if self._threads:
+            try:
+                self._queue.put_nowait((index, data, on_done))
+                return
+            except queue.Full:
+                pass
+        # Checkers are behind: a cheap sampled check here keeps the producer at full speed
+        self._inline += 1
+        sampled = self._inline % self.full_every != 1 % self.full_every
+        try:
+            self._record(index, self.watchdog.analyze(self._sample(data) if sampled else data, self.threshold),
+                         sampled=sampled)
+        finally:
+            if on_done:
+                on_done(data)
+
+    def _sample(self, data):
+        view = memoryview(data)
+        span = len(view) - self.SAMPLE_BLOCK
+        if span <= 0 or self.sample_blocks < 2:
+            return view
+        offsets = (i * span // (self.sample_blocks - 1) for i in range(self.sample_blocks))
+        return b"".join(view[o:o + self.SAMPLE_BLOCK] for o in offsets)
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            index, data, on_done = item
+            try:
+                self._record(index, self.watchdog.analyze(data, self.threshold))
+            finally:
+                if on_done:
+                    on_done(data)
+
+    def _record(self, index, result, sampled=False):
+        with self._lock:
+            self._tally(index, result, sampled)
+        if not result["ok"] and self.on_anomaly:
+            self.on_anomaly(index, result)
+
+    def _tally(self, index, result, sampled):
+        if not result["ok"]:
+            self.anomalies += 1
+            self.sampled_anomalies += sampled
+            if self.first_anomaly is None or index < self.first_anomaly:
+                self.first_anomaly = index
+        if sampled:
+            self.sampled += 1
+            self._sampled_entropy_min = min(self._sampled_entropy_min, result["entropy"])
+            return
+        self.checked += 1
+        self._entropy_sum += result["entropy"]
+        self._entropy_min = min(self._entropy_min, result["entropy"])
+        self._chi2_sum += result["chi2"]
+        self._chi2_max = max(self._chi2_max, result["chi2"])
+        self._monobit_min = min(self._monobit_min, result["monobit_p"])
+
+    def close(self):
+        """Drains the backlog and returns the pass summary."""
+        alive = [thread for thread in self._threads if thread.is_alive()]
+        for _ in alive:
+            self._queue.put(None)
+        for thread in alive:
+            thread.join()
+        return self.summary()
+
+    def summary(self):
+        n = max(self.checked, 1)
+        return {
+            "chunks_checked": self.checked,
+            "chunks_sampled": self.sampled,
+            "sampled_entropy_min": self._sampled_entropy_min if self.sampled else 0.0,
+            "entropy_mean": self._entropy_sum / n,
+            "entropy_min": self._entropy_min if self.checked else 0.0,
+            "chi2_mean": self._chi2_sum / n,
+            "chi2_max": self._chi2_max,
+            "monobit_p_min": self._monobit_min,
+            "anomalies": self.anomalies,
+            "sampled_anomalies": self.sampled_anomalies,
+            "first_anomaly": self.first_anomaly,
+        }
+
 # --- Testing the Watchdog ---
 if __name__ == "__main__":
     dog = EntropyWatchdog()
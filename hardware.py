@@ -2,13 +2,14 @@ import subprocess, os, hashlib
 
 class Win32Disk:
     def get_drive_list(self):
-        cmd = "powershell -Command \"Get-PhysicalDisk | Select-Object DeviceId, Model, Size | ConvertTo-Json\""
+        cmd = "powershell -Command \"Get-PhysicalDisk | Select-Object DeviceId, Model, Size, MediaType | ConvertTo-Json\""
         res = subprocess.run(cmd, capture_output=True, text=True, shell=True)
         import json
         try:
             data = json.loads(res.stdout)
             if isinstance(data, dict): data = [data]
-            return [{'index': str(d['DeviceId']), 'model': d['Model'], 'size': d['Size']} for d in data]
+            return [{'index': str(d['DeviceId']), 'model': d['Model'], 'size': d['Size'],
+                     'media': str(d.get('MediaType') or 'Unspecified')} for d in data]
         except: return []
 
     def get_drive_hash(self, index):
@@ -66,4 +67,24 @@ class Win32Disk:
             
             return 0
         except Exception:
-            return 0
\ No newline at end of file
+            return 0
+
+
+class LinuxDisk:
+    """Linux wipe stations: whole disks and loop devices as reported by lsblk."""
+    def get_drive_list(self):
+        cmd = ["lsblk", "-J", "-b", "-d", "-o", "PATH,MODEL,SIZE,ROTA,TYPE"]
+        import json
+        try:
+            res = subprocess.run(cmd, capture_output=True, text=True)
+            data = json.loads(res.stdout)["blockdevices"]
+            return [{'index': d['path'], 'model': (d.get('model') or d['type']).strip(), 'size': d['size'],
+                     'media': 'HDD' if str(d.get('rota')).lower() in ('1', 'true') else 'SSD'}
+                    for d in data if d['type'] in ('disk', 'loop') and int(d['size'] or 0) > 0]
+        except: return []
+
+    def get_drive_hash(self, path):
+        try:
+            with open(path, "rb", buffering=0) as f:
+                return hashlib.sha256(f.read(1024*1024)).hexdigest()
+        except: return "READ_ERROR"
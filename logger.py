@@ -1,42 +1,192 @@
+import atexit
 import datetime
+import json
 import os
+import queue
 import sys
+import threading
 
 class QLogger:
-    def __init__(self, log_dir="audit_logs"):
+    """
+    Asynchronous, buffered audit logger.
+    log_event() only formats and enqueues; a background thread appends to two sinks
+    that stay open for the whole session: the human-readable audit log (which also
+    carries the certificates) and a structured JSONL twin. Nothing is fsync'd on the
+    hot path - sync() is the explicit durability point used at phase boundaries.
+    """
+    def __init__(self, log_dir="audit_logs", queue_size=4096):
         self.log_dir = log_dir
         os.makedirs(self.log_dir, exist_ok=True)
         self.session_id = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
         self.log_file = os.path.join(self.log_dir, f"QSSP_AUDIT_{self.session_id}.log")
+        self.jsonl_file = os.path.join(self.log_dir, f"QSSP_AUDIT_{self.session_id}.jsonl")
         
-        with open(self.log_file, "w") as f:
-            f.write(f"--- Q-SSP FORENSIC AUDIT SESSION START: {self.session_id} ---\n")
+        self._text = open(self.log_file, "w", encoding="utf-8")
+        self._jsonl = open(self.jsonl_file, "w", encoding="utf-8")
+        self._text.write(f"--- Q-SSP FORENSIC AUDIT SESSION START: {self.session_id} ---\n")
+        # Bounded: a stalled disk back-pressures callers instead of growing without limit.
+        # Audit entries are never dropped.
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._closed = False
+        self._failing = False
+        self._errors = 0
+        self._thread = threading.Thread(target=self._run, name="qlogger", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            batch = [item]
+            errors = self._errors
+            # Drain whatever else is waiting: one flush per burst, not per entry
+            while item is not None and not isinstance(item, threading.Event):
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                batch.append(item)
+            for entry in batch:
+                if entry is None:
+                    self._flush(durable=True)
+                    return
+                if isinstance(entry, threading.Event):
+                    try:
+                        self._flush(durable=True)
+                    finally:
+                        entry.set()  # A failed sink must never leave sync() waiting
+                    continue
+                self._write(*entry)
+            self._flush(durable=False)
+            if self._errors == errors and any(isinstance(entry, tuple) for entry in batch):
+                self._failing = False  # A whole burst of entries landed: the outage is over
+
+    def _write(self, text, record):
+        # Each sink on its own: one failing volume must not cost the other its entries
+        try:
+            self._text.write(text)
+        except OSError as e:
+            self._failed(e)
+        if record is None:
+            return
+        try:
+            self._jsonl.write(json.dumps(record, default=str) + "\n")
+        except OSError as e:
+            self._failed(e)
+
+    def _flush(self, durable):
+        for f in (self._text, self._jsonl):
+            try:
+                f.flush()
+                if durable:
+                    os.fsync(f.fileno())
+            except OSError as e:
+                self._failed(e)
+
+    def _failed(self, error):
+        # Never wedge the wipe on a full/failed log volume; say so where an operator sees it
+        # (once per outage, not once per entry)
+        self._errors += 1
+        if not self._failing:
+            self._failing = True
+            sys.stderr.write(f"[!] AUDIT LOG WRITE FAILED: {error}\n")
+
+    def _put(self, text, record):
+        if self._closed:
+            return
+        self._queue.put((text, record))
 
     def log_event(self, level, module, message, detail=None):
-        timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        entry = f"[{timestamp}] [{level.upper()}] [{module}] {message}"
-        
-        with open(self.log_file, "a", encoding="utf-8") as f:
-            f.write(entry + "\n")
-            if detail:
-                f.write(f"DETAIL: {detail}\n")
-                f.write("-" * 40 + "\n")
+        now = datetime.datetime.now()
+        timestamp = now.strftime("%Y-%m-%d %H:%M:%S")
+        entry = f"[{timestamp}] [{level.upper()}] [{module}] {message}\n"
+        if detail:
+            entry += f"DETAIL: {detail}\n" + "-" * 40 + "\n"
+        self._put(entry, {"ts": now.isoformat(timespec="milliseconds"), "session": self.session_id,
+                          "level": level.upper(), "module": module, "message": message, "detail": detail})
+
+    def sync(self, phase=None):
+        """
+        Durability point: returns once everything logged so far is fsync'd to both sinks.
+        `phase` additionally records which boundary was crossed.
+        """
+        if self._closed:
+            return
+        if phase:
+            self.log_event("INFO", "PHASE", phase)
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait()
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join()
+        for f in (self._text, self._jsonl):
+            try:
+                f.close()
+            except OSError as e:
+                self._failed(e)
                
-    def finalize_certificate(self, hashes, entropy_avg):
+    def finalize_certificate(self, hashes, entropy_avg, target=None, stat_audit=None, hash_scheme=None, scope=None,
+                             bad_blocks=None, seed_source=None):
+        target_line = f"TARGET:     {target}\n" if target else ""
+        target_line += f"SCOPE:      {scope}\n" if scope else ""
+        bad_line = f"BAD BLOCKS:     {bad_blocks}\n" if bad_blocks is not None else ""
+        scheme_line = f"HASH SCHEME:    {hash_scheme}\n" if hash_scheme else ""
+        audit_block = ""
+        if stat_audit and stat_audit.get("tests"):
+            audit_block = (f"STATISTICAL AUDIT (NIST SP 800-22 SUBSET, {stat_audit['sampled']} x "
+                           f"{stat_audit['block_size']} B BLOCKS)\n")
+            for name, stats in stat_audit["tests"].items():
+                audit_block += (f"  {name:<20} pass {stats['pass_rate'] * 100:5.1f}% | "
+                                f"min p {stats['min_p']:.4f} | uniformity p {stats['uniformity_p']:.4f}\n")
+            coverage = stat_audit.get("coverage")
+            if coverage:
+                gaps = coverage.get("guaranteed_gap_bytes")
+                audit_block += (f"COVERAGE:       {coverage['confidence'] * 100:.0f}% confidence unwritten < "
+                                f"{coverage['max_unwritten_fraction'] * 100:.3f}% "
+                                f"({coverage.get('failed_blocks', 0)} of {coverage['samples']} blocks failed)"
+                                + (f" | gaps >= {gaps / (1024 * 1024):.1f} MB always sampled" if gaps else "") + "\n")
+            audit_block += f"AUDIT VERDICT:  {'PASS' if stat_audit['passed'] else 'FAIL'}\n"
+            audit_block += "------------------------------------------------------------\n"
         cert = f"""
 ============================================================
            Q-SSP CERTIFICATE OF DESTRUCTION
 ============================================================
 SESSION ID: {self.session_id}
-QUANTUM ROOT: VERIFIED (ANU VACUUM SOURCE)
+{target_line}QUANTUM ROOT: {seed_source or "UNRECORDED"}
 ------------------------------------------------------------
-PRE-WIPE HASH:  {hashes.get('PRE-WIPE')}
+{scheme_line}PRE-WIPE HASH:  {hashes.get('PRE-WIPE')}
 PASS 1 HASH:    {hashes.get('PASS_1')}
 FINAL HASH:     {hashes.get('FINAL')}
-------------------------------------------------------------
-AVERAGE ENTROPY: {entropy_avg:.6f} bits/byte
+{bad_line}------------------------------------------------------------
+{audit_block}AVERAGE ENTROPY: {entropy_avg:.6f} bits/byte
 LEGAL STATUS:   DATA IRREVERSIBLE / PHYSICALLY TERMINATED
 ============================================================
         """
-        with open(self.log_file, "a") as f:
-            f.write(cert) 
\ No newline at end of file
+        self._put(cert, {"ts": datetime.datetime.now().isoformat(timespec="milliseconds"),
+                         "session": self.session_id, "level": "CERTIFICATE", "module": "CERTIFICATE",
+                         "target": target, "scope": scope.to_dict() if scope else None,
+                         "bad_blocks": bad_blocks.to_dict() if bad_blocks is not None else None,
+                         "hashes": hashes, "hash_scheme": hash_scheme,
+                         "entropy_avg": entropy_avg, "stat_audit": stat_audit})
+        self.sync()  # A certificate only counts once it is on disk 
+
+class MemoryLogger:
+    """
+    QLogger stand-in that keeps (level, module, message) events in memory instead of
+    writing an audit trail (benchmarks, tests). Certificates are not supported.
+    """
+    def __init__(self, log_dir, session_id="MEMORY"):
+        self.log_dir = str(log_dir)
+        self.session_id = session_id
+        self.events = []
+
+    def log_event(self, level, module, message, detail=None):
+        self.events.append((level, module, message))
+
+    def sync(self, phase=None):
+        pass
@@ -1,17 +1,240 @@
 from logging import log
+import argparse
 import sys
 import os
 import time
 from ui import Q_UI
-from hardware import Win32Disk
+from hardware import Win32Disk, LinuxDisk
 from logger import QLogger
 from core.ingestor import QuantumIngestor
-from core.sanitizer import QSSPSanitizer
+from core.sanitizer import QSSPSanitizer, FUSED_CHAIN_LOST
+from core.scope import WipeScope
+from core.journal import WipeJournal
+from core.orchestrator import WipeOrchestrator
+from core.device import open_device
+from core.badblocks import BadBlockBudgetExceeded
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Q-SSP: Quantum-Stable Sanitization Protocol")
+    parser.add_argument("--verify", choices=["hash", "regen"], default="hash",
+                        help="Post-pass check: full-surface SHA-256 or byte-exact keystream regeneration")
+    parser.add_argument("--hash-mode", choices=["linear", "merkle"], default="linear",
+                        help="Surface hash: one running digest, or a Merkle tree of regions hashed in parallel")
+    parser.add_argument("--hash-algorithm", choices=["sha256", "blake2b"], default="sha256",
+                        help="Digest used for surface hashing")
+    parser.add_argument("--merkle-region", type=int, default=16,
+                        help="Merkle mode: MB per leaf region")
+    parser.add_argument("--fused", action="store_true",
+                        help="Single sweep: hash each chunk into the pre-wipe chain right before Pass 1 overwrites it")
+    parser.add_argument("--interleave", type=int, default=0, metavar="MB",
+                        help="Run Pass 1, Pass 2 and their verification region by region (MB per region; 0 = whole-surface passes)")
+    parser.add_argument("--scope", metavar="SPEC",
+                        help="Wipe only part of the target: lba:START-END,START+COUNT | partition:N | allocated "
+                             "(image files); hashes, verification and the certificate cover the same extents")
+    parser.add_argument("--holes", choices=["punch", "allocate"],
+                        help="Sparse image targets: punch = wipe only the allocated extents and re-punch every hole; "
+                             "allocate = back the holes with blocks and wipe the whole file")
+    parser.add_argument("--bad-block-limit", type=int, default=8192, metavar="SECTORS",
+                        help="Sectors that may fail (bisected, mapped out and listed in the certificate) before a "
+                             "drive is treated as failing and the pass aborts")
+    parser.add_argument("--resume", action="store_true",
+                        help="Continue an interrupted wipe from its checkpoint journal")
+    parser.add_argument("--queue-depth", type=int, default=8,
+                        help="Outstanding positional reads/writes per device")
+    parser.add_argument("--discard", action="store_true",
+                        help="Device-level discard/zero-out of the whole surface before Pass 1 (SSDs, image files)")
+    parser.add_argument("--autotune", action="store_true",
+                        help="Benchmark block sizes and queue depths on the target before Pass 1")
+    parser.add_argument("--direct-io", action="store_true",
+                        help="Unbuffered, sector-aligned I/O (bypasses the host page cache)")
+    parser.add_argument("--audit-samples", type=int, default=512,
+                        help="Blocks sampled for the post-wipe NIST SP 800-22 audit battery")
+    parser.add_argument("--target",
+                        help="Wipe this block device or image file directly (skips the disk picker)")
+    parser.add_argument("--metrics-dir",
+                        help="Directory for the Prometheus textfile (node_exporter collector); default: audit_logs")
+    parser.add_argument("--qrng-url",
+                        help="QRNG endpoint in ANU jsonI format (default: ANU; e.g. a local qrng_standin.py)")
+    parser.add_argument("--disks", type=lambda v: [d.strip() for d in v.split(",") if d.strip()],
+                        help="Comma-separated disk indexes to sanitize concurrently (rack mode)")
+    parser.add_argument("--memory-budget", type=int, default=1024,
+                        help="Rack mode: total MB of keystream held in memory across all drives")
+    args = parser.parse_args()
+    if args.fused and (args.discard or args.autotune):
+        # Both write to the surface before Pass 1, i.e. before the fused sweep has hashed it
+        parser.error("--fused cannot be combined with --discard or --autotune")
+    if args.scope and args.autotune:
+        # Calibration writes its test pattern wherever it likes, not just inside the scope
+        parser.error("--scope cannot be combined with --autotune")
+    if args.holes == "punch" and args.autotune:
+        # Same for a punch run: its scope is the allocated extents, and the calibration writes allocate holes
+        parser.error("--holes punch cannot be combined with --autotune")
+    if args.holes and args.scope:
+        parser.error("--holes picks the scope itself (punch: allocated extents, allocate: whole file)")
+    return args
+
+def describe_target(path):
+    """Disk-list entry for a target that was named on the command line (image files, loop devices)."""
+    device = open_device(path)
+    rotational = device.rotational()
+    return {'index': path, 'model': type(device).__name__.upper(), 'size': device.size(),
+            'media': 'HDD' if rotational else 'SSD'}
+
+def configure_io(sanitizer, args):
+    sanitizer.queue_depth = args.queue_depth
+    sanitizer.direct_io = args.direct_io
+    sanitizer.metrics_dir = args.metrics_dir
+    sanitizer.bad_blocks.max_sectors = args.bad_block_limit
+
+def configure_hashing(sanitizer, args):
+    sanitizer.fused_sweep = args.fused
+    sanitizer.hash_mode = args.hash_mode
+    sanitizer.hash_algorithm = args.hash_algorithm
+    sanitizer.merkle_region = args.merkle_region * 1024 * 1024
+
+def apply_scope(sanitizer, args, ui):
+    """Resolves --scope against the target itself (partition tables are read from it); False on error."""
+    spec = args.scope or ("allocated" if args.holes == "punch" else None)
+    if not spec:
+        return True
+    try:
+        sanitizer.scope = WipeScope.parse(spec, sanitizer.device)
+    except (ValueError, OSError) as e:
+        print(f"{ui.red}[!] Invalid scope for {sanitizer.path}: {e}{ui.reset}")
+        return False
+    sanitizer.logger.log_event("INFO", "SCOPE", f"{sanitizer.path}: {sanitizer.scope}",
+                               detail=" | ".join(f"{o}+{n}" for o, n in sanitizer.scope.extents[:16]))
+    return True
+
+def hash_scheme(sanitizer):
+    """Certificate label of the chain the hashes were actually computed with (journaled on resume)."""
+    scheme = f"{sanitizer.hash_mode.upper()} {sanitizer.hash_algorithm.upper()}"
+    return scheme + (f" ({sanitizer.merkle_region // (1024 * 1024)} MB REGIONS)" if sanitizer.hash_mode == "merkle" else "")
+
+def hash_settings(sanitizer):
+    """Journal fields every hash of the session depends on."""
+    return {"hash_mode": sanitizer.hash_mode, "hash_algorithm": sanitizer.hash_algorithm,
+            "merkle_region": sanitizer.merkle_region}
+
+def note_fused_chain(log):
+    if sys.platform == "win32":
+        # diskpart clean strips the partition tables during seizure, before the sweep reads them
+        log.log_event("WARN", "FORENSIC", "Fused sweep: pre-wipe hash covers the surface after diskpart clean")
+
+def run_rack(args, ui, log, disks):
+    """
+    Multi-disk session: every selected drive is hashed, wiped and verified concurrently.
+    """
+    targets = [d for d in disks if d['index'] in args.disks]
+    targets += [describe_target(p) for p in args.disks
+                if p not in {d['index'] for d in targets} and os.path.exists(p)]
+    missing = set(args.disks) - {d['index'] for d in targets}
+    if missing:
+        print(f"{ui.red}[!] Unknown disk index: {', '.join(sorted(missing))}{ui.reset}")
+        return
+
+    for d in targets:
+        ui.draw_warning_header(d['index'])
+        log.log_event("INFO", "HARDWARE", f"Target selected: {d['model']} ({int(d['size'])/(1024**3):.2f} GB)")
+    confirm = input(f"{ui.yellow}[?] PROCEED WITH FULL SANITIZATION OF {len(targets)} DISKS? (y/n): {ui.reset}").lower().strip()
+    if confirm != 'y':
+        print(f"{ui.dim}[*] Protocol disarmed.{ui.reset}")
+        return
+
+    sanitizers = [QSSPSanitizer(d['index'], ui, log) for d in targets]
+    for s, d in zip(sanitizers, targets):
+        s.rotational = d.get('media') == 'HDD'
+        s.verify_mode = args.verify
+        configure_hashing(s, args)
+        configure_io(s, args)
+        if not apply_scope(s, args, ui):
+            return
+    try:
+        rack = WipeOrchestrator(sanitizers, ui, log, memory_budget=args.memory_budget * 1024 * 1024)
+    except ValueError as e:
+        print(f"{ui.red}[!] {e}. Raise --memory-budget or wipe fewer disks at once.{ui.reset}")
+        return
+
+    # One unique quantum root per drive, fetched in batches while the drives are hashed
+    seed_reservation = QuantumIngestor.reserve(len(sanitizers))
+
+    # Pre-wipe forensic chain, all drives at once (fused: taken inside Pass 1 instead)
+    if args.fused:
+        note_fused_chain(log)
+    else:
+        ui.update_status("INITIALIZING FORENSIC CHAIN (RACK)...")
+        def capture(s):
+            s.pre_wipe_hash = s.calculate_physical_hash("CAPTURING PRE-WIPE STATE")
+            log.log_event("INFO", "FORENSIC", f"Disk {s.target_idx} initial state hash: {s.pre_wipe_hash}")
+            return s.pre_wipe_hash
+        rack.run(capture, "PRE-WIPE HASH")
+        log.sync("PRE-WIPE STATE CAPTURED")
+
+    seeds = dict(zip([s.target_idx for s in sanitizers], QuantumIngestor.claim(seed_reservation)))
+    for s in sanitizers:
+        log.log_event("INFO", "QUANTUM", f"Disk {s.target_idx} root seed via {QuantumIngestor.API_URL}: {seeds[s.target_idx].hex()}",
+                      detail=QuantumIngestor.source())
+
+    # Diskpart scripts share a working file, so seize one drive at a time
+    print(f"{ui.yellow}[*] Seizing Hardware Control (Diskpart)...{ui.reset}")
+    for s in sanitizers:
+        if not s.seize_and_clean():
+            print(f"{ui.red}[!] Failed to seize disk {s.target_idx}. Check permissions.{ui.reset}")
+            return
+
+    if args.discard:
+        ui.update_status("DISCARD PRE-PASS (RACK)...")
+        rack.run(lambda s: s.discard_surface(), "DISCARD")
+
+    if args.holes:
+        ui.update_status(f"SETTLING IMAGE HOLES ({args.holes.upper()}, RACK)...")
+        rack.run(lambda s: s.prepare_holes(args.holes), "HOLES")
+
+    if args.autotune:
+        ui.update_status("CALIBRATING I/O GEOMETRY (RACK)...")
+        rack.run(lambda s: s.calibrate(), "AUTOTUNE")
+
+    ui.update_status(f"ENGAGING RACK WIPE: {len(sanitizers)} DRIVES...")
+    results = rack.wipe(seeds, region_bytes=args.interleave * 1024 * 1024)
+
+    print(f"\n\n{ui.bold}RACK SUMMARY{ui.reset}")
+    print(f"{ui.dim}———————————————————————————————————————————————————————————————————————————{ui.reset}")
+    for s in sanitizers:
+        ok = results.get(s.target_idx)
+        rate = rack.throughput["RACK WIPE"].get(s.target_idx, 0)
+        status = f"{ui.cyan}SANITIZED{ui.reset}" if ok else f"{ui.red}FAILED{ui.reset}"
+        print(f" DISK {s.target_idx:<4} | {status} | {rate:>8.1f} MB/s | FINAL {s.final_hash}")
+        if ok:
+            hashes = {'PRE-WIPE': s.pre_wipe_hash, 'PASS_1': s.pass1_hash, 'FINAL': s.final_hash}
+            try:
+                stat_audit = s.audit_random_sectors(sample_count=args.audit_samples)
+            except BadBlockBudgetExceeded as e:
+                # Failed under the audit itself: no certificate for a drive that can't be read back
+                log.log_event("CRITICAL", "STAT_AUDIT", f"Disk {s.target_idx} audit aborted: {e}")
+                print(f" {'':<9} | {ui.red}AUDIT ABORTED: {e}{ui.reset}")
+                continue
+            entropy = s.entropy_reports.get(2, {}).get('entropy_mean', 0.0)
+            log.finalize_certificate(hashes, entropy, target=s.path, stat_audit=stat_audit,
+                                     hash_scheme=hash_scheme(s), scope=s.scope, bad_blocks=s.bad_blocks,
+                                     seed_source=QuantumIngestor.source())
+    print(f" {'AGGREGATE':<9} | {rack.throughput['RACK WIPE']['AGGREGATE']:>8.1f} MB/s")
+    print(f"\n{ui.cyan}>>> CERTIFICATES SAVED: {log.log_file}{ui.reset}")
+
+    for idx in list(seeds):
+        seeds[idx] = b'\x00' * len(seeds[idx])
+    seeds.clear()
+    print("\n[+] Memory Purged: Quantum Seeds Zeroed.")
 
 def main():
+    args = parse_args()
+    QuantumIngestor.configure(url=args.qrng_url)
     ui = Q_UI()
-    hw = Win32Disk()
+    hw = Win32Disk() if sys.platform == "win32" else LinuxDisk()
     log = QLogger()
+    if not QuantumIngestor.verified():
+        # Any other endpoint (e.g. qrng_standin.py) is for testing: say so everywhere it matters
+        print(f"{ui.yellow}[!] QRNG override: {QuantumIngestor.API_URL} is NOT a certified quantum source.{ui.reset}")
+        log.log_event("WARN", "QUANTUM", f"Seed source overridden: {QuantumIngestor.source()}")
     avg_entropy = 0.0  
     hashes = {'PRE-WIPE': 'N/A', 'PASS_1': 'N/A', 'FINAL': 'N/A'}
     if sys.platform == "win32": os.system('color')
@@ -19,62 +242,168 @@ def main():
 
     # 1. HARDWARE SELECTION
     disks = hw.get_drive_list()
-    if not disks:
+    if not disks and not (args.target or args.disks):
         print(f"{ui.red}[!] No physical disks detected. Run as Administrator.{ui.reset}")
         return
 
-    disks.sort(key=lambda x: int(x['index']))
+    disks.sort(key=lambda x: (not x['index'].isdigit(), int(x['index']) if x['index'].isdigit() else 0, x['index']))
     
-    try:
-        target_idx = ui.select_disk_interactive(disks)
-        print("\n" * 2) 
-    except KeyboardInterrupt:
-        return
+    if args.disks:
+        return run_rack(args, ui, log, disks)
     
-    target_disk = next((d for d in disks if d['index'] == target_idx), None)
+    if args.target:
+        target_idx = args.target
+        target_disk = next((d for d in disks if d['index'] == target_idx), None) or describe_target(target_idx)
+    else:
+        try:
+            target_idx = ui.select_disk_interactive(disks)
+            print("\n" * 2) 
+        except KeyboardInterrupt:
+            return
+    
+        target_disk = next((d for d in disks if d['index'] == target_idx), None)
     log.log_event("INFO", "HARDWARE", f"Target selected: {target_disk['model']} ({int(target_disk['size'])/(1024**3):.2f} GB)")
 
+    # Crash-safe journal (resume skips straight to the interrupted pass)
+    journal = WipeJournal(log.log_dir, target_idx)
+    state = journal.load() if args.resume else None
+    if args.resume and not state:
+        print(f"{ui.red}[!] No valid checkpoint journal found for disk {target_idx}.{ui.reset}")
+        return
+
     # 2. SAFETY GATES
     ui.draw_warning_header(target_idx)
-    confirm = input(f"{ui.yellow}[?] PROCEED WITH FULL DISK SANITIZATION? (y/n): {ui.reset}").lower().strip()
+    if state:
+        # A resumed job keeps the scope it was started with, whatever the command line says now
+        scope = WipeScope.from_dict(state['scope']) if state.get('scope') else None
+        spec = scope.description if scope and not scope.whole_device else None
+    else:
+        spec = args.scope or ("allocated" if args.holes == "punch" else None)
+    what = f"SCOPED SANITIZATION ({spec})" if spec else "FULL DISK SANITIZATION"
+    confirm = input(f"{ui.yellow}[?] PROCEED WITH {'RESUMED ' if state else ''}{what}? (y/n): {ui.reset}").lower().strip()
     if confirm != 'y':
         print(f"{ui.dim}[*] Protocol disarmed.{ui.reset}")
         return
 
     # 3. SETUP SANITIZER EARLY (Needed for Seizure & Hashing)
     sanitizer = QSSPSanitizer(target_idx, ui, log)
+    sanitizer.verify_mode = args.verify
+    configure_hashing(sanitizer, args)
+    configure_io(sanitizer, args)
+    sanitizer.journal = journal
+    sanitizer.rotational = target_disk.get('media') == 'HDD'
     
-    # 4. CAPTURE PRE-WIPE STATE (THE REAL FULL HASH)
-    ui.update_status("INITIALIZING FORENSIC CHAIN...", centered=False)
-    # ALIGNMENT: Using the sanitizer's full read, not the hardware's 1MB read
-    pre_wipe = sanitizer.calculate_physical_hash("CAPTURING PRE-WIPE STATE")
-    print("")
-    sanitizer.pre_wipe_hash = pre_wipe
-    print(f"    >>> HASH: {pre_wipe}")
-    log.log_event("INFO", "FORENSIC", f"Initial state hash: {pre_wipe}")
-
-    # 5. QUANTUM HANDSHAKE
-    seed = QuantumIngestor.get_quantum_seed()
-    log.log_event("INFO", "QUANTUM", f"Root seed generated via ANU Vacuum Source: {seed.hex()}")
-
-    # 6. SEIZE HARDWARE
-    print(f"{ui.yellow}[*] Seizing Hardware Control (Diskpart)...{ui.reset}")
-    if not sanitizer.seize_and_clean():
-        print(f"{ui.red}[!] Failed to seize drive. Check permissions.{ui.reset}")
-        return
+    if state:
+        # RESUME: Forensic chain and quantum root come from the journal
+        seed = bytes.fromhex(state['seed'])
+        seed_source = state.get('seed_source', "UNRECORDED (RESUMED FROM AN OLDER JOURNAL)")
+        sanitizer.chunk_size = state['chunk_size']  # Keystream layout depends on it
+        if state.get('scope'):
+            sanitizer.scope = WipeScope.from_dict(state['scope'])  # So does the chunk table
+        hashing = state.get('hashing', {})
+        for field in hash_settings(sanitizer):
+            if field in hashing:
+                setattr(sanitizer, field, hashing[field])  # Journaled hashes only compare under the same scheme
+        sanitizer.bad_blocks.merge(state.get('bad_blocks'))  # Sectors already mapped out stay mapped out
+        sanitizer.pre_wipe_hash = state.get('pre_wipe_hash', 'N/A')
+        sanitizer.pass1_hash = state.get('pass1_hash', 'NOT_STARTED')
+        sanitizer.fused_sweep = state.get('fused_sweep', sanitizer.fused_sweep)  # Tied to the interrupted session, not to --fused
+        if sanitizer.pre_wipe_hash == FUSED_CHAIN_LOST:
+            log.log_event("WARN", "FORENSIC", "Pre-wipe chain lost: the fused sweep was interrupted after its "
+                                              "first write, the original contents are partly overwritten")
+        resume_stage, resume_chunk = state['stage'], state['committed_chunk']
+        if resume_stage > 2:
+            # Both passes landed, only the certificate is missing: re-verify Pass 2 and finish
+            resume_stage, resume_chunk = 2, state['total_chunks']
+        ui.update_status(f"RESUMING PASS {resume_stage} FROM CHUNK {resume_chunk}...")
+        log.log_event("INFO", "RESUME", f"Resuming stage {resume_stage} at chunk {resume_chunk}",
+                      detail=f"Seed fingerprint: {state['seed_fingerprint']} | Hash scheme: {hash_scheme(sanitizer)}")
+
+        # A reboot hands the target back to the OS: take it again before the first write
+        print(f"{ui.yellow}[*] Seizing Hardware Control (Diskpart)...{ui.reset}")
+        if not sanitizer.seize_and_clean():
+            print(f"{ui.red}[!] Failed to seize drive. Check permissions.{ui.reset}")
+            return
+    else:
+        resume_stage, resume_chunk = 1, 0
+        if not apply_scope(sanitizer, args, ui):
+            return
+
+        # 4. QUANTUM HANDSHAKE runs in the background while the surface is hashed
+        seed_reservation = QuantumIngestor.reserve(1)
+
+        # 5. CAPTURE PRE-WIPE STATE (THE REAL FULL HASH)
+        if args.fused:
+            # Hashed chunk by chunk inside Pass 1; the handshake has nothing to overlap with
+            ui.update_status("FORENSIC CHAIN DEFERRED: FUSED HASH + PASS 1 SWEEP")
+            note_fused_chain(log)
+        else:
+            ui.update_status("INITIALIZING FORENSIC CHAIN...", centered=False)
+            # ALIGNMENT: Using the sanitizer's full read, not the hardware's 1MB read
+            pre_wipe = sanitizer.calculate_physical_hash("CAPTURING PRE-WIPE STATE")
+            print("")
+            sanitizer.pre_wipe_hash = pre_wipe
+            print(f"    >>> HASH: {pre_wipe}")
+            log.log_event("INFO", "FORENSIC", f"Initial state hash: {pre_wipe}")
+            log.sync("PRE-WIPE STATE CAPTURED")
+
+        seed = QuantumIngestor.claim(seed_reservation)[0]
+        seed_source = QuantumIngestor.source()
+        log.log_event("INFO", "QUANTUM", f"Root seed generated via {QuantumIngestor.API_URL}: {seed.hex()}",
+                      detail=seed_source)
+
+        # 6. SEIZE HARDWARE
+        print(f"{ui.yellow}[*] Seizing Hardware Control (Diskpart)...{ui.reset}")
+        if not sanitizer.seize_and_clean():
+            print(f"{ui.red}[!] Failed to seize drive. Check permissions.{ui.reset}")
+            return
+        
+        if args.discard:
+            ui.update_status("DISCARD PRE-PASS: RELEASING FLASH MAPPINGS...")
+            discard = sanitizer.discard_surface()
+            if discard:
+                print(f"\n    >>> {discard['method']} in {discard['seconds']:.2f}s")
+        if args.holes:
+            ui.update_status(f"SETTLING IMAGE HOLES ({args.holes.upper()})...")
+            holes = sanitizer.prepare_holes(args.holes)
+            if holes:
+                print(f"    >>> {holes['method']}: {holes['holes']} holes, "
+                      f"{holes['bytes'] / (1024 ** 2):.1f} MB in {holes['seconds']:.2f}s")
+        if args.autotune:
+            ui.update_status("CALIBRATING I/O GEOMETRY...")
+            if sanitizer.calibrate():
+                print(f"    >>> {sanitizer.chunk_size // 1024} KB blocks @ queue depth {sanitizer.queue_depth}")
+        journal.start(seed, target=sanitizer.path, pre_wipe_hash=sanitizer.pre_wipe_hash, seed_source=seed_source,
+                      stage=1, committed_chunk=0, chunk_size=sanitizer.chunk_size,
+                      scope=sanitizer.scope.to_dict() if sanitizer.scope else None, hashing=hash_settings(sanitizer))
 
     # 7. EXECUTION
     total_size = sanitizer.get_drive_size()
     print(f"\n[*] Target Capacity: {total_size / (1024**3):.2f} GB")
+    if sanitizer.scope and not sanitizer.scope.whole_device:
+        print(f"[*] Wipe Scope: {sanitizer.scope}")
 
     # Pass 1
-    ui.update_status("ENGAGING PASS 1: QUANTUM VACUUM FILL...")
-    if sanitizer.execute_wipe(seed, stage=1):
+    pass1_ok = True
+    interleaved = args.interleave and resume_stage == 1 and resume_chunk == 0
+    if interleaved:
+        ui.update_status(f"ENGAGING INTERLEAVED PASSES: {args.interleave} MB REGIONS...")
+        pass1_ok = sanitizer.execute_interleaved(seed, region_bytes=args.interleave * 1024 * 1024)
+        if args.fused and pass1_ok:
+            print(f"    >>> PRE-WIPE HASH: {sanitizer.pre_wipe_hash}")
+    elif resume_stage == 1:
+        ui.update_status("ENGAGING PASS 1: QUANTUM VACUUM FILL...")
+        pass1_ok = sanitizer.execute_wipe(seed, stage=1, start_chunk=resume_chunk)
+        resume_chunk = 0
+        if args.fused and pass1_ok:
+            print(f"    >>> PRE-WIPE HASH: {sanitizer.pre_wipe_hash}")
+    if pass1_ok:
     
         
         # Pass 2
-        ui.update_status("ENGAGING PASS 2: AES-256-CTR (QUANTUM NONCES)...")
-        if sanitizer.execute_wipe(seed, stage=2):
+        if not interleaved:
+            ui.update_status("ENGAGING PASS 2: AES-256-CTR (QUANTUM NONCES)...")
+        if interleaved or sanitizer.execute_wipe(seed, stage=2, start_chunk=resume_chunk):
             
             # 8. FINAL AUDIT TABLE
             hashes = {
@@ -83,11 +412,13 @@ def main():
                 'FINAL': sanitizer.final_hash
             }
             
-            print(f"\n\n{ui.bold}PHYSICAL DATA EVOLUTION (SHA-256 CHAIN){ui.reset}")
+            print(f"\n\n{ui.bold}PHYSICAL DATA EVOLUTION ({hash_scheme(sanitizer)} CHAIN){ui.reset}")
             print(f"{ui.dim}———————————————————————————————————————————————————————————————————————————{ui.reset}")
             print(f"{ui.cyan}PRE-WIPE (ORIGINAL)       {ui.reset}| {hashes['PRE-WIPE']}")
             print(f"{ui.cyan}POST-PASS 1 (QUANTUM)     {ui.reset}| {hashes['PASS_1']}")
             print(f"{ui.cyan}POST-PASS 2 (FINAL)       {ui.reset}| {hashes['FINAL']}")
+            if sanitizer.bad_blocks:
+                print(f"{ui.yellow}BAD BLOCKS (MAPPED OUT)   {ui.reset}| {sanitizer.bad_blocks}")
             print(f"{ui.dim}———————————————————————————————————————————————————————————————————————————{ui.reset}")
             
             hashes = {
@@ -95,17 +426,33 @@ def main():
                 'PASS_1': sanitizer.pass1_hash,
                 'FINAL': sanitizer.final_hash
             }
-            log.finalize_certificate(hashes, avg_entropy)
-            # Deep Sector Interrogation
+            # Deep Sector Interrogation (feeds the certificate, so it runs first)
             print(f"\n{ui.cyan}[*] STARTING DEEP SECTOR INTERROGATION...{ui.reset}")
-            avg_entropy = sanitizer.verify_random_sectors(sample_count=20)
+            try:
+                avg_entropy = sanitizer.verify_random_sectors(sample_count=20)
+                ui.update_status("RUNNING NIST SP 800-22 AUDIT BATTERY...")
+                stat_audit = sanitizer.audit_random_sectors(sample_count=args.audit_samples)
+            except BadBlockBudgetExceeded as e:
+                # Failed under the audit itself: no certificate for a drive that can't be read back
+                log.log_event("CRITICAL", "STAT_AUDIT", f"Post-wipe audit aborted: {e}")
+                print(f"{ui.red}[!] Drive failing during the post-wipe audit: {e}. No certificate issued.{ui.reset}")
+                return
+            if stat_audit:
+                print(f"    >>> {stat_audit['sampled']} blocks | VERDICT: {'PASS' if stat_audit['passed'] else 'FAIL'}")
+            log.finalize_certificate(hashes, avg_entropy, stat_audit=stat_audit, hash_scheme=hash_scheme(sanitizer),
+                                     scope=sanitizer.scope, bad_blocks=sanitizer.bad_blocks, seed_source=seed_source)
+            journal.clear()
             
             # 9. COMPLETION
-            print(f"\n{ui.yellow}[?] SANITIZATION COMPLETE. End-state selection:{ui.reset}")
-            print(" [1] LEAVE AS GHOST (Uninitialized/RAW - Recommended for Forensics)")
-            print(" [2] RE-INITIALIZE (GPT/NTFS - Ready for OS)")
-            
-            choice = input(f"{ui.bold}>> Selection [1/2]: {ui.reset}")
+            choice = "1"  # Re-initialization is a diskpart script: Windows only
+            # Scoped wipes leave the rest of the disk (and its partition table) in service
+            scoped = sanitizer.scope is not None and not sanitizer.scope.whole_device
+            if sys.platform == "win32" and not scoped:
+                print(f"\n{ui.yellow}[?] SANITIZATION COMPLETE. End-state selection:{ui.reset}")
+                print(" [1] LEAVE AS GHOST (Uninitialized/RAW - Recommended for Forensics)")
+                print(" [2] RE-INITIALIZE (GPT/NTFS - Ready for OS)")
+                
+                choice = input(f"{ui.bold}>> Selection [1/2]: {ui.reset}")
             if choice == "2":
                 print(f"\n{ui.cyan}{ui.bold}[*] INITIATING HARDWARE RECONSTRUCTION PROTOCOL...{ui.reset}")
                 
@@ -134,6 +481,8 @@ def main():
 
                 print(f"\n{ui.cyan}{ui.bold}[+] RECONSTRUCTION COMPLETE: Volume is now visible in Windows Explorer.{ui.reset}")
                 
+            elif scoped:
+                print(f"\n{ui.yellow}[*] Scope left in RAW Quantum state; the rest of the drive is untouched.{ui.reset}")
             else:
                 print(f"\n{ui.yellow}[*] Drive left in RAW Quantum state (Uninitialized).{ui.reset}")
                 
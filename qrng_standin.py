@@ -0,0 +1,71 @@
+"""
+Local stand-in for the ANU QRNG jsonI endpoint, for exercising the handshake offline.
+Bytes come from os.urandom: NOT a quantum source - never use it for a real wipe.
+
+    python qrng_standin.py --port 8765 --latency 0.5 --fail-every 3
+    set QSSP_QRNG_URL=http://127.0.0.1:8765/API/jsonI.php   (or: main.py --qrng-url ...)
+"""
+import argparse
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    latency = 0.0
+    fail_every = 0  # Every Nth request answers 503 (retry path)
+    requests_served = 0
+    _lock = threading.Lock()
+
+    def do_GET(self):
+        cls = type(self)
+        with cls._lock:
+            cls.requests_served += 1
+            count = cls.requests_served
+        time.sleep(cls.latency)
+
+        query = parse_qs(urlparse(self.path).query)
+        length = int(query.get("length", ["1"])[0])
+        if cls.fail_every and count % cls.fail_every == 0:
+            return self._reply(503, {"success": False})
+        if not 1 <= length <= 1024:
+            return self._reply(200, {"success": False, "error": "length must be 1-1024"})
+        self._reply(200, {"type": "uint8", "length": length, "data": list(os.urandom(length)), "success": True})
+
+    def _reply(self, status, body):
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, fmt, *args):
+        pass
+
+
+def serve(port=8765, latency=0.0, fail_every=0):
+    """Starts the stand-in on a daemon thread and returns the server (call shutdown() when done)."""
+    StandInHandler.latency = latency
+    StandInHandler.fail_every = fail_every
+    server = ThreadingHTTPServer(("127.0.0.1", port), StandInHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local stand-in QRNG server (ANU jsonI format, NOT quantum)")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds of delay per request")
+    parser.add_argument("--fail-every", type=int, default=0, help="Answer every Nth request with HTTP 503")
+    args = parser.parse_args()
+    server = serve(args.port, args.latency, args.fail_every)
+    print(f"[*] Stand-in QRNG on http://127.0.0.1:{args.port}/API/jsonI.php (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,25 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from logger import MemoryLogger  # noqa: E402
+from ui import QuietUI  # noqa: E402
+
+
+@pytest.fixture
+def make_sanitizer(tmp_path):
+    """QSSPSanitizer on an image path with a silent UI and an in-memory audit log."""
+    from core.sanitizer import QSSPSanitizer
+
+    def make(path, chunk_size=1024 * 1024, device=None):
+        s = QSSPSanitizer(str(path), QuietUI(), MemoryLogger(tmp_path, "TEST"))
+        if device is not None:
+            s.device = device
+        s.chunk_size = chunk_size
+        s.workers = 2
+        s.keystream_executor = "thread"  # Process pools are slow to spin up for a few MB
+        return s
+    return make
@@ -0,0 +1,141 @@
+import errno
+import os
+import threading
+
+import pytest
+
+from core.badblocks import BadBlockBudgetExceeded, BadBlockMap, bisect_io, is_media_error
+from core.device import ImageFile
+from core.engine import CSEE
+from core.pio import PositionalIO
+
+SEED = b"QUANTUM_ROOT_TEST_0000000000000001"
+SECTOR = 512
+
+
+class FaultyIO(PositionalIO):
+    """PositionalIO whose raw primitives fail with EIO on a fixed set of sectors."""
+    def __init__(self, path, bad_sectors, **kwargs):
+        super().__init__(path, **kwargs)
+        self.bad_sectors = bad_sectors
+
+    def _hits(self, offset, size):
+        return any(offset // SECTOR <= s < -(-(offset + size) // SECTOR) for s in self.bad_sectors)
+
+    def _pwrite(self, offset, data):
+        if self._hits(offset, len(memoryview(data))):
+            raise OSError(errno.EIO, "Input/output error")
+        return super()._pwrite(offset, data)
+
+    def _pread(self, offset, size):
+        if self._hits(offset, size):
+            raise OSError(errno.EIO, "Input/output error")
+        return super()._pread(offset, size)
+
+
+class FaultyImage(ImageFile):
+    def __init__(self, path, bad_sectors):
+        super().__init__(path)
+        self.bad_sectors = bad_sectors
+
+    def open(self, writable=False, queue_depth=8, direct=False, access="sequential", bad_blocks=None):
+        return FaultyIO(self.path, self.bad_sectors, writable=writable, queue_depth=queue_depth,
+                        direct=direct, bad_blocks=bad_blocks)
+
+
+def test_runs_merge_per_kind_and_sectors_count_once():
+    bad = BadBlockMap(SECTOR)
+    bad.add("unwritable", 10 * SECTOR, SECTOR)
+    bad.add("unwritable", 11 * SECTOR, 2 * SECTOR)   # Adjacent: extends the run
+    bad.add("unwritable", 12 * SECTOR + 100, 10)     # Inside: no change
+    bad.add("unwritable", 20 * SECTOR, SECTOR)
+    bad.add("unreadable", 12 * SECTOR, 2 * SECTOR)   # Sector 12 is in both kinds
+    assert bad.to_dict() == {"sector_size": SECTOR, "unwritable": [[10, 3], [20, 1]], "unreadable": [[12, 2]]}
+    assert bad.sectors == 5
+    assert bad.overlapping(11 * SECTOR, 4 * SECTOR) == [(0, 2 * SECTOR), (SECTOR, 3 * SECTOR)]
+    assert str(bad).startswith("5 SECTORS")
+
+
+def test_limit_aborts_the_pass():
+    bad = BadBlockMap(SECTOR, max_sectors=4)
+    bad.add("unwritable", 0, 4 * SECTOR)
+    with pytest.raises(BadBlockBudgetExceeded):
+        bad.add("unreadable", 8 * SECTOR, SECTOR)
+
+
+def test_merge_rescales_a_snapshot_from_another_sector_size():
+    snapshot = BadBlockMap(4096)
+    snapshot.add("unreadable", 4096, 4096)
+    bad = BadBlockMap(SECTOR)
+    bad.merge(snapshot.to_dict())
+    assert bad.to_dict()["unreadable"] == [[8, 8]]
+
+
+def test_bisect_narrows_down_to_the_failing_sectors():
+    failing = {5, 6, 40}
+    calls = []
+
+    def op(offset, size):
+        calls.append((offset, size))
+        if any(offset // SECTOR <= s < (offset + size) // SECTOR for s in failing):
+            raise OSError(errno.EIO, "Input/output error")
+    assert sorted(bisect_io(op, 0, 64 * SECTOR, SECTOR, retries=1)) == [(s * SECTOR, SECTOR) for s in sorted(failing)]
+    assert len(calls) < 64  # Halving, not a sector-by-sector scan
+
+
+def test_bisect_reraises_errors_that_are_not_media_errors():
+    def op(offset, size):
+        raise OSError(errno.ENOSPC, "No space left on device")
+    with pytest.raises(OSError):
+        bisect_io(op, 0, 8 * SECTOR, SECTOR)
+
+
+def test_positional_io_maps_out_failing_sectors(tmp_path):
+    path = tmp_path / "disk.img"
+    path.write_bytes(bytes(64 * SECTOR))
+    bad = BadBlockMap(SECTOR)
+    with FaultyIO(str(path), {9}, writable=True, bad_blocks=bad) as drive:
+        assert drive.pwrite(0, b"\xff" * (16 * SECTOR)) == 16 * SECTOR
+        data = drive.pread(0, 16 * SECTOR)
+    assert data == b"\xff" * (9 * SECTOR) + bytes(SECTOR) + b"\xff" * (6 * SECTOR)
+    assert bad.to_dict()["unwritable"] == [[9, 1]]
+    assert bad.to_dict()["unreadable"] == [[9, 1]]
+
+    with FaultyIO(str(path), {9}, writable=True) as drive:  # No map: the error surfaces as before
+        with pytest.raises(OSError):
+            drive.pwrite(8 * SECTOR, bytes(2 * SECTOR))
+
+
+def test_wipe_completes_around_bad_sectors(tmp_path, make_sanitizer):
+    path = tmp_path / "disk.img"
+    path.write_bytes(os.urandom(4 * 1024 * 1024))
+    s = make_sanitizer(path, device=FaultyImage(str(path), {3000, 3001, 6000}))
+    assert s.execute_wipe(SEED, stage=1)
+    assert s.bad_blocks.to_dict()["unwritable"] == [[3000, 2], [6000, 1]]
+    written = bytearray(path.read_bytes())
+    expected = bytearray(CSEE(SEED, s.chunk_size).read_at(0, len(written)))
+    for start, length in s.bad_blocks.extents():
+        written[start:start + length] = expected[start:start + length] = bytes(length)
+    assert written == expected  # Everything around the mapped-out sectors got Pass 1
+
+
+def test_too_many_bad_sectors_fail_the_pass_and_return_the_memory_budget(tmp_path, make_sanitizer):
+    path = tmp_path / "disk.img"
+    path.write_bytes(os.urandom(4 * 1024 * 1024))
+    s = make_sanitizer(path, device=FaultyImage(str(path), set(range(2000, 2100))))
+    s.bad_blocks.max_sectors = 50
+    s.memory_budget = threading.BoundedSemaphore(6)
+    assert not s.execute_wipe(SEED, stage=1)
+    assert all(s.memory_budget.acquire(blocking=False) for _ in range(6))  # Every token came back
+
+
+def test_budget_abort_is_not_swallowed_by_tolerant_reads(tmp_path):
+    path = tmp_path / "disk.img"
+    path.write_bytes(bytes(64 * SECTOR))
+    bad = BadBlockMap(SECTOR, max_sectors=1)
+    with FaultyIO(str(path), {3, 20}, bad_blocks=bad) as drive:
+        stream = drive.read_stream([(0, 8 * SECTOR), (16 * SECTOR, 8 * SECTOR)], raise_errors=False)
+        assert next(stream)[1] == bytes(8 * SECTOR)  # First bad sector: mapped out, read goes on
+        with pytest.raises(BadBlockBudgetExceeded) as raised:
+            next(stream)
+    assert not is_media_error(raised.value)
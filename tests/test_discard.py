@@ -0,0 +1,40 @@
+import errno
+import fcntl
+
+import pytest
+
+from core.device import BLKDISCARD, BLKZEROOUT, LinuxBlockDevice
+
+
+def _ioctl(answers, calls):
+    """fcntl.ioctl stand-in: answers[code] is an errno to fail with, or missing to succeed."""
+    def ioctl(fd, code, arg):
+        calls.append(code)
+        if code in answers:
+            raise OSError(answers[code], "refused")
+    return ioctl
+
+
+def test_unsupported_discard_falls_back_to_zeroout_for_good(monkeypatch):
+    calls = []
+    monkeypatch.setattr(fcntl, "ioctl", _ioctl({BLKDISCARD: errno.EOPNOTSUPP}, calls))
+    device = LinuxBlockDevice("/dev/null")
+    assert device.discard(0, 0, 4096) == "BLKZEROOUT"
+    assert device.discard(0, 4096, 4096) == "BLKZEROOUT"
+    assert calls == [BLKDISCARD, BLKZEROOUT, BLKZEROOUT]  # Not asked again
+
+
+def test_a_refused_range_does_not_blacklist_the_ioctl(monkeypatch):
+    calls = []
+    monkeypatch.setattr(fcntl, "ioctl", _ioctl({BLKDISCARD: errno.EINVAL}, calls))
+    device = LinuxBlockDevice("/dev/null")
+    assert device.discard(0, 100, 4096) == "BLKZEROOUT"
+    monkeypatch.setattr(fcntl, "ioctl", _ioctl({}, calls))
+    assert device.discard(0, 4096, 4096) == "BLKDISCARD"  # Still tried for the next range
+
+
+def test_a_range_every_method_refuses_is_reported(monkeypatch):
+    monkeypatch.setattr(fcntl, "ioctl", _ioctl({BLKDISCARD: errno.EINVAL, BLKZEROOUT: errno.EINVAL}, []))
+    with pytest.raises(OSError) as raised:
+        LinuxBlockDevice("/dev/null").discard(0, 100, 4096)
+    assert raised.value.errno == errno.EINVAL
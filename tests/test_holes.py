@@ -0,0 +1,97 @@
+import os
+import sys
+
+import pytest
+
+import main
+from core.device import ImageFile
+from core.pio import MappedIO
+from core.scope import WipeScope
+
+SEED = b"QUANTUM_ROOT_TEST_0000000000000001"
+MB = 1024 * 1024
+
+
+def _sparse(path, size=8 * MB):
+    """Sparse image: data at 1 MB (1 MB long) and 5 MB (4 KB long), holes everywhere else."""
+    content = bytearray(size)
+    content[MB:2 * MB] = os.urandom(MB)
+    content[5 * MB:5 * MB + 4096] = os.urandom(4096)
+    with open(path, "wb") as f:
+        f.truncate(size)
+        for offset, length in ((MB, MB), (5 * MB, 4096)):
+            f.seek(offset)
+            f.write(content[offset:offset + length])
+    return bytes(content)  # Not read back: cached pages over a hole make ext4 report it as data
+
+
+def _allocated_bytes(path):
+    return os.stat(path).st_blocks * 512
+
+
+@pytest.mark.parametrize("argv", [["--holes", "punch", "--autotune"], ["--holes", "allocate", "--scope", "allocated"]])
+def test_holes_conflicts_are_rejected(monkeypatch, argv):
+    monkeypatch.setattr(sys, "argv", ["main.py"] + argv)
+    with pytest.raises(SystemExit):
+        main.parse_args()
+
+
+def test_holes_allocate_with_autotune_is_allowed(monkeypatch):
+    monkeypatch.setattr(sys, "argv", ["main.py", "--holes", "allocate", "--autotune"])
+    assert main.parse_args().holes == "allocate"
+
+
+@pytest.mark.skipif(not hasattr(os, "SEEK_DATA"), reason="needs SEEK_DATA/SEEK_HOLE")
+def test_punch_returns_preallocated_blocks_and_the_passes_skip_the_holes(tmp_path, make_sanitizer):
+    path = tmp_path / "sparse.img"
+    original = _sparse(path)
+    with open(path, "r+b") as f:
+        os.posix_fallocate(f.fileno(), 3 * MB, MB)  # Preallocated, never written: still a hole to SEEK_DATA
+    before = _allocated_bytes(path)
+
+    s = make_sanitizer(path)
+    report = s.prepare_holes("punch")
+    assert report and report["holes"] == 3
+    assert _allocated_bytes(path) < before
+
+    s.scope = WipeScope.parse("allocated", s.device)
+    assert s.scope.extents == [(MB, MB), (5 * MB, 4096)]
+    assert s.execute_wipe(SEED, stage=1)
+    wiped = path.read_bytes()
+    assert wiped[:MB] == bytes(MB) and wiped[2 * MB:5 * MB] == bytes(3 * MB)
+    assert wiped[MB:2 * MB] != original[MB:2 * MB]
+    assert _allocated_bytes(path) <= 2 * MB  # Writing the data extents allocated nothing new
+
+
+@pytest.mark.skipif(not hasattr(os, "posix_fallocate"), reason="needs posix_fallocate")
+def test_allocate_backs_every_hole(tmp_path, make_sanitizer):
+    path = tmp_path / "sparse.img"
+    _sparse(path)
+    report = make_sanitizer(path).prepare_holes("allocate")
+    assert report["method"] == "FALLOCATE"
+    assert _allocated_bytes(path) >= 8 * MB
+
+
+def test_image_reads_are_views_of_the_mapping(tmp_path):
+    path = tmp_path / "disk.img"
+    content = os.urandom(MB)
+    path.write_bytes(content)
+    drive = ImageFile(str(path)).open(writable=True)
+    assert isinstance(drive, MappedIO)
+    view = drive.pread(4096, 100)
+    assert isinstance(view, memoryview) and view == content[4096:4196]
+    assert len(drive.pread(MB - 10, 100)) == 10  # Short at EOF
+
+    drive.pwrite(0, b"\xff" * 4096)
+    assert drive.pread(0, 4096) == b"\xff" * 4096  # Positional writes show through the shared mapping
+    assert [(offset, bytes(data)) for offset, data in drive.read_stream([(0, 2), (MB - 2, 2)])] == \
+        [(0, b"\xff\xff"), (MB - 2, content[-2:])]
+    drive.close()  # Tolerates the view still held above
+    assert view == content[4096:4196]
+
+
+def test_empty_and_direct_images_fall_back_to_plain_positional_io(tmp_path):
+    path = tmp_path / "empty.img"
+    path.write_bytes(b"")
+    with ImageFile(str(path)).open() as drive:
+        assert not isinstance(drive, MappedIO)
@@ -0,0 +1,57 @@
+import pytest
+
+import qrng_standin
+from core import ingestor
+from core.ingestor import QuantumIngestor, QuantumLinkError
+from logger import QLogger
+
+
+@pytest.fixture
+def standin(monkeypatch):
+    """Local stand-in QRNG; QuantumIngestor points at it for the test only."""
+    qrng_standin.StandInHandler.requests_served = 0
+    server = qrng_standin.serve(port=0)
+    monkeypatch.setattr(QuantumIngestor, "API_URL", f"http://127.0.0.1:{server.server_address[1]}/API/jsonI.php")
+    monkeypatch.setattr(ingestor.time, "sleep", lambda seconds: None)  # Retries without the back-off
+    yield server
+    server.shutdown()
+    qrng_standin.StandInHandler.fail_every = 0
+
+
+def test_reserve_and_claim_hand_out_distinct_seeds(standin):
+    seeds = QuantumIngestor.claim(QuantumIngestor.reserve(40))  # Spans two batched requests
+    assert len(seeds) == 40
+    assert len(set(seeds)) == 40
+    assert all(len(seed) == QuantumIngestor.SEED_BYTES for seed in seeds)
+
+
+def test_failed_requests_are_retried(standin):
+    qrng_standin.StandInHandler.fail_every = 2  # The second batch's first attempt answers 503
+    assert len(QuantumIngestor.fetch_seeds(40, quiet=True)) == 40
+    assert qrng_standin.StandInHandler.requests_served == 3
+
+
+def test_a_source_repeating_itself_fails_the_handshake(monkeypatch):
+    monkeypatch.setattr(QuantumIngestor, "fetch_bytes", classmethod(lambda cls, length, quiet=False: bytes(length)))
+    with pytest.raises(QuantumLinkError):
+        QuantumIngestor.fetch_seeds(2, quiet=True)
+
+
+def test_only_the_anu_endpoint_is_certified(standin, tmp_path):
+    assert not QuantumIngestor.verified()
+    assert "UNVERIFIED" in QuantumIngestor.source() and QuantumIngestor.API_URL in QuantumIngestor.source()
+
+    log = QLogger(str(tmp_path))
+    log.finalize_certificate({"PRE-WIPE": "a", "PASS_1": "b", "FINAL": "c"}, 7.99,
+                             seed_source=QuantumIngestor.source())
+    log.close()
+    with open(log.log_file, encoding="utf-8") as f:
+        certificate = f.read()
+    assert f"QUANTUM ROOT: {QuantumIngestor.source()}" in certificate
+    assert "ANU VACUUM SOURCE" not in certificate
+
+
+def test_anu_endpoint_reports_verified(monkeypatch):
+    monkeypatch.setattr(QuantumIngestor, "API_URL", QuantumIngestor.ANU_URL)
+    assert QuantumIngestor.verified()
+    assert QuantumIngestor.source() == "VERIFIED (ANU VACUUM SOURCE)"
@@ -0,0 +1,28 @@
+import os
+
+import pytest
+
+SEED = b"QUANTUM_ROOT_TEST_0000000000000001"
+
+
+@pytest.mark.parametrize("hash_mode", ["linear", "merkle"])
+def test_interleaved_passes_match_separate_passes(tmp_path, make_sanitizer, hash_mode):
+    path = tmp_path / "disk.img"
+    content = os.urandom(6 * 1024 * 1024 + 3000)  # Partial tail chunk included
+
+    def fresh():
+        path.write_bytes(content)
+        s = make_sanitizer(path)
+        s.hash_mode, s.merkle_region = hash_mode, 2 * 1024 * 1024
+        return s
+
+    separate = fresh()
+    pre_wipe = separate.calculate_physical_hash("PRE-WIPE")
+    assert separate.execute_wipe(SEED, stage=1) and separate.execute_wipe(SEED, stage=2)
+
+    interleaved = fresh()
+    interleaved.fused_sweep = True
+    assert interleaved.execute_interleaved(SEED, region_bytes=2 * 1024 * 1024)
+    assert interleaved.pre_wipe_hash == pre_wipe
+    assert interleaved.pass1_hash == separate.pass1_hash
+    assert interleaved.final_hash == separate.final_hash
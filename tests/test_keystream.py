@@ -0,0 +1,80 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from core import sanitizer
+from core.engine import AESCTRStream, CSEE
+from core.scope import WipeScope
+
+SEED = b"QUANTUM_ROOT_TEST_0000000000000001"
+CHUNK = 4096
+
+
+def _serial(chunks, chunk_size=CHUNK):
+    stream = CSEE(SEED).get_stream(chunk_size)
+    return b"".join(next(stream) for _ in range(chunks))
+
+
+def test_parallel_keystream_matches_serial():
+    stream = CSEE(SEED).get_stream(CHUNK, workers=3, executor="thread")
+    try:
+        parallel = b"".join(next(stream) for _ in range(12))
+    finally:
+        stream.close()
+    assert parallel == _serial(12)
+
+
+@pytest.mark.parametrize("offset, length", [(0, CHUNK), (100, 50), (CHUNK - 7, 3 * CHUNK + 9), (5 * CHUNK, 1)])
+def test_pass1_fill_at_matches_sequential_output(offset, length):
+    assert CSEE(SEED, CHUNK).read_at(offset, length) == _serial(8)[offset:offset + length]
+
+
+@pytest.mark.parametrize("nonce_mode", ["stream", "per_chunk"])
+def test_pass2_fill_at_matches_sequential_output(nonce_mode):
+    engine = AESCTRStream(SEED, CHUNK, nonce_mode=nonce_mode)
+    buf = bytearray(CHUNK)
+    sequential = b""
+    for _ in range(6):
+        engine.fill_next(buf)
+        sequential += bytes(buf)
+    random_access = AESCTRStream(SEED, CHUNK, nonce_mode=nonce_mode)
+    for offset, length in ((0, CHUNK), (CHUNK - 3, CHUNK + 10), (4 * CHUNK + 1, 2 * CHUNK - 1)):
+        assert random_access.read_at(offset, length) == sequential[offset:offset + length]
+
+
+def test_pass1_reuses_one_pool_and_one_stream_per_extent(tmp_path, make_sanitizer, monkeypatch):
+    pools, streams = [], []
+
+    class CountingPool(ThreadPoolExecutor):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            pools.append(self)
+
+    real_get_stream = CSEE.get_stream
+
+    def get_stream(engine, *args, **kwargs):
+        streams.append(engine.counter)
+        return real_get_stream(engine, *args, **kwargs)
+
+    monkeypatch.setattr(sanitizer, "ThreadPoolExecutor", CountingPool)
+    monkeypatch.setattr(CSEE, "get_stream", get_stream)
+
+    chunk = 64 * 1024
+    path = tmp_path / "disk.img"
+    original = os.urandom(64 * chunk)
+    path.write_bytes(original)
+    s = make_sanitizer(path, chunk_size=chunk)
+    # Extents with partial pieces at both edges, one of them sharing a cell with the next extent
+    extents = [(chunk // 2, 5 * chunk), (6 * chunk - 100, 50), (20 * chunk + 512, 7 * chunk)]
+    s.scope = WipeScope(extents, "TEST", len(original))
+    assert s.execute_wipe(SEED, stage=1)
+
+    assert len(pools) == 1
+    assert len(streams) == 3  # One per discontinuity: edge pieces ride the running stream
+    wiped = path.read_bytes()
+    engine = CSEE(SEED, chunk)
+    for offset, length in extents:
+        assert wiped[offset:offset + length] == engine.read_at(offset, length)
+    assert wiped[:chunk // 2] == original[:chunk // 2]
+    assert wiped[27 * chunk + 512:] == original[27 * chunk + 512:]
@@ -0,0 +1,52 @@
+import json
+import os
+import threading
+
+import pytest
+
+from logger import QLogger
+
+
+def _records(log):
+    with open(log.jsonl_file, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_sync_makes_every_event_visible_in_order(tmp_path):
+    log = QLogger(str(tmp_path))
+    for i in range(500):
+        log.log_event("INFO", "TEST", f"event {i}", detail="d" if i % 2 else None)
+    log.sync("DONE")
+    records = _records(log)
+    assert [r["message"] for r in records] == [f"event {i}" for i in range(500)] + ["DONE"]
+    with open(log.log_file, encoding="utf-8") as f:
+        text = f.read()
+    assert "[INFO] [TEST] event 499" in text and "DETAIL: d" in text
+    log.close()
+    log.close()  # Idempotent (also runs at exit)
+    log.log_event("INFO", "TEST", "after close")  # Dropped, never raised
+
+
+def test_concurrent_writers_lose_nothing(tmp_path):
+    log = QLogger(str(tmp_path), queue_size=16)  # Small queue: writers get back-pressured
+    threads = [threading.Thread(target=lambda t=t: [log.log_event("INFO", f"T{t}", str(i)) for i in range(200)])
+               for t in range(4)]
+    for thread in threads: thread.start()
+    for thread in threads: thread.join()
+    log.close()
+    records = _records(log)
+    assert len(records) == 800
+    for t in range(4):
+        assert [r["message"] for r in records if r["module"] == f"T{t}"] == [str(i) for i in range(200)]
+
+
+@pytest.mark.skipif(not os.path.exists("/dev/full"), reason="needs /dev/full")
+def test_a_full_log_volume_never_wedges_the_caller(tmp_path, capsys):
+    log = QLogger(str(tmp_path))
+    log._text = open("/dev/full", "w", encoding="utf-8")
+    for i in range(3):
+        log.log_event("INFO", "TEST", "x" * 10000)
+        log.sync()  # Returns although the sink is failing
+    log.close()
+    assert capsys.readouterr().err.count("AUDIT LOG WRITE FAILED") == 1  # Once per outage
+    assert len(_records(log)) == 3  # The healthy sink kept everything
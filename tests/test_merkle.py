@@ -0,0 +1,60 @@
+import hashlib
+import os
+
+import pytest
+
+from core.merkle import LEAF_PREFIX, MerkleTree, new_hasher
+
+MB = 1024 * 1024
+
+
+def _leaves(count):
+    return [hashlib.sha256(LEAF_PREFIX + bytes([i])).digest() for i in range(count)]
+
+
+@pytest.mark.parametrize("count", [1, 2, 5, 8, 13])
+def test_every_leaf_proves_against_the_root(count):
+    tree = MerkleTree(_leaves(count))
+    for i, leaf in enumerate(tree.leaves):
+        assert MerkleTree.verify_proof(leaf, tree.proof(i), tree.root)
+    assert not MerkleTree.verify_proof(_leaves(count + 1)[-1], tree.proof(0), tree.root)
+
+
+def test_algorithms_give_different_roots_and_unknown_ones_are_rejected():
+    assert MerkleTree(_leaves(4), "sha256").root != MerkleTree(_leaves(4), "blake2b").root
+    with pytest.raises(ValueError):
+        new_hasher("md5")
+
+
+def test_sidecar_round_trip_and_tamper_check(tmp_path):
+    path = str(tmp_path / "tree.json")
+    MerkleTree(_leaves(5), "blake2b", region_size=MB, total_bytes=5 * MB).save(path, label="PASS 1")
+    tree = MerkleTree.load(path)
+    assert tree.algorithm == "blake2b" and tree.fields == {"label": "PASS 1"}
+    assert tree.root == MerkleTree(_leaves(5), "blake2b").root
+
+    with open(path, encoding="utf-8") as f:
+        tampered = f.read().replace(_leaves(5)[2].hex(), _leaves(6)[5].hex())
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(tampered)
+    with pytest.raises(ValueError):
+        MerkleTree.load(path)
+
+
+def test_surface_root_is_the_tree_of_region_digests(tmp_path, make_sanitizer):
+    path = tmp_path / "disk.img"
+    content = os.urandom(5 * MB + 1000)  # Last region is short
+    path.write_bytes(content)
+    s = make_sanitizer(path)
+    s.hash_mode, s.hash_algorithm, s.merkle_region = "merkle", "blake2b", 2 * MB
+    root = s.calculate_physical_hash("PRE-WIPE")
+
+    leaves = []
+    for start in range(0, len(content), 2 * MB):
+        h = new_hasher("blake2b")
+        h.update(LEAF_PREFIX + content[start:start + 2 * MB])
+        leaves.append(h.digest())
+    assert root == MerkleTree(leaves, "blake2b").root_hex()
+
+    tree, sidecar = s.merkle_trees["PRE-WIPE"]
+    assert s.verify_merkle_region(sidecar, 1)[0]
@@ -0,0 +1,42 @@
+import pytest
+
+from core.buffers import BufferRing
+from core.orchestrator import WipeOrchestrator
+from logger import MemoryLogger
+from ui import QuietUI
+
+MB = 1024 * 1024
+
+
+def _rack(tmp_path, make_sanitizer, drives, budget_mb, producer_workers=None):
+    sanitizers = []
+    for i in range(drives):
+        path = tmp_path / f"disk{i}.img"
+        path.write_bytes(bytes(MB))
+        sanitizers.append(make_sanitizer(path))
+    return WipeOrchestrator(sanitizers, QuietUI(), MemoryLogger(tmp_path), producer_workers=producer_workers,
+                            memory_budget=budget_mb * MB)
+
+
+def test_chunk_slots_and_prefetch_stay_inside_the_budget(tmp_path, make_sanitizer):
+    rack = _rack(tmp_path, make_sanitizer, drives=4, budget_mb=16, producer_workers=16)
+    per_drive_workers, tokens = rack._plan()
+    assert per_drive_workers == 1  # Narrowed from 4 so the writers still get slots
+    assert tokens + 4 * per_drive_workers * 2 <= 16
+    assert tokens >= 4
+
+
+def test_a_budget_too_small_for_the_rack_is_rejected(tmp_path, make_sanitizer):
+    with pytest.raises(ValueError):
+        _rack(tmp_path, make_sanitizer, drives=4, budget_mb=8)
+
+
+def test_released_slots_come_back_zeroed():
+    ring = BufferRing(2, 64 * 1024)
+    buf = ring.acquire()
+    buf[:] = b"\xa5" * len(buf)
+    ring.release(buf)
+    slots = [ring.acquire(), ring.acquire()]
+    assert any(slot is buf for slot in slots)
+    assert all(not any(slot) for slot in slots)
+    ring.close()
@@ -0,0 +1,53 @@
+import glob
+import os
+import subprocess
+import sys
+
+from core.journal import WipeJournal
+from core.scope import WipeScope
+
+SEED = b"QUANTUM_ROOT_TEST_0000000000000001"
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MB = 1024 * 1024
+
+
+def test_journal_round_trips_and_rejects_a_tampered_seed(tmp_path):
+    journal = WipeJournal(str(tmp_path), "/dev/sdb")
+    journal.start(SEED, stage=1, committed_chunk=0, hashing={"hash_mode": "merkle"})
+    journal.checkpoint(committed_chunk=7)
+    state = WipeJournal(str(tmp_path), "/dev/sdb").load()
+    assert state["committed_chunk"] == 7 and state["hashing"] == {"hash_mode": "merkle"}
+    assert bytes.fromhex(state["seed"]) == SEED
+
+    journal.state["seed"] = bytes(len(SEED)).hex()
+    journal.checkpoint()
+    assert WipeJournal(str(tmp_path), "/dev/sdb").load() is None
+
+
+def test_resume_keeps_the_journaled_scope_and_hash_scheme(tmp_path):
+    image = tmp_path / "disk.img"
+    original = os.urandom(8 * MB)
+    image.write_bytes(original)
+    scope = WipeScope([(2 * MB, 3 * MB)], "LBA 4096+6144", len(original))
+
+    # What a session started with --scope and --hash-mode merkle leaves behind if it dies before its first checkpoint
+    journal = WipeJournal(str(tmp_path / "audit_logs"), str(image))
+    os.makedirs(tmp_path / "audit_logs")
+    journal.start(SEED, target=str(image), pre_wipe_hash="PRE", seed_source="UNVERIFIED (TEST)",
+                  stage=1, committed_chunk=0, chunk_size=MB, scope=scope.to_dict(),
+                  hashing={"hash_mode": "merkle", "hash_algorithm": "blake2b", "merkle_region": 2 * MB})
+
+    # The command line now asks for something else: the journal wins
+    run = subprocess.run([sys.executable, os.path.join(ROOT, "main.py"), "--target", str(image), "--resume",
+                          "--hash-mode", "linear", "--audit-samples", "16"],
+                         input="y\n", capture_output=True, text=True, cwd=tmp_path, timeout=300)
+    assert "PROCEED WITH RESUMED SCOPED SANITIZATION (LBA 4096+6144)" in run.stdout
+    assert "Seizing Hardware Control" in run.stdout
+    assert not os.path.exists(journal.path)  # Finished
+
+    wiped = image.read_bytes()
+    assert wiped[:2 * MB] == original[:2 * MB] and wiped[5 * MB:] == original[5 * MB:]
+    assert wiped[2 * MB:5 * MB] != original[2 * MB:5 * MB]
+    certificate = open(glob.glob(str(tmp_path / "audit_logs" / "QSSP_AUDIT_*.log"))[0], encoding="utf-8").read()
+    assert "MERKLE" in certificate and "BLAKE2B" in certificate and "(2 MB" in certificate
+    assert "QUANTUM ROOT: UNVERIFIED (TEST)" in certificate
@@ -0,0 +1,49 @@
+import os
+import random
+
+from core.sampling import SamplingPlanner
+
+SEED = b"QUANTUM_ROOT_TEST_0000000000000001"
+MB = 1024 * 1024
+
+
+def test_plan_is_sorted_aligned_and_one_block_per_zone():
+    planner = SamplingPlanner(64 * MB, rng=random.Random(7))
+    offsets = planner.plan(100)
+    assert len(offsets) == 100 and offsets == sorted(offsets)
+    assert all(offset % 512 == 0 and offset + 4096 <= 64 * MB for offset in offsets)
+    zone = planner.zone_bytes(100)
+    assert all(int(i * zone) - 512 <= offset < (i + 1) * zone for i, offset in enumerate(offsets))
+
+
+def test_plan_never_asks_for_more_blocks_than_fit():
+    assert len(SamplingPlanner(4096 + 3 * 512).plan(100)) == 4
+    assert SamplingPlanner(1000).plan(10) == []
+
+
+def test_bound_grows_with_failures():
+    planner = SamplingPlanner(MB)
+    clean = planner.confidence_bound(300)
+    assert abs(clean - (1 - 0.05 ** (1 / 300))) < 1e-12
+    bounds = [planner.confidence_bound(300, failures=k) for k in (0, 1, 5, 30)]
+    assert bounds == sorted(bounds) and bounds[-1] > 30 / 300
+    assert planner.confidence_bound(300, failures=300) == 1.0
+
+    report = planner.coverage_report(300, failures=1)
+    assert report["failed_blocks"] == 1 and report["guaranteed_gap_bytes"] is None
+    assert planner.coverage_report(300)["guaranteed_gap_bytes"] is not None
+
+
+def test_audit_bounds_coverage_on_the_blocks_that_failed(tmp_path, make_sanitizer):
+    path = tmp_path / "disk.img"
+    path.write_bytes(os.urandom(8 * MB))
+    s = make_sanitizer(path)
+    assert s.execute_wipe(SEED, stage=1)
+    with open(path, "r+b") as f:
+        f.seek(4 * MB)
+        f.write(bytes(4 * MB))  # Half the surface "never written"
+
+    report = s.audit_random_sectors(sample_count=64)
+    assert not report["passed"]
+    assert 20 <= report["coverage"]["failed_blocks"] <= 44  # Roughly the zeroed half of 64 zones
+    assert report["coverage"]["max_unwritten_fraction"] > 0.3
@@ -0,0 +1,121 @@
+import struct
+
+import pytest
+
+from core.device import ImageFile
+from core.scope import ChunkMap, WipeScope, read_partition_table
+
+SECTOR = 512
+
+
+def _mbr(*slots):
+    """Boot sector with up to four (type, first LBA, sector count) primary entries."""
+    mbr = bytearray(SECTOR)
+    for i, (kind, start, count) in enumerate(slots):
+        entry = 446 + 16 * i
+        mbr[entry + 4] = kind
+        struct.pack_into("<II", mbr, entry + 8, start, count)
+    mbr[510:512] = b"\x55\xaa"
+    return mbr
+
+
+def _gpt(entries, count=8, entry_size=128):
+    """Protective MBR + GPT header at LBA 1 + entry array at LBA 2; `entries` = {slot: (first, last)}."""
+    image = bytearray(SECTOR * (2 + -(-count * entry_size // SECTOR)))
+    image[:SECTOR] = _mbr((0xEE, 1, 0xFFFFFFFF))
+    header = bytearray(SECTOR)
+    header[:8] = b"EFI PART"
+    struct.pack_into("<QII", header, 72, 2, count, entry_size)
+    image[SECTOR:2 * SECTOR] = header
+    table = bytearray(count * entry_size)
+    for slot, (first, last) in entries.items():
+        entry = (slot - 1) * entry_size
+        table[entry:entry + 16] = b"\x0f" * 16  # Any non-zero partition type GUID
+        struct.pack_into("<QQ", table, entry + 32, first, last)
+    image[2 * SECTOR:2 * SECTOR + len(table)] = table
+    return bytes(image)
+
+
+def _reader(image):
+    return lambda offset, size: image[offset:offset + size]
+
+
+def test_mbr_lists_primaries_and_skips_extended_and_empty_slots():
+    image = bytes(_mbr((0x83, 2048, 4096), (0x05, 8192, 1000), (0, 0, 0), (0x07, 10000, 20)))
+    assert read_partition_table(_reader(image)) == {1: (2048 * SECTOR, 4096 * SECTOR),
+                                                    4: (10000 * SECTOR, 20 * SECTOR)}
+
+
+def test_gpt_keeps_slot_numbers():
+    image = _gpt({1: (34, 99), 3: (200, 299)})
+    assert read_partition_table(_reader(image)) == {1: (34 * SECTOR, 66 * SECTOR),
+                                                    3: (200 * SECTOR, 100 * SECTOR)}
+
+
+def test_protective_mbr_without_gpt_at_the_sector_size_is_rejected():
+    # 4Kn layout (GPT header at byte 4096) read with 512-byte sectors
+    image = bytearray(16 * 4096)
+    image[:SECTOR] = _mbr((0xEE, 1, 0xFFFFFFFF))
+    image[4096:4104] = b"EFI PART"
+    with pytest.raises(ValueError):
+        read_partition_table(_reader(bytes(image)), SECTOR)
+
+
+def test_protective_mbr_with_a_corrupt_gpt_header_is_rejected():
+    image = bytearray(_gpt({1: (34, 99)}))
+    struct.pack_into("<QII", image, SECTOR + 72, 2, 4, 0)  # entry_size 0
+    with pytest.raises(ValueError):
+        read_partition_table(_reader(bytes(image)))
+
+
+def test_unpartitioned_image_has_no_table():
+    assert read_partition_table(_reader(bytes(SECTOR * 2))) == {}
+
+
+def test_partition_scope_from_image(tmp_path):
+    path = tmp_path / "gpt.img"
+    path.write_bytes(_gpt({2: (40, 63)}).ljust(64 * SECTOR, b"\0"))
+    scope = WipeScope.parse("partition:2", ImageFile(str(path)))
+    assert scope.extents == [(40 * SECTOR, 24 * SECTOR)]
+    with pytest.raises(ValueError):
+        WipeScope.parse("partition:1", ImageFile(str(path)))
+
+
+def test_lba_scope_merges_and_rejects_out_of_range(tmp_path):
+    path = tmp_path / "disk.img"
+    path.write_bytes(bytes(100 * SECTOR))
+    scope = WipeScope.parse("lba:10-19,20+5,50+1", ImageFile(str(path)))
+    assert scope.extents == [(10 * SECTOR, 15 * SECTOR), (50 * SECTOR, SECTOR)]
+    assert WipeScope.from_dict(scope.to_dict()).extents == scope.extents
+    with pytest.raises(ValueError):
+        WipeScope.parse("lba:90+20", ImageFile(str(path)))
+
+
+def test_chunk_map_cuts_extents_along_the_device_grid():
+    cmap = ChunkMap([(100, 50), (1000, 3000)], 1024)
+    assert list(cmap.ranges()) == [(100, 50), (1000, 24), (1024, 1024), (2048, 1024), (3072, 928)]
+    assert cmap.total_bytes == 3050
+    assert [cmap.logical(i) for i in range(len(cmap) + 1)] == [0, 50, 74, 1098, 2122, 3050]
+    assert cmap.physical(49) == (149, 1)
+    assert cmap.physical(50) == (1000, 3000)
+    # Samples straddling an extent edge are pulled back inside it, or dropped if it is too small
+    assert cmap.place(2990, 64) == 3936
+    assert cmap.place(10, 64) is None
+    with pytest.raises(IndexError):
+        cmap[len(cmap)]
+
+
+def test_whole_device_keeps_the_partial_tail_chunk():
+    scope = WipeScope.whole(5000)
+    cmap = scope.chunks(1024)
+    assert len(cmap) == 5
+    assert cmap[4] == (4096, 904)
+    assert cmap.total_bytes == 5000
+    assert scope.whole_device
+
+
+def test_scope_is_clipped_to_the_device():
+    scope = WipeScope([(4000, 2000), (0, 10)], "TEST", 5000)
+    assert scope.extents == [(0, 10), (4000, 1000)]
+    with pytest.raises(ValueError):
+        WipeScope([(6000, 10)], "OUTSIDE", 5000)
@@ -0,0 +1,51 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from test_badblocks import SEED, FaultyImage
+
+
+class CountingPool(ThreadPoolExecutor):
+    """Shared-pool stand-in that records how many jobs were queued or running at once."""
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.outstanding = self.peak = 0
+        self._lock = threading.Lock()
+
+    def submit(self, fn, *args, **kwargs):
+        with self._lock:
+            self.outstanding += 1
+            self.peak = max(self.peak, self.outstanding)
+        future = super().submit(fn, *args, **kwargs)
+        future.add_done_callback(self._done)
+        return future
+
+    def _done(self, future):
+        with self._lock:
+            self.outstanding -= 1
+
+
+def test_regeneration_reads_through_the_sanitizers_device(tmp_path, make_sanitizer):
+    path = tmp_path / "disk.img"
+    path.write_bytes(os.urandom(4 * 1024 * 1024))
+    s = make_sanitizer(path)
+    assert s.execute_wipe(SEED, stage=1)
+    s.device = FaultyImage(str(path), {5000})  # Sector goes bad after the pass landed
+    report = s.verify_by_regeneration(1, "VERIFY", SEED)
+    # A plain open of the path would read the sector fine and never see the failure
+    assert report["mismatched_chunks"] == 0
+    assert 0 < report["excluded_bytes"] <= 512  # Bytes that happen to match the keystream are not counted
+    assert s.bad_blocks.to_dict()["unreadable"] == [[5000, 1]]
+
+
+def test_regeneration_keeps_a_bounded_window_on_a_shared_pool(tmp_path, make_sanitizer):
+    path = tmp_path / "disk.img"
+    path.write_bytes(os.urandom(4 * 1024 * 1024))
+    s = make_sanitizer(path, chunk_size=256 * 1024)
+    assert s.execute_wipe(SEED, stage=1)
+    s.verify_range_chunks = 1  # 16 jobs
+    with CountingPool(max_workers=4) as pool:
+        s.keystream_pool = pool
+        report = s.verify_by_regeneration(1, "VERIFY", SEED)
+    assert report["chunks"] == 16 and report["mismatched_chunks"] == 0
+    assert pool.peak <= s.workers
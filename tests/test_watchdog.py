@@ -0,0 +1,37 @@
+import os
+
+from core.watchdog import WatchdogMonitor
+
+MB = 1024 * 1024
+
+
+def test_checker_threads_check_every_chunk_in_full():
+    released = []
+    monitor = WatchdogMonitor(workers=2, backlog=16).start()
+    for index in range(6):
+        monitor.submit(index, os.urandom(MB), on_done=released.append)
+    summary = monitor.close()
+    assert summary["chunks_checked"] == 6 and summary["chunks_sampled"] == 0
+    assert summary["anomalies"] == 0 and len(released) == 6
+
+
+def test_sampled_checks_stay_out_of_the_full_chunk_statistics():
+    monitor = WatchdogMonitor(workers=0, full_every=4).start()  # No spare core: every check is inline
+    for index in range(8):
+        monitor.submit(index, os.urandom(MB))
+    summary = monitor.close()
+    assert summary["chunks_checked"] == 2 and summary["chunks_sampled"] == 6  # Chunks 0 and 4 in full
+    assert summary["entropy_min"] > 7.999  # A 32 KB sample would sit near 7.994 and drag this down
+    assert 7.9 < summary["sampled_entropy_min"] < summary["entropy_min"]
+
+
+def test_sampled_anomalies_still_count():
+    anomalies = []
+    monitor = WatchdogMonitor(workers=0, full_every=4, on_anomaly=lambda index, result: anomalies.append(index))
+    monitor.start()
+    monitor.submit(0, os.urandom(MB))
+    monitor.submit(1, bytes(MB))  # Sampled
+    summary = monitor.close()
+    assert summary["anomalies"] == 1 and summary["sampled_anomalies"] == 1
+    assert summary["first_anomaly"] == 1 and anomalies == [1]
+    assert summary["chunks_checked"] == 1 and summary["entropy_min"] > 7.999
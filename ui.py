@@ -1,8 +1,162 @@
 import sys
-import msvcrt
 import time
 import os
 import random
+import threading
+try:
+    import msvcrt
+except ImportError:  # POSIX wipe stations read the keyboard through termios instead
+    msvcrt = None
+
+
+def _getch():
+    """One keypress as msvcrt.getch() would report it (arrows -> b'H'/b'P', Enter -> b'\\r')."""
+    if msvcrt:
+        return msvcrt.getch()
+    import termios
+    import tty
+    fd = sys.stdin.fileno()
+    saved = termios.tcgetattr(fd)
+    try:
+        tty.setraw(fd)
+        key = os.read(fd, 1)
+        if key == b'\x1b':
+            key = {b'[A': b'H', b'[B': b'P'}.get(os.read(fd, 2), b'')
+    finally:
+        termios.tcsetattr(fd, termios.TCSADRAIN, saved)
+    return b'\r' if key == b'\n' else key
+
+class ProgressTask:
+    """
+    One live progress bar. Hot loops only move a counter (update/advance, single writer);
+    sampling, EWMA throughput, ETA and every byte of terminal output belong to the
+    ProgressRenderer thread, so a slow console can never stall a device writer.
+    """
+    def __init__(self, label, total, unit="bytes", renderer=None):
+        self.label = label
+        self.total = max(1, total)
+        self.unit = unit
+        self.done = 0
+        self.detail = ""
+        self.finished = False
+        self.started = time.time()
+        self.rate = None  # EWMA units/s, owned by the renderer
+        self._renderer = renderer
+        self._last_done = 0
+        self._last_time = self.started
+
+    def update(self, done):
+        self.done = done
+
+    def advance(self, amount):
+        self.done += amount
+
+    def finish(self):
+        """Freezes the bar and prints its final line right away (keeps output ordered)."""
+        self.finished = True
+        if self._renderer:
+            self._renderer.render()
+
+
+class ProgressRenderer:
+    """
+    Redraws every live bar at a fixed refresh rate from a daemon thread.
+    Live bars occupy a block at the bottom of the terminal; finished bars and status
+    lines are written above it and scroll into history.
+    """
+    FLUX = ["⠋", "⠙", "⠹", "⠸", "⠼", "⠴", "⠦", "⠧", "⠇", "⠏"]
+
+    def __init__(self, ui, refresh=0.25, alpha=0.2):
+        self.ui = ui
+        self.refresh = refresh
+        self.alpha = alpha  # EWMA weight of the newest sample
+        self.tasks = []
+        self._lines = 0     # Live lines currently on screen
+        self._thread = threading.Thread(target=self._run, name="progress", daemon=True)
+        self._thread.start()
+
+    def add(self, task):
+        task._renderer = self
+        with self.ui.term_lock:
+            self.tasks.append(task)
+        return task
+
+    @property
+    def active(self):
+        return bool(self._lines or self.tasks)
+
+    def _run(self):
+        while True:
+            time.sleep(self.refresh)
+            if self.tasks:
+                self.render()
+
+    def _sample(self, task, now):
+        dt = now - task._last_time
+        if dt <= 0:
+            return
+        instant = (task.done - task._last_done) / dt
+        task.rate = instant if task.rate is None else self.alpha * instant + (1 - self.alpha) * task.rate
+        task._last_done, task._last_time = task.done, now
+
+    def _line(self, task, now):
+        ui = self.ui
+        width = 30
+        percentage = min(100, int(task.done * 100 / task.total))
+        done = int(width * percentage / 100)
+        bar = f"{ui.cyan}{'█' * done}{ui.reset}{ui.dim}{'░' * (width - done)}{ui.reset}"
+        label = task.label.replace("[*]", "").strip()
+
+        if task.finished:
+            elapsed = now - task.started
+            avg = task.done / elapsed if elapsed > 0 else 0
+            tail = f"{self._rate(task, avg)} | {self._clock(elapsed)}"
+        else:
+            anim = self.FLUX[int(now * 10) % len(self.FLUX)]
+            eta = (task.total - task.done) / task.rate if task.rate else None
+            tail = f"{self._rate(task, task.rate or 0)} | ETA {self._clock(eta)} {ui.yellow}{anim}{ui.reset}"
+        if task.detail:
+            tail = f"{task.detail} | {tail}"
+        return f"[*] {label[:40]:<40} {bar} {percentage:>3}% {ui.dim}{tail}{ui.reset}"
+
+    @staticmethod
+    def _rate(task, rate):
+        if task.unit == "bytes":
+            return f"{rate / (1024 * 1024):7.1f} MB/s"
+        return f"{task.done}/{task.total} {task.unit}"
+
+    @staticmethod
+    def _clock(seconds):
+        if seconds is None:
+            return "--:--"
+        seconds = int(seconds)
+        hours, rest = divmod(seconds, 3600)
+        return f"{hours}:{rest // 60:02d}:{rest % 60:02d}" if hours else f"{rest // 60:02d}:{rest % 60:02d}"
+
+    def _clear(self):
+        # Cursor sits at the end of the last live line: wipe the block bottom-up
+        if not self._lines:
+            return ""
+        return "\r\033[2K" + "\033[1A\033[2K" * (self._lines - 1)
+
+    def render(self, above=None):
+        """One frame: optional text above the block, finished bars, then the live block."""
+        with self.ui.term_lock:
+            now = time.time()
+            out = [self._clear()]
+            if above:
+                out.append(above)
+            for task in list(self.tasks):
+                self._sample(task, now)
+                if task.finished:
+                    out.append(self._line(task, now) + "\n")
+                    self.tasks.remove(task)
+            live = [self._line(task, now) for task in self.tasks]
+            out.append("\n".join(live))
+            self._lines = len(live)
+            sys.stdout.write("".join(out))
+            sys.stdout.flush()
+
 
 class Q_UI:
     def __init__(self):
@@ -21,6 +175,10 @@ class Q_UI:
         # Compatibility fix
         self.green      = self.cyan 
         
+        # Terminal output is shared with the progress renderer thread
+        self.term_lock = threading.RLock()
+        self.renderer = None
+        
         # Initialize terminal state
         sys.stdout.write(self.hide)
         sys.stdout.flush()
@@ -100,20 +258,34 @@ class Q_UI:
             term_width = 120
         
         
-        sys.stdout.write("\r\033[2K") 
-        
         clean_msg = message.strip().replace("[*]", "").strip()
         formatted_msg = f"[*] {clean_msg}"
         
         if centered:
             # Only use this for the main banner/headers
             padding = max(0, (term_width - len(formatted_msg)) // 2)
-            sys.stdout.write(" " * padding + f"{self.cyan}{formatted_msg}{self.reset}\n")
+            line = " " * padding + f"{self.cyan}{formatted_msg}{self.reset}\n"
         else:
             # Left-aligned (Professional Log Style)
-            sys.stdout.write(f"{self.cyan}{formatted_msg}{self.reset}\n")
+            line = f"{self.cyan}{formatted_msg}{self.reset}\n"
         
-        sys.stdout.flush()
+        if self.renderer and self.renderer.active:
+            # Live bars on screen: print above them, the block is redrawn underneath
+            self.renderer.render(above=line)
+            return
+        with self.term_lock:
+            sys.stdout.write("\r\033[2K" + line)
+            sys.stdout.flush()
+
+    def progress(self, label, total, unit="bytes"):
+        """
+        Registers a live bar and returns its ProgressTask. Any number of bars can be live
+        at once (one per drive in rack mode); they are drawn by a single renderer thread.
+        """
+        with self.term_lock:
+            if self.renderer is None:
+                self.renderer = ProgressRenderer(self)
+        return self.renderer.add(ProgressTask(label, total, unit))
 
     def draw_progress_bar(self, percentage, prefix=""):
         width = 40
@@ -127,17 +299,9 @@ class Q_UI:
         # Aligned to match update_status exactly
         content = f"[*] {clean_prefix[:25]:<25} {bar} {percentage:>3}% {self.yellow}{anim}{self.reset}"
         
-        # Clear line and print from the left
-        sys.stdout.write("\r\033[2K" + content)
-        sys.stdout.flush()
-        
-        if percentage >= 100:
-            sys.stdout.write("\n")
-            sys.stdout.flush()
-        
-        # Only print newline when done, so the NEXT status update starts fresh
-        if percentage >= 100:
-            sys.stdout.write("\n") 
+        # Clear line and print from the left; one newline when done, so the NEXT status update starts fresh
+        with self.term_lock:
+            sys.stdout.write("\r\033[2K" + content + ("\n" if percentage >= 100 else ""))
             sys.stdout.flush()
 
     def select_disk_interactive(self, disks):
@@ -151,7 +315,7 @@ class Q_UI:
                 color = self.bold if i == idx else self.dim
                 sys.stdout.write(f"{pointer}{color}[{d['index']}] {d['model'][:30]:<30} | {int(d['size'])/(1024**3):.2f} GB{self.reset}\n")
             
-            key = msvcrt.getch()
+            key = _getch()
             if key == b'\r': return disks[idx]['index']
             elif key == b'H' or key == b'w': idx = (idx - 1) % num_disks
             elif key == b'P' or key == b's': idx = (idx + 1) % num_disks
@@ -161,4 +325,15 @@ class Q_UI:
 
     def draw_warning_header(self, target_idx):
         print(f"\n{self.red}{self.bold}»» TERMINATION PROTOCOL ARMED : DISK {target_idx}{self.reset}")
-        print(f"{self.dim}{'-' * 50}{self.reset}")
\ No newline at end of file
+        print(f"{self.dim}{'-' * 50}{self.reset}")
+
+class QuietUI:
+    """
+    Headless stand-in for Q_UI (benchmarks, tests): every call is a no-op and progress
+    bars are counted but never drawn.
+    """
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: None
+
+    def progress(self, label, total, unit="bytes"):
+        return ProgressTask(label, total, unit)